@@ -0,0 +1,100 @@
+# coding=utf-8
+"""
+Microbenchmark for variable reads and calls, in nanoseconds per Node.
+Runs a WHILE loop reading variables and calling a Function, once with
+the Interpreter, which hands out Values as they are, and once with the
+original visit methods, kept below as a reference, which copied every
+Value read from a variable, every callee and every return value to
+give it the position and the Context of the Node being evaluated.
+Run it from the repository root:
+    $ python -m benchmarks.access_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.context import Context
+from bin.interpreter import Interpreter
+from bin.symbol_table import SymbolTable
+from simplescript import global_symbol_table, parse
+
+SAMPLE = '''VAR a = 3
+VAR b = 4
+VAR total = 0
+FUNC pick(x, y) -> x
+VAR i = 0
+WHILE i < {iterations} THEN
+\tVAR total = total + a * b - pick(a, b)
+\tVAR i = i + 1
+END
+'''
+
+
+class CopyingInterpreter(Interpreter):
+    """Interpreter with the original copies on every read and call."""
+
+    def visit_varaccessnode(self, node, context):
+        var_value = Interpreter.visit_varaccessnode(self, node, context)
+        return var_value.copy().set_position(node.start_pos, node.end_pos).set_context(context)
+
+    def visit_callnode(self, node, context):
+        value_to_call = self.evaluate(node.node_to_call, context)
+        value_to_call = value_to_call.copy().set_position(node.start_pos, node.end_pos)
+        args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
+        return_value = value_to_call.call(args, context, node.start_pos, node.end_pos)
+        return return_value.copy().set_position(node.start_pos, node.end_pos).set_context(context)
+
+
+class CountingInterpreter(Interpreter):
+    """Interpreter which counts the Nodes it visits."""
+
+    def __init__(self):
+        self.count = 0
+
+    def evaluate(self, node, context):
+        self.count += 1
+        return Interpreter.evaluate(self, node, context)
+
+
+def measure(interpreter_class, ast, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param interpreter_class: Interpreter class to use.
+    :param ast: Root Node of the AST.
+    :param repeat: Number of runs.
+    :return: Tuple with the interpreter of the last run and the best time in seconds.
+    """
+    best, interpreter = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            interpreter = interpreter_class()
+            context = Context('<benchmark>')
+            context.symbol_table = SymbolTable(global_symbol_table)
+            start = time.perf_counter()
+            result = interpreter.visit(ast, context)
+            elapsed = time.perf_counter() - start
+            if result.error:
+                raise Exception(str(result.error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return interpreter, best
+
+
+def main(iterations=20000, repeat=5):
+    ast, error = parse('<benchmark>', SAMPLE.format(iterations=iterations))
+    if error:
+        raise Exception(str(error))
+    counter, _ = measure(CountingInterpreter, ast, 1)
+    _, copying_time = measure(CopyingInterpreter, ast, repeat)
+    _, shared_time = measure(Interpreter, ast, repeat)
+    print('WHILE loop of {} iterations, {} Nodes visited'.format(iterations, counter.count))
+    print('Copying Values:     {:>10.1f} ns/Node'.format(copying_time * 1e9 / counter.count))
+    print('Shared Values:      {:>10.1f} ns/Node'.format(shared_time * 1e9 / counter.count))
+    print('Speedup:            {:>10.2f}x'.format(copying_time / shared_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
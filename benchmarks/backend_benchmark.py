@@ -0,0 +1,86 @@
+# coding=utf-8
+"""
+Execution benchmark for the backends, in milliseconds.
+Runs a loop-heavy and a call-heavy script on every backend of
+simplescript.BACKENDS, checks that they all agree, and reports
+their speedup over the "tree" Interpreter.
+Run it from the repository root:
+    $ python -m benchmarks.backend_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from simplescript import BACKENDS, interpret, parse
+
+SCRIPTS = {
+    'loops': '''VAR total = 0
+FOR i = 0 TO {size} THEN
+\tVAR j = 0
+\tWHILE j < 20 THEN
+\t\tIF (i + j) % 3 == 0 THEN
+\t\t\tVAR total = total + i * j
+\t\tELSE
+\t\t\tVAR total = total - 1
+\t\tEND
+\t\tVAR j = j + 1
+\tEND
+END
+total
+''',
+    'calls': '''FUNC fib(n)
+\tIF n < 2 THEN
+\t\tRETURN n
+\tEND
+\tRETURN fib(n - 1) + fib(n - 2)
+END
+FUNC square(x) -> x * x
+VAR total = 0
+FOR i = 0 TO {size} THEN
+\tVAR total = total + square(i) - fib(5)
+END
+fib(12) + total
+''',
+}
+
+
+def measure(ast, backend, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs.
+    :return: Tuple with the value of the script and the best time in seconds.
+    """
+    best, value = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value, error = interpret(ast, backend)
+            elapsed = time.perf_counter() - start
+            if error:
+                raise Exception(str(error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return repr(value), best
+
+
+def main(size=500, repeat=3):
+    for name, script in SCRIPTS.items():
+        ast, error = parse('<{}>'.format(name), script.format(size=size))
+        if error:
+            raise Exception(str(error))
+        print('Script "{}":'.format(name))
+        reference_value, reference_time = measure(ast, 'tree', repeat)
+        for backend in BACKENDS:
+            value, backend_time = measure(ast, backend, repeat)
+            if value != reference_value:
+                raise Exception('Backend "{}" returned {} instead of {}'.format(backend, value, reference_value))
+            print('  {:<10} {:>10.2f} ms {:>8.2f}x'.format(backend, backend_time * 1000, reference_time / backend_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,63 @@
+# coding=utf-8
+"""
+Front-end benchmark for the on-disk AST cache, in milliseconds.
+Compares lexing and parsing a script against loading its AST from
+the "<script>.ssc" file written by simplescript.run_file().
+Run it from the repository root:
+    $ python -m benchmarks.cache_benchmark
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.parser_benchmark import SAMPLE
+from bin import ast_cache
+from simplescript import parse
+
+
+def measure(function, repeat):
+    """
+    Measures the best time of a function over several runs.
+    :param function: Function to time, without arguments.
+    :param repeat: Number of runs.
+    :return: Tuple with the last result and the best time in seconds.
+    """
+    best, result = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return result, best
+
+
+def main(blocks=100, repeat=5):
+    text = ''.join(SAMPLE.format(index=index) for index in range(blocks))
+    with tempfile.TemporaryDirectory() as directory:
+        fn = os.path.join(directory, 'benchmark.ss')
+        with open(fn, 'w') as file:
+            file.write(text)
+        (ast, error), parse_time = measure(lambda: parse(fn, text), repeat)
+        if error:
+            raise Exception(repr(error))
+        ast_cache.dump(fn, text, ast)
+        cached_ast, load_time = measure(lambda: ast_cache.load(fn, text), repeat)
+        # Note: Offsets are rebased on load, compare them relative to the source
+        if cached_ast is None or ast_cache.encode(cached_ast) != ast_cache.encode(ast):
+            raise Exception('Cached AST differs')
+        cache_size = os.path.getsize(ast_cache.get_cache_path(fn))
+    print('Source size: {} KB, cache size: {} KB'.format(len(text) // 1024, cache_size // 1024))
+    print('Lex and parse:  {:>10.2f} ms'.format(parse_time * 1000))
+    print('Load cache:     {:>10.2f} ms'.format(load_time * 1000))
+    print('Speedup:        {:>10.2f}x'.format(parse_time / load_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,132 @@
+# coding=utf-8
+"""
+Benchmark for FUNC calls, in calls per second.
+Runs a recursive fib on every backend, once with the shared
+Interpreter, the SymbolTables without NULL, TRUE and FALSE and, on
+the vm and python backends, the pooled Contexts of bin/function.py,
+and once with the original calls, kept below as a reference, which built an
+Interpreter, a Context and a SymbolTable holding NULL, TRUE and
+FALSE for every call.
+Run it from the repository root:
+    $ python -m benchmarks.call_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.context import Context
+from bin.function import BaseFunction
+from bin.interpreter import Function, Interpreter
+from bin.symbol_table import TABLE_CONSTANTS, SymbolTable
+from simplescript import BACKENDS, interpret, parse
+
+SCRIPT = '''FUNC fib(n)
+\tIF n < 2 THEN RETURN n
+\tRETURN fib(n - 1) + fib(n - 2)
+END
+fib({size})
+'''
+
+original_generate_new_context = BaseFunction.generate_new_context
+original_release_context = BaseFunction.release_context
+original_interpreter = Function.interpreter
+
+
+def reference_generate_new_context(self, context, start_pos, end_pos):
+    context = Context(self.name, context, start_pos, end_pos)
+    context.symbol_table = SymbolTable(context.parent_context.symbol_table)
+    context.symbol_table.symbols.update(TABLE_CONSTANTS)
+    return context
+
+
+def reference_release_context(context):
+    pass
+
+
+def use_reference_calls(enabled):
+    """
+    Switches between the original calls and the pooled ones.
+    :param enabled: True for the original calls.
+    """
+    if enabled:
+        BaseFunction.generate_new_context = reference_generate_new_context
+        BaseFunction.release_context = staticmethod(reference_release_context)
+        Function.interpreter = property(lambda self: Interpreter())
+    else:
+        BaseFunction.generate_new_context = original_generate_new_context
+        BaseFunction.release_context = staticmethod(original_release_context)
+        Function.interpreter = original_interpreter
+
+
+def count_calls(size):
+    """
+    Counts the calls made by fib.
+    :param size: Argument of the outermost call.
+    :return: Number of calls.
+    """
+    previous, current = 1, 1  # Note: Calls made by fib(0) and fib(1)
+    for _ in range(size - 1):
+        previous, current = current, previous + current + 1
+    return current
+
+
+def measure(ast, backend, reference):
+    """
+    Measures the time to interpret an AST once.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param reference: True for the original calls.
+    :return: Tuple with the value of the AST and the time in seconds.
+    """
+    use_reference_calls(reference)
+    try:
+        start = time.perf_counter()
+        value, error = interpret(ast, backend)
+        elapsed = time.perf_counter() - start
+    finally:
+        use_reference_calls(False)
+    if error:
+        raise Exception(str(error))
+    return repr(value), elapsed
+
+
+def compare(ast, backend, repeat):
+    """
+    Measures the best times to interpret an AST with the original and
+    the pooled calls. Both alternate, so a change in the load of the
+    machine affects them alike instead of skewing their ratio.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs of each.
+    :return: Tuple with the best times of the original and the pooled calls, in seconds.
+    """
+    reference_time, pooled_time = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            reference_value, elapsed = measure(ast, backend, True)
+            reference_time = elapsed if reference_time is None else min(reference_time, elapsed)
+            value, elapsed = measure(ast, backend, False)
+            pooled_time = elapsed if pooled_time is None else min(pooled_time, elapsed)
+            if value != reference_value:
+                raise Exception('Pooled calls returned {} instead of {}'.format(value, reference_value))
+    finally:
+        gc.enable()
+    return reference_time, pooled_time
+
+
+def main(size=18, repeat=7):
+    ast, error = parse('<benchmark>', SCRIPT.format(size=size))
+    if error:
+        raise Exception(str(error))
+    calls = count_calls(size)
+    print('fib({}), {} calls, calls per second:'.format(size, calls))
+    for backend in BACKENDS:
+        reference_time, pooled_time = compare(ast, backend, repeat)
+        print('  {:<10} {:>12,.0f} {:>12,.0f} {:>8.2f}x'.format(
+            backend, calls / reference_time, calls / pooled_time, reference_time / pooled_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
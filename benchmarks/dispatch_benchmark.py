@@ -0,0 +1,127 @@
+# coding=utf-8
+"""
+Microbenchmark for Token dispatch, in checks per second.
+Replays the operator chain of Interpreter.visit_binopnode and the
+variable lookups of SymbolTable.get on the Tokens of a real script,
+once with the original string kinds and KEYWORD/value pairs, and
+once with the int kinds and interned identifiers of the Lexer.
+Run it from the repository root:
+    $ python -m benchmarks.dispatch_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.constants import *
+from bin.lexer import Lexer
+from bin.symbol_table import SymbolTable
+
+SAMPLE = '''VAR total_{index} = 0
+FOR counter = 0 TO 10 THEN VAR total_{index} = total_{index} + counter * 2 - counter / 3
+IF total_{index} >= 10 AND NOT counter == 3 OR total_{index} < 2 THEN PRINT(total_{index} % 7)
+'''
+
+# Note: The chain tested by visit_binopnode, in the same order
+STRING_OPERATORS = ['PLUS', 'MINUS', 'POWER', 'MUL', 'DIV', 'MODULO', 'CLEAN_DIV',
+                    'NE', 'EE', 'LT', 'LTE', 'GT', 'GTE']
+INT_OPERATORS = [TP_PLUS, TP_MINUS, TP_POWER, TP_MUL, TP_DIV, TP_MODULO, TP_CLEAN_DIV,
+                 TP_NE, TP_EE, TP_LT, TP_LTE, TP_GT, TP_GTE]
+
+
+class StringToken:
+    """Token as it was before, with string kinds and keyword values."""
+
+    def __init__(self, token_type, token_value):
+        self.type = token_type
+        self.value = token_value
+
+    def matches(self, token_type, token_value):
+        return self.type == token_type and self.value == token_value
+
+
+def dispatch_strings(tokens):
+    matched = 0
+    for token in tokens:
+        for operator_type in STRING_OPERATORS:
+            if token.type == operator_type:
+                matched += 1
+                break
+        else:
+            if token.matches('KEYWORD', 'AND') or token.matches('KEYWORD', 'OR'):
+                matched += 1
+    return matched
+
+
+def dispatch_ints(tokens):
+    matched = 0
+    for token in tokens:
+        for operator_type in INT_OPERATORS:
+            if token.type == operator_type:
+                matched += 1
+                break
+        else:
+            if token.type == TP_AND or token.type == TP_OR:
+                matched += 1
+    return matched
+
+
+def lookup(symbol_table, names):
+    get = symbol_table.get
+    for name in names:
+        get(name)
+
+
+def measure(function, arguments, repeat):
+    """
+    Measures the best time of a function over several runs.
+    :param function: Function to time.
+    :param arguments: Tuple of the arguments of the function.
+    :param repeat: Number of runs.
+    :return: Best time in seconds.
+    """
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(*arguments)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main(blocks=2000, repeat=5):
+    text = ''.join(SAMPLE.format(index=index % 50) for index in range(blocks))
+    tokens, _ = Lexer(text, '<benchmark>').tokenize()
+    string_tokens = [StringToken('KEYWORD' if token.type in KEYWORDS.values() else TOKEN_NAMES[token.type],
+                                 token.value) for token in tokens]
+    if dispatch_strings(string_tokens) != dispatch_ints(tokens):
+        raise Exception('Dispatch results differ')
+    string_time = measure(dispatch_strings, (string_tokens,), repeat)
+    int_time = measure(dispatch_ints, (tokens,), repeat)
+
+    # Note: Names built at runtime are equal to the keys but not identical,
+    #       which is what the Lexer produced before identifiers were interned
+    symbol_table = SymbolTable(SymbolTable())
+    interned = [token.value for token in tokens if token.type == TP_IDENTIFIER]
+    copied = [''.join(list(name)) for name in interned]
+    for name in interned:
+        symbol_table.parent.set(name, 0)
+    copied_time = measure(lookup, (symbol_table, copied), repeat)
+    interned_time = measure(lookup, (symbol_table, interned), repeat)
+
+    print('Operator dispatch over {} Tokens'.format(len(tokens)))
+    print('String kinds:      {:>12,.0f} Tokens/sec'.format(len(tokens) / string_time))
+    print('Int kinds:         {:>12,.0f} Tokens/sec'.format(len(tokens) / int_time))
+    print('Speedup:           {:>12.2f}x'.format(string_time / int_time))
+    print('SymbolTable.get over {} identifiers'.format(len(interned)))
+    print('Copied names:      {:>12,.0f} lookups/sec'.format(len(interned) / copied_time))
+    print('Interned names:    {:>12,.0f} lookups/sec'.format(len(interned) / interned_time))
+    print('Speedup:           {:>12.2f}x'.format(copied_time / interned_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,201 @@
+# coding=utf-8
+"""
+Throughput benchmark for the Lexer, in tokens per second.
+Compares the single-pass Lexer against the original
+character-by-character algorithm, kept below as a reference,
+and checks that both produce the same Token stream.
+Run it from the repository root:
+    $ python -m benchmarks.lexer_benchmark
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from bin.constants import *
+from bin.errors import ExpectedCharError, IllegalCharError
+from bin.lexer import Lexer
+from bin.source import OFFSET_MASK, Source
+from bin.token import Token
+
+SAMPLE = '''# Generated block {index}
+FUNC helper_{index}(a, b)
+\tVAR total = (a + b) * 3.25 - a / 2 ^ 2
+\tIF total >= 10 AND NOT a == b THEN
+\t\tRETURN total % 7 | 2
+\tELIF total != 0 THEN RETURN -> total
+\tEND
+\tVAR items = [1, 2, "text {index}", a <= b, a < b, a > b]
+\tFOR i = 0 TO LEN(items) STEP 1 THEN APPEND(items, i); PRINT(items / i)
+\tRETURN total
+END
+'''
+
+
+class ReferenceLexer:
+    """The original character-by-character lexer."""
+
+    def __init__(self, input_text, fn):
+        self.text = input_text
+        self.base = Source(fn, input_text).base
+        self.idx = -1
+        self.current_character = None
+        self.advance()
+
+    def advance(self):
+        self.idx += 1
+        self.current_character = self.text[self.idx] if self.idx < len(self.text) else None
+
+    def tokenize(self):
+        tokens = []
+        single_characters = {'+': TP_PLUS, '*': TP_MUL, '^': TP_POWER, '/': TP_DIV,
+                             '|': TP_CLEAN_DIV, '%': TP_MODULO, '(': TP_LPAREN,
+                             ')': TP_RPAREN, '[': TP_LSQUARE, ']': TP_RSQUARE, ',': TP_COMMA}
+        dual_characters = {'=': (TP_EQUALS, TP_EE), '<': (TP_LT, TP_LTE), '>': (TP_GT, TP_GTE)}
+        while self.current_character is not None:
+            if self.current_character in ' \t':
+                self.advance()
+            elif self.current_character in ';\n':
+                tokens.append(Token(TP_NEWLINE, start_pos=self.base + self.idx))
+                self.advance()
+            elif self.current_character == '#':
+                while self.current_character not in ('\n', None):
+                    self.advance()
+                self.advance()
+            elif self.current_character in DIGITS:
+                tokens.append(self.make_number())
+            elif self.current_character in LETTERS:
+                tokens.append(self.make_identifier())
+            elif self.current_character == '"':
+                tokens.append(self.make_string())
+            elif self.current_character in single_characters:
+                tokens.append(Token(single_characters[self.current_character], start_pos=self.base + self.idx))
+                self.advance()
+            elif self.current_character == '-':
+                start_pos = self.base + self.idx
+                self.advance()
+                token_type = TP_MINUS
+                if self.current_character == '>':
+                    self.advance()
+                    token_type = TP_ARROW
+                tokens.append(Token(token_type, start_pos=start_pos, end_pos=self.base + self.idx))
+            elif self.current_character in dual_characters:
+                token_type, alternate_type = dual_characters[self.current_character]
+                start_pos = self.base + self.idx
+                self.advance()
+                if self.current_character == '=':
+                    self.advance()
+                    token_type = alternate_type
+                tokens.append(Token(token_type, start_pos=start_pos, end_pos=self.base + self.idx))
+            elif self.current_character == '!':
+                start_pos = self.base + self.idx
+                self.advance()
+                if self.current_character != '=':
+                    self.advance()
+                    return [], ExpectedCharError('Expected "=" after "!"', start_pos, self.base + self.idx)
+                self.advance()
+                tokens.append(Token(TP_NE, start_pos=start_pos, end_pos=self.base + self.idx))
+            else:
+                start_pos = self.base + self.idx
+                illegal_character = self.current_character
+                self.advance()
+                return [], IllegalCharError('"' + illegal_character + '"', start_pos, self.base + self.idx)
+        tokens.append(Token(TP_EOF, start_pos=self.base + self.idx))
+        return tokens, None
+
+    def make_number(self):
+        number_str, dot_count = '', 0
+        start_pos = self.base + self.idx
+        while self.current_character is not None and self.current_character in DIGITS + '.':
+            if self.current_character == '.':
+                if dot_count == 1:
+                    break
+                dot_count += 1
+            number_str += self.current_character
+            self.advance()
+        if dot_count == 0:
+            return Token(TP_INT, int(number_str), start_pos, self.base + self.idx)
+        return Token(TP_FLOAT, float(number_str), start_pos, self.base + self.idx)
+
+    def make_identifier(self):
+        identifier_str = ''
+        start_pos = self.base + self.idx
+        while self.current_character is not None and self.current_character in LETTERS + DIGITS + '_':
+            identifier_str += self.current_character
+            self.advance()
+        token_type = KEYWORDS.get(identifier_str, TP_IDENTIFIER)
+        return Token(token_type, identifier_str, start_pos, self.base + self.idx)
+
+    def make_string(self):
+        string = ''
+        start_pos = self.base + self.idx
+        self.advance()
+        while self.current_character is not None and self.current_character != '"':
+            if self.current_character != '\\':
+                string += self.current_character
+            self.advance()
+        self.advance()
+        return Token(TP_STRING, string, start_pos, self.base + self.idx)
+
+
+def describe(tokens):
+    """
+    Flattens Tokens into comparable tuples. Offsets are made
+    relative to their Source, since both lexers register their own.
+    :param tokens: List of Token instances.
+    :return: List of (type, value, start, end) tuples.
+    """
+    return [(token.type, token.value, token.start_pos & OFFSET_MASK, token.end_pos & OFFSET_MASK)
+            for token in tokens]
+
+
+def measure(lexer_class, text, repeat):
+    """
+    Lexes the text several times and keeps the best run.
+    :param lexer_class: Lexer class to measure.
+    :param text: Source text to tokenize.
+    :param repeat: Number of runs.
+    :return: Tuple with the Tokens and the best time in seconds.
+    """
+    best, tokens = None, None
+    for _ in range(repeat):
+        gc.disable()  # Note: Same as timeit, keeps collections out of the numbers
+        start = time.perf_counter()
+        tokens, error = lexer_class(text, '<benchmark>').tokenize()
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        if error:
+            raise Exception(str(error))
+        best = elapsed if best is None else min(best, elapsed)
+    return tokens, best
+
+
+def measure_memory(text):
+    """
+    Measures the memory held by the Token list of the Lexer.
+    :param text: Source text to tokenize.
+    :return: Number of bytes allocated per Token.
+    """
+    tracemalloc.start()
+    tokens, _ = Lexer(text, '<benchmark>').tokenize()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(tokens)
+
+
+def main(blocks=500, repeat=5):
+    text = ''.join(SAMPLE.format(index=index) for index in range(blocks))
+    reference_tokens, reference_time = measure(ReferenceLexer, text, repeat)
+    tokens, lexer_time = measure(Lexer, text, repeat)
+    if describe(tokens) != describe(reference_tokens):
+        raise Exception('Token streams differ')
+    print('Source size: {} KB, {} tokens'.format(len(text) // 1024, len(tokens)))
+    print('Reference lexer: {:>12,.0f} tokens/sec'.format(len(tokens) / reference_time))
+    print('Lexer:           {:>12,.0f} tokens/sec'.format(len(tokens) / lexer_time))
+    print('Speedup:         {:>12.2f}x'.format(reference_time / lexer_time))
+    print('Memory:          {:>12.1f} bytes/token'.format(measure_memory(text)))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
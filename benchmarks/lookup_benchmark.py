@@ -0,0 +1,66 @@
+# coding=utf-8
+"""
+Microbenchmark for variable lookups, in nanoseconds per lookup.
+Reads a global variable from the SymbolTable of calls nested at
+increasing depths, once walking every parent table as SymbolTable.get
+used to, and once with SymbolTable.get, which reads the names no call
+ever sets from the global SymbolTable directly.
+Run it from the repository root:
+    $ python -m benchmarks.lookup_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.number import Number
+from bin.symbol_table import SymbolTable
+
+DEPTHS = (1, 10, 100, 1000)
+
+
+def walk(symbol_table, variable_name):
+    """Looks a variable up like SymbolTable.get did, through every parent."""
+    while True:
+        variable_value = symbol_table.symbols.get(variable_name)
+        if variable_value is not None or symbol_table.parent is None:
+            return variable_value
+        symbol_table = symbol_table.parent
+
+
+def measure(lookup, symbol_table, variable_name, count):
+    """
+    Measures the time of repeated lookups.
+    :param lookup: Function taking a SymbolTable and a name.
+    :param symbol_table: SymbolTable of the innermost call.
+    :param variable_name: Name to look up.
+    :param count: Number of lookups.
+    :return: Time per lookup in nanoseconds.
+    """
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            lookup(symbol_table, variable_name)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return elapsed * 1e9 / count
+
+
+def main(count=20000):
+    global_symbol_table = SymbolTable()
+    global_symbol_table.set('total', Number(0))
+    for depth in DEPTHS:
+        symbol_table = global_symbol_table
+        for _ in range(depth):
+            symbol_table = SymbolTable(symbol_table)
+            symbol_table.set('n', Number(depth))
+        walked = measure(walk, symbol_table, 'total', count)
+        direct = measure(SymbolTable.get, symbol_table, 'total', count)
+        print('Depth {:>5}: {:>10.1f} ns walking {:>10.1f} ns direct {:>8.2f}x'.format(
+            depth, walked, direct, walked / direct))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,76 @@
+# coding=utf-8
+"""
+Benchmark for the MEMO built-in, in milliseconds.
+Runs a FOR loop calling a scoring FUNC with few distinct arguments on
+every backend, once with the plain FUNC and once wrapped by MEMO, and
+reports the run times and the hits and misses of the cache.
+Run it from the repository root:
+    $ python -m benchmarks.memo_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from simplescript import BACKENDS, interpret, parse
+
+SCRIPT = '''FUNC score(n)
+\tVAR s = 0
+\tFOR i = 0 TO n THEN VAR s = s + i * i % 7
+\tRETURN s
+END
+VAR score = {wrapper}(score)
+VAR total = 0
+FOR i = 0 TO {size} THEN VAR total = total + score(i % 100)
+total
+'''
+
+# Note: Returns its argument, so the plain FUNC runs the same statements
+IDENTITY = 'FUNC same(function) -> function\n'
+
+
+def measure(ast, backend, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs.
+    :return: Tuple with the value of the AST and the best time in seconds.
+    """
+    best, value = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value, error = interpret(ast, backend)
+            elapsed = time.perf_counter() - start
+            if error:
+                raise Exception(str(error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return value, best
+
+
+def main(size=2000, repeat=3):
+    reference_ast, error = parse('<benchmark>', IDENTITY + SCRIPT.format(wrapper='same', size=size))
+    if error:
+        raise Exception(str(error))
+    ast, error = parse('<benchmark>', SCRIPT.format(wrapper='MEMO', size=size))
+    if error:
+        raise Exception(str(error))
+    print('FOR loop of {} calls, run time and cache hits/misses of the last run:'.format(size))
+    for backend in BACKENDS:
+        reference_value, reference_time = measure(reference_ast, backend, repeat)
+        value, memo_time = measure(ast, backend, repeat)
+        if repr(value.elements[-1]) != repr(reference_value.elements[-1]):
+            raise Exception('MEMO returned {} instead of {}'.format(value.elements[-1],
+                                                                    reference_value.elements[-1]))
+        cache = value.elements[1].cache
+        print('  {:<10} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x {:>8}/{}'.format(
+            backend, reference_time * 1000, memo_time * 1000, reference_time / memo_time,
+            cache.hits, cache.misses))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
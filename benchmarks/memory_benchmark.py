@@ -0,0 +1,124 @@
+# coding=utf-8
+"""
+Memory benchmark for the AST, in bytes per Node.
+Compares the Nodes of the Parser, which use __slots__ and keep only
+values out of Tokens, against copies of them laid out like the
+original Nodes: plain classes with an instance __dict__, holding a
+whole Token for every value, name and operator. Both ASTs are built
+by the same copy and share their offsets and strings, so the figures
+only count the Nodes, Tokens and lists themselves.
+Run it from the repository root:
+    $ python -m benchmarks.memory_benchmark
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.parser_benchmark import SAMPLE, describe
+from bin.ast_cache import NODE_CLASSES
+from bin.lexer import Lexer
+from bin.parser import Parser
+
+# Note: Same names and attributes, but stored in an instance __dict__
+PLAIN_CLASSES = {node_class: type(node_class.__name__, (), {}) for node_class in NODE_CLASSES}
+PlainToken = type('Token', (), {})
+
+# Note: Attributes which used to hold Tokens, and lists of Tokens
+TOKEN_ATTRIBUTES = {'value', 'var_name', 'op_type'}
+TOKEN_LIST_ATTRIBUTES = {'arg_names'}
+
+
+def make_plain_token(value, node):
+    """
+    Wraps a value in a Token with an instance __dict__.
+    :param value: Value, name or operator kind of the Token.
+    :param node: Node the Token belongs to, for its offsets.
+    :return: New Token instance.
+    """
+    token = PlainToken()
+    token.type = value if isinstance(value, int) else None
+    token.value = value
+    token.start_pos = node.start_pos
+    token.end_pos = node.end_pos
+    return token
+
+
+def copy_tree(value, plain):
+    """
+    Copies an AST, optionally into the original layout.
+    :param value: Node or attribute value to copy.
+    :param plain: True to copy into plain classes holding Tokens.
+    :return: Copy of the value.
+    """
+    if isinstance(value, list):
+        return [copy_tree(element, plain) for element in value]
+    if isinstance(value, tuple):
+        return tuple(copy_tree(element, plain) for element in value)
+    if type(value) not in PLAIN_CLASSES:
+        return value  # Note: Offsets, strings and flags are shared, not copied
+    copy = object.__new__(PLAIN_CLASSES[type(value)] if plain else type(value))
+    for name in type(value).__slots__:
+        attribute = getattr(value, name)
+        if plain and name in TOKEN_ATTRIBUTES and attribute is not None:
+            attribute = make_plain_token(attribute, value)
+        elif plain and name in TOKEN_LIST_ATTRIBUTES:
+            attribute = [make_plain_token(element, value) for element in attribute]
+        else:
+            attribute = copy_tree(attribute, plain)
+        setattr(copy, name, attribute)
+    return copy
+
+
+def count_nodes(root):
+    """
+    Counts the Nodes of an AST.
+    :param root: Root Node of the AST.
+    :return: Number of Nodes.
+    """
+    count, stack = 0, [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif type(value) in PLAIN_CLASSES:
+            count += 1
+            stack.extend(getattr(value, name) for name in type(value).__slots__)
+    return count
+
+
+def measure_memory(root, plain):
+    """
+    Measures the memory held by a copy of an AST.
+    :param root: Root Node of the AST.
+    :param plain: True to copy into plain classes holding Tokens.
+    :return: Tuple with the copy and the number of bytes it holds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    copy = copy_tree(root, plain)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return copy, allocated
+
+
+def main(blocks=300):
+    text = ''.join(SAMPLE.format(index=index) for index in range(blocks))
+    tokens, _ = Lexer(text, '<benchmark>').tokenize()
+    result = Parser(tokens).parse()
+    if result.error:
+        raise Exception(repr(result.error))
+    node_count = count_nodes(result.node)
+    plain_ast, plain_size = measure_memory(result.node, True)
+    slotted_ast, slotted_size = measure_memory(result.node, False)
+    if describe(slotted_ast) != describe(result.node):
+        raise Exception('ASTs differ')
+    print('Source size: {} KB, {} Nodes'.format(len(text) // 1024, node_count))
+    print('Plain Nodes:   {:>10.1f} bytes/Node'.format(plain_size / node_count))
+    print('Slotted Nodes: {:>10.1f} bytes/Node'.format(slotted_size / node_count))
+    print('Reduction:     {:>10.2f}x'.format(plain_size / slotted_size))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
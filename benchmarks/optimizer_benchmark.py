@@ -0,0 +1,119 @@
+# coding=utf-8
+"""
+Optimizer benchmark, in milliseconds.
+Runs scripts written for each pass of bin/optimizer.py on every
+backend, with the AST as parsed and once optimized, checks that
+both agree, and reports the speedup of the optimized AST.
+Run it from the repository root:
+    $ python -m benchmarks.optimizer_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin import optimizer
+from simplescript import BACKENDS, global_symbol_table, interpret, parse
+
+SCRIPTS = {
+    'folding': '''VAR debug = 0
+VAR scale = 2 * 3 + 1
+VAR total = 0
+FOR i = 0 TO {size} THEN
+\tIF debug THEN PRINT(i)
+\tVAR total = total + MATH_PI * 2 * 2 * scale - (10 - 4) / 3
+END
+total
+''',
+    'invariants': '''FUNC checksum(data, width, rounds)
+	VAR total = 0
+	FOR i = 0 TO rounds THEN
+		FOR j = 0 TO 10 THEN
+			IF IS_NUM(width) THEN VAR total = total + i * (width * width - 1) + LEN(data) * j
+		END
+	END
+	RETURN total
+END
+checksum([1, 2, 3, 4, 5], 7, {size} / 10)
+''',
+    'inlining': '''FUNC sq(x) -> x * x
+FUNC clamp(value, low, high) -> IF value < low THEN low ELIF value > high THEN high ELSE value
+VAR total = 0
+FOR i = 0 TO {size} THEN
+	VAR total = total + clamp(sq(i % 50), 10, 1000)
+END
+total
+''',
+    'elimination': '''FUNC tally(rounds)
+	VAR total = 0
+	FOR i = 0 TO rounds THEN
+		VAR scratch = 0
+		FOR j = 0 TO 20 THEN VAR total = total + j
+		WHILE total > 1000 THEN VAR total = total - 999
+	END
+	RETURN total
+	PRINT(total)
+END
+tally({size} / 4)
+''',
+}
+
+
+def measure(script, backend, optimize):
+    """
+    Measures the time to optimize and interpret a script once.
+    :param script: Source text of the script.
+    :param backend: Name of the backend.
+    :param optimize: True to optimize the AST before running it.
+    :return: Tuple with the value of the script and the time in seconds.
+    """
+    ast, error = parse('<benchmark>', script)  # Note: Optimizing rewrites the AST
+    if error:
+        raise Exception(str(error))
+    start = time.perf_counter()
+    if optimize:
+        ast = optimizer.optimize(ast, global_symbol_table)
+    value, error = interpret(ast, backend)
+    elapsed = time.perf_counter() - start
+    if error:
+        raise Exception(str(error))
+    return repr(value), elapsed
+
+
+def compare(script, backend, repeat):
+    """
+    Measures the best times to run a script as parsed and optimized.
+    Both alternate, so a change in the load of the machine affects
+    them alike instead of skewing their ratio.
+    :param script: Source text of the script.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs of each.
+    :return: Tuple with the best times as parsed and optimized, in seconds.
+    """
+    reference_time, optimized_time = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            reference_value, elapsed = measure(script, backend, False)
+            reference_time = elapsed if reference_time is None else min(reference_time, elapsed)
+            value, elapsed = measure(script, backend, True)
+            optimized_time = elapsed if optimized_time is None else min(optimized_time, elapsed)
+            if value != reference_value:
+                raise Exception('Optimized script returned {} instead of {}'.format(value, reference_value))
+    finally:
+        gc.enable()
+    return reference_time, optimized_time
+
+
+def main(size=2000, repeat=7):
+    for name, script in SCRIPTS.items():
+        script = script.format(size=size)
+        print('Script "{}":'.format(name))
+        for backend in BACKENDS:
+            reference_time, optimized_time = compare(script, backend, repeat)
+            print('  {:<10} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x'.format(
+                backend, reference_time * 1000, optimized_time * 1000, reference_time / optimized_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
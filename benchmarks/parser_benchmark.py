@@ -0,0 +1,171 @@
+# coding=utf-8
+"""
+Throughput benchmark for the Parser, in Tokens per second.
+Compares the predictive statement rules of the Parser against the
+original speculative ones, which parsed one statement too many at
+the end of every block and then rewound, kept below as a reference.
+Also reports the StackParser, which parse() falls back to on inputs
+nested too deeply for the Python stack.
+Run it from the repository root:
+    $ python -m benchmarks.parser_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.constants import *
+from bin.lexer import Lexer
+from bin.nodes import ContinueNode, BreakNode, ListNode, ReturnNode
+from bin.parse_result import ParseResult
+from bin.parser import Parser
+from bin.stack_parser import StackParser
+
+SAMPLE = '''FUNC outer_{index}(a, b)
+\tVAR total = 0
+\tFOR i = 0 TO a THEN
+\t\tIF i % 2 == 0 THEN
+\t\t\tVAR total = total + i * b
+\t\tELIF i % 3 == 0 THEN
+\t\t\tFOR j = 0 TO i THEN
+\t\t\t\tIF j > b THEN
+\t\t\t\t\tBREAK
+\t\t\t\tEND
+\t\t\t\tVAR total = total - j
+\t\t\tEND
+\t\tELSE
+\t\t\tWHILE total > 100 THEN
+\t\t\t\tVAR total = total / 2
+\t\t\tEND
+\t\t\tCONTINUE
+\t\tEND
+\tEND
+\tFUNC inner(x)
+\t\tIF x THEN
+\t\t\tRETURN x * 2
+\t\tEND
+\t\tRETURN
+\tEND
+\tRETURN inner(total)
+END
+'''
+
+
+class SpeculativeParser(Parser):
+    """Parser with the original statement rules, which rewind on failure."""
+
+    def try_statement(self, parse_result):
+        """
+        Parses a statement which may not be there, rewinding on failure.
+        :param parse_result: ParseResult of the enclosing rule.
+        :return: Node of the statement or None.
+        """
+        result = self.statement()
+        if result.error:
+            self.reverse(result.advance_count)
+            return None
+        return parse_result.register(result)
+
+    def statements(self):
+        parse_result = ParseResult()
+        statements = []
+        start_pos = self.current_token.start_pos
+        while self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+        statement = parse_result.register(self.statement())
+        if parse_result.error:
+            return parse_result
+        statements.append(statement)
+        while self.current_token.type == TP_NEWLINE:
+            while self.current_token.type == TP_NEWLINE:
+                parse_result.register_advancement()
+                self.advance()
+            statement = self.try_statement(parse_result)
+            if not statement:
+                break
+            statements.append(statement)
+        return parse_result.success(
+            ListNode(statements, start_pos, self.current_token.end_pos))
+
+    def statement(self):
+        parse_result = ParseResult()
+        start_pos = self.current_token.start_pos
+        if self.current_token.type == TP_RETURN:
+            parse_result.register_advancement()
+            self.advance()
+            result = self.expr()
+            expr = None
+            if result.error:
+                self.reverse(result.advance_count)
+            else:
+                expr = parse_result.register(result)
+            return parse_result.success(
+                ReturnNode(expr, start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_CONTINUE:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(ContinueNode(start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_BREAK:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(BreakNode(start_pos, self.current_token.start_pos))
+        return Parser.statement(self)
+
+
+def describe(node):
+    """
+    Describes an AST, to check that both Parsers agree.
+    :param node: Root Node of the AST.
+    :return: String with the structure of the AST.
+    """
+    if isinstance(node, list):
+        return '[' + ','.join(describe(element) for element in node) + ']'
+    if isinstance(node, tuple):
+        return '(' + ','.join(describe(element) for element in node) + ')'
+    if not hasattr(node, '__slots__'):
+        return repr(node)
+    return type(node).__name__ + '{' + ','.join(
+        key + '=' + describe(getattr(node, key, None)) for key in sorted(node.__slots__)) + '}'
+
+
+def measure(parser_class, tokens, repeat):
+    """
+    Measures the best parsing time over several runs.
+    :param parser_class: Parser class to use.
+    :param tokens: Tokens to parse.
+    :param repeat: Number of runs.
+    :return: Tuple with the last ParseResult and the best time in seconds.
+    """
+    best, result = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = parser_class(tokens).parse()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    if result.error:
+        raise Exception(repr(result.error))
+    return result, best
+
+
+def main(blocks=300, repeat=5):
+    text = ''.join(SAMPLE.format(index=index) for index in range(blocks))
+    tokens, _ = Lexer(text, '<benchmark>').tokenize()
+    reference_result, reference_time = measure(SpeculativeParser, tokens, repeat)
+    result, parser_time = measure(Parser, tokens, repeat)
+    stack_result, stack_parser_time = measure(StackParser, tokens, repeat)
+    if not describe(result.node) == describe(stack_result.node) == describe(reference_result.node):
+        raise Exception('ASTs differ')
+    print('Source size: {} KB, {} tokens'.format(len(text) // 1024, len(tokens)))
+    print('Speculative parser: {:>12,.0f} tokens/sec'.format(len(tokens) / reference_time))
+    print('Parser:             {:>12,.0f} tokens/sec'.format(len(tokens) / parser_time))
+    print('Speedup:            {:>12.2f}x'.format(reference_time / parser_time))
+    print('StackParser:        {:>12,.0f} tokens/sec'.format(len(tokens) / stack_parser_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
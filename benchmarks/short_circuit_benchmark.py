@@ -0,0 +1,86 @@
+# coding=utf-8
+"""
+Benchmark for the short-circuit evaluation of AND and OR, in milliseconds.
+Runs a FOR loop whose IF conditions guard a FUNC call with AND and OR
+on every backend, once as is and once with SHORT_CIRCUITS of
+bin/interpreter.py emptied, so that both operands are always evaluated
+like before, and reports how many calls each run makes and how long
+it takes.
+Run it from the repository root:
+    $ python -m benchmarks.short_circuit_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.interpreter import SHORT_CIRCUITS
+from simplescript import BACKENDS, interpret, parse
+
+SCRIPT = '''VAR calls = []
+FUNC is_prime(n)
+\tAPPEND(calls, n)
+\tIF n < 2 THEN RETURN 0
+\tVAR d = 2
+\tWHILE d * d <= n THEN
+\t\tIF n % d == 0 THEN RETURN 0
+\t\tVAR d = d + 1
+\tEND
+\tRETURN 1
+END
+VAR hits = 0
+FOR i = 0 TO {size} THEN
+\tIF i % 10 == 3 AND is_prime(i) THEN VAR hits = hits + 1
+\tIF i % 10 != 7 OR is_prime(i) THEN VAR hits = hits + 1
+END
+[hits, LEN(calls)]
+'''
+
+
+def measure(ast, backend, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs.
+    :return: Tuple with the value of the AST and the best time in seconds.
+    """
+    best, value = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value, error = interpret(ast, backend)
+            elapsed = time.perf_counter() - start
+            if error:
+                raise Exception(str(error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return value, best
+
+
+def main(size=2000, repeat=3):
+    ast, error = parse('<benchmark>', SCRIPT.format(size=size))
+    if error:
+        raise Exception(str(error))
+    print('FOR loop of {} iterations, is_prime calls and run time:'.format(size))
+    short_circuits = dict(SHORT_CIRCUITS)
+    for backend in BACKENDS:
+        SHORT_CIRCUITS.clear()  # Note: Every AND and OR evaluates both operands
+        try:
+            reference_value, reference_time = measure(ast, backend, repeat)
+        finally:
+            SHORT_CIRCUITS.update(short_circuits)
+        value, short_circuit_time = measure(ast, backend, repeat)
+        reference_hits, reference_calls = reference_value.elements[-1].elements
+        hits, calls = value.elements[-1].elements
+        if hits.value != reference_hits.value:
+            raise Exception('Short-circuits counted {} hits instead of {}'.format(hits, reference_hits))
+        print('  {:<10} {:>8} {:>8} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x'.format(
+            backend, reference_calls.value, calls.value,
+            reference_time * 1000, short_circuit_time * 1000, reference_time / short_circuit_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,241 @@
+# coding=utf-8
+"""
+Benchmark for the control flow of the Interpreter, in milliseconds.
+Runs loops with calls, RETURN, BREAK and CONTINUE, once with the
+Interpreter, whose visit_ methods return plain Values and raise
+signals, and once with the original visit_ methods, kept below as a
+reference, which wrapped every Value in a RuntimeResult and checked
+its flags after every child Node.
+Run it from the repository root:
+    $ python -m benchmarks.signal_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.context import Context
+from bin.interpreter import Function, Interpreter
+from bin.list import List
+from bin.number import Number, make_number
+from bin.runtime_result import RuntimeResult
+from bin.symbol_table import SymbolTable
+from simplescript import global_symbol_table, parse
+
+SAMPLE = '''FUNC collatz(n)
+\tVAR steps = 0
+\tWHILE 1 THEN
+\t\tIF n == 1 THEN RETURN steps
+\t\tVAR steps = steps + 1
+\t\tIF n % 2 == 0 THEN VAR n = n / 2 ELSE VAR n = 3 * n + 1
+\tEND
+END
+VAR total = 0
+FOR i = 1 TO {size} THEN
+\tIF i % 7 == 0 THEN CONTINUE
+\tIF total > 1000000000 THEN BREAK
+\tVAR total = total + collatz(i)
+END
+total
+'''
+
+
+class ReferenceFunction(Function):
+    """Function with the original RuntimeResult checks."""
+
+    def execute(self, args, context, start_pos, end_pos):
+        runtime_result = RuntimeResult()
+        exec_context = self.generate_new_context(context, start_pos, end_pos)
+        runtime_result.register(self.check_and_populate_args(self.arg_names, args, exec_context))
+        if runtime_result.should_return():
+            return runtime_result
+        value = runtime_result.register(ReferenceInterpreter().visit(self.body_node, exec_context))
+        if runtime_result.should_return() and runtime_result.func_return_value is None:
+            return runtime_result
+        return_value \
+            = (value if self.should_auto_return else None) or runtime_result.func_return_value or Number.null
+        return runtime_result.success(return_value)
+
+
+class ReferenceInterpreter(Interpreter):
+    """Interpreter with the original RuntimeResult checks, for the Nodes of the sample."""
+
+    def visit(self, node, context):
+        return self.visit_methods[type(node)](self, node, context)
+
+    def visit_numbernode(self, node, context):
+        return RuntimeResult().success(make_number(node.value))
+
+    def visit_binopnode(self, node, context):
+        runtime_result = RuntimeResult()
+        left_node = runtime_result.register(self.visit(node.left_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        right_node = runtime_result.register(self.visit(node.right_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        return runtime_result.success(self.apply_binary_operation(node, left_node, right_node, context))
+
+    def visit_varaccessnode(self, node, context):
+        return RuntimeResult().success(Interpreter.visit_varaccessnode(self, node, context))
+
+    def visit_varassignnode(self, node, context):
+        runtime_result = RuntimeResult()
+        var_value = runtime_result.register(self.visit(node.value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        context.symbol_table.set(node.var_name, var_value)
+        return runtime_result.success(var_value)
+
+    def visit_ifnode(self, node, context):
+        runtime_result = RuntimeResult()
+        for condition, expr, should_return_null in node.cases:
+            condition_value = runtime_result.register(self.visit(condition, context))
+            if runtime_result.should_return():
+                return runtime_result
+            if condition_value.is_true():
+                expr_value = runtime_result.register(self.visit(expr, context))
+                if runtime_result.should_return():
+                    return runtime_result
+                return runtime_result.success(Number.null if should_return_null else expr_value)
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            expr_value = runtime_result.register(self.visit(expr, context))
+            if runtime_result.should_return():
+                return runtime_result
+            return runtime_result.success(Number.null if should_return_null else expr_value)
+        return runtime_result.success(Number.null)
+
+    def visit_fornode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        start_value = runtime_result.register(self.visit(node.start_value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        end_value = runtime_result.register(self.visit(node.end_value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        index = start_value.value
+        while index < end_value.value:
+            context.symbol_table.set(node.var_name, make_number(index))
+            index += 1
+            current_value = runtime_result.register(self.visit(node.body_node, context))
+            if runtime_result.should_return() \
+                    and runtime_result.loop_should_continue is False \
+                    and runtime_result.loop_should_break is False:
+                return runtime_result
+            if runtime_result.loop_should_continue:
+                continue
+            if runtime_result.loop_should_break:
+                break
+            if not node.should_return_null:
+                elements.append(current_value)
+        return runtime_result.success(Number.null if node.should_return_null else List(elements))
+
+    def visit_whilenode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        while True:
+            condition = runtime_result.register(self.visit(node.condition, context))
+            if runtime_result.should_return():
+                return runtime_result
+            if not condition.is_true():
+                break
+            current_value = runtime_result.register(self.visit(node.body_node, context))
+            if runtime_result.should_return() \
+                    and runtime_result.loop_should_continue is False \
+                    and runtime_result.loop_should_break is False:
+                return runtime_result
+            if runtime_result.loop_should_continue:
+                continue
+            if runtime_result.loop_should_break:
+                break
+            if not node.should_return_null:
+                elements.append(current_value)
+        return runtime_result.success(Number.null if node.should_return_null else List(elements))
+
+    def visit_funcdefnode(self, node, context):
+        func_node = ReferenceFunction(node.var_name, node.body_node, node.arg_names, node.should_auto_return)
+        context.symbol_table.set(node.var_name, func_node)
+        return RuntimeResult().success(func_node)
+
+    def visit_callnode(self, node, context):
+        args = []
+        runtime_result = RuntimeResult()
+        value_to_call = runtime_result.register(self.visit(node.node_to_call, context))
+        if runtime_result.should_return():
+            return runtime_result
+        for arg_node in node.arg_nodes:
+            args.append(runtime_result.register(self.visit(arg_node, context)))
+            if runtime_result.should_return():
+                return runtime_result
+        return_value = runtime_result.register(value_to_call.execute(args, context, node.start_pos, node.end_pos))
+        if runtime_result.should_return():
+            return runtime_result
+        return runtime_result.success(return_value)
+
+    def visit_listnode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        for element_node in node.element_nodes:
+            elements.append(runtime_result.register(self.visit(element_node, context)))
+            if runtime_result.should_return():
+                return runtime_result
+        return runtime_result.success(List(elements))
+
+    def visit_returnnode(self, node, context):
+        runtime_result = RuntimeResult()
+        value = runtime_result.register(self.visit(node.node_to_return, context))
+        if runtime_result.should_return():
+            return runtime_result
+        return runtime_result.success_return(value)
+
+    def visit_continuenode(self, node, context):
+        return RuntimeResult().success_continue()
+
+    def visit_breaknode(self, node, context):
+        return RuntimeResult().success_break()
+
+
+def measure(interpreter_class, ast, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param interpreter_class: Interpreter class to use.
+    :param ast: Root Node of the AST.
+    :param repeat: Number of runs.
+    :return: Tuple with the value of the AST and the best time in seconds.
+    """
+    best, value = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            context = Context('<benchmark>')
+            context.symbol_table = SymbolTable(global_symbol_table)
+            start = time.perf_counter()
+            result = interpreter_class().visit(ast, context)
+            elapsed = time.perf_counter() - start
+            if result.error:
+                raise Exception(str(result.error))
+            value = repr(result.value)
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return value, best
+
+
+def main(size=300, repeat=5):
+    ast, error = parse('<benchmark>', SAMPLE.format(size=size))
+    if error:
+        raise Exception(str(error))
+    reference_value, reference_time = measure(ReferenceInterpreter, ast, repeat)
+    value, signal_time = measure(Interpreter, ast, repeat)
+    if value != reference_value:
+        raise Exception('Signals returned {} instead of {}'.format(value, reference_value))
+    print('FOR loop of {} calls'.format(size))
+    print('RuntimeResult flags: {:>10.2f} ms'.format(reference_time * 1000))
+    print('Signals:             {:>10.2f} ms'.format(signal_time * 1000))
+    print('Speedup:             {:>10.2f}x'.format(reference_time / signal_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,95 @@
+# coding=utf-8
+"""
+Benchmark for the shared small-int Numbers, in Numbers built per loop iteration.
+Runs a comparison-heavy FOR loop on every backend, once with the
+default range of shared Numbers of bin/number.py and once with the
+sharing turned off, and reports how many Numbers each run builds and
+how long it takes.
+Run it from the repository root:
+    $ python -m benchmarks.small_int_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin import number
+from bin.number import Number
+from simplescript import BACKENDS, interpret, parse
+
+SCRIPT = '''VAR hits = 0
+FOR i = 0 TO {size} THEN
+\tVAR n = i % 200
+\tIF n % 3 == 0 OR n % 5 == 0 THEN VAR hits = hits + 1
+\tIF NOT (n < 100) AND n != 150 THEN VAR hits = hits - 1
+END
+hits
+'''
+
+
+def count_numbers(function, *args):
+    """
+    Counts the Numbers built by a call.
+    :param function: Function to call.
+    :param args: Arguments of the function.
+    :return: Tuple with the result of the call and the number of Numbers built.
+    """
+    count = 0
+    original_init = Number.__init__
+
+    def counting_init(self, value):
+        nonlocal count
+        count += 1
+        original_init(self, value)
+
+    Number.__init__ = counting_init
+    try:
+        return function(*args), count
+    finally:
+        Number.__init__ = original_init
+
+
+def measure(ast, backend, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend.
+    :param repeat: Number of runs.
+    :return: Tuple with the value of the AST and the best time in seconds.
+    """
+    best, value = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value, error = interpret(ast, backend)
+            elapsed = time.perf_counter() - start
+            if error:
+                raise Exception(str(error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return repr(value), best
+
+
+def main(size=5000, repeat=3):
+    ast, error = parse('<benchmark>', SCRIPT.format(size=size))
+    if error:
+        raise Exception(str(error))
+    print('FOR loop of {} iterations, Numbers built per iteration and run time:'.format(size))
+    for backend in BACKENDS:
+        number.cache_small_ints(0, -1)  # Note: An empty range, every Number is built
+        (reference_value, _), reference_count = count_numbers(measure, ast, backend, 1)
+        _, reference_time = measure(ast, backend, repeat)
+        number.cache_small_ints()
+        (value, _), count = count_numbers(measure, ast, backend, 1)
+        _, shared_time = measure(ast, backend, repeat)
+        if value != reference_value:
+            raise Exception('Shared Numbers returned {} instead of {}'.format(value, reference_value))
+        print('  {:<10} {:>8.2f} {:>8.2f} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x'.format(
+            backend, reference_count / size, count / size,
+            reference_time * 1000, shared_time * 1000, reference_time / shared_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
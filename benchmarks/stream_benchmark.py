@@ -0,0 +1,64 @@
+# coding=utf-8
+"""
+Peak memory benchmark for streamed scripts.
+Runs the same machine-generated script with run(), which reads,
+tokenizes and parses the whole file up front, and with run_stream(),
+which only holds the Tokens and Nodes of one statement at a time.
+Doubling the size of the script doubles the peak of both, but the
+peak of run_stream() only holds the text of the script, which it
+keeps to print errors.
+Run it from the repository root:
+    $ python -m benchmarks.stream_benchmark
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from simplescript import run, run_stream
+
+STATEMENT = 'VAR total = ({index} + 3.5) * 2 - {index} / 4 ^ 2\n'
+
+
+def measure_peak(runner, fn):
+    """
+    Measures the peak memory used to run a script.
+    :param runner: Function reading and running the script file.
+    :param fn: File name of the script.
+    :return: Peak number of bytes allocated while running.
+    """
+    tracemalloc.start()
+    _, error = runner(fn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if error:
+        raise Exception(repr(error))
+    return peak
+
+
+def run_whole(fn):
+    with open(fn) as file:
+        return run(fn, file.read())
+
+
+def run_streamed(fn):
+    with open(fn) as file:
+        return run_stream(fn, file)
+
+
+def main(statements=20000):
+    for count in (statements, statements * 2):
+        with tempfile.NamedTemporaryFile('w', suffix='.ss', delete=False) as file:
+            file.writelines(STATEMENT.format(index=index) for index in range(count))
+        try:
+            whole_peak = measure_peak(run_whole, file.name)
+            streamed_peak = measure_peak(run_streamed, file.name)
+        finally:
+            os.remove(file.name)
+        print('{:>7} statements:  run() {:>8.1f} KB peak   run_stream() {:>8.1f} KB peak'.format(
+            count, whole_peak / 1024, streamed_peak / 1024))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,114 @@
+# coding=utf-8
+"""
+Microbenchmark for Interpreter.visit, in nanoseconds per Node.
+Runs a tight WHILE loop calling a built-in function, once with the
+class-level dispatch tables of the Interpreter and BuiltInFunction,
+and once with the original lookups, kept below as a reference,
+which formatted a method name and called getattr() on every visit
+and every built-in call.
+Run it from the repository root:
+    $ python -m benchmarks.visit_benchmark
+"""
+
+import gc
+import sys
+import time
+
+from bin.context import Context
+from bin.interpreter import Interpreter
+from bin.runtime_result import RuntimeResult
+from bin.symbol_table import SymbolTable
+from simplescript import BuiltInFunction, global_symbol_table, parse
+
+SAMPLE = '''VAR i = 0
+VAR total = 0
+WHILE i < {iterations} THEN
+\tVAR total = total + i * 2 - IS_NUM(i)
+\tVAR i = i + 1
+END
+'''
+
+
+class ReferenceInterpreter(Interpreter):
+    """Interpreter with the original getattr() dispatch."""
+
+    def evaluate(self, node, context):
+        method_name = 'visit_{}'.format(type(node).__name__.lower())
+        method = getattr(self, method_name, self.no_visit_method)
+        return method(node, context)
+
+
+class CountingInterpreter(Interpreter):
+    """Interpreter which counts the Nodes it visits."""
+
+    def __init__(self):
+        self.count = 0
+
+    def evaluate(self, node, context):
+        self.count += 1
+        return Interpreter.evaluate(self, node, context)
+
+
+class ReferenceBuiltInFunction(BuiltInFunction):
+    """BuiltInFunction with the original getattr() lookup on every call."""
+
+    def execute(self, args, context, start_pos, end_pos):
+        runtime_result = RuntimeResult()
+        exec_context = self.generate_new_context(context, start_pos, end_pos)
+        method_name = 'execute_{}'.format(self.name.lower())
+        method = getattr(self, method_name, self.no_visit_method)
+        runtime_result.register(self.check_and_populate_args(method.arg_names, args, exec_context))
+        if runtime_result.error:
+            return runtime_result
+        return_value = runtime_result.register(method(exec_context))
+        if runtime_result.error:
+            return runtime_result
+        return return_value
+
+    def copy(self):
+        return ReferenceBuiltInFunction(self.name)
+
+
+def measure(interpreter_class, builtin, ast, repeat):
+    """
+    Measures the best time to interpret an AST over several runs.
+    :param interpreter_class: Interpreter class to use.
+    :param builtin: IS_NUM built-in to use.
+    :param ast: Root Node of the AST.
+    :param repeat: Number of runs.
+    :return: Tuple with the interpreter of the last run and the best time in seconds.
+    """
+    best, interpreter = None, None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            interpreter = interpreter_class()
+            context = Context('<benchmark>')
+            context.symbol_table = SymbolTable(global_symbol_table)
+            context.symbol_table.set('IS_NUM', builtin)
+            start = time.perf_counter()
+            result = interpreter.visit(ast, context)
+            elapsed = time.perf_counter() - start
+            if result.error:
+                raise Exception(str(result.error))
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return interpreter, best
+
+
+def main(iterations=20000, repeat=5):
+    ast, error = parse('<benchmark>', SAMPLE.format(iterations=iterations))
+    if error:
+        raise Exception(str(error))
+    counter, _ = measure(CountingInterpreter, BuiltInFunction.is_number, ast, 1)
+    _, reference_time = measure(ReferenceInterpreter, ReferenceBuiltInFunction('is_number'), ast, repeat)
+    _, table_time = measure(Interpreter, BuiltInFunction.is_number, ast, repeat)
+    print('WHILE loop of {} iterations, {} Nodes visited'.format(iterations, counter.count))
+    print('getattr() dispatch: {:>10.1f} ns/Node'.format(reference_time * 1e9 / counter.count))
+    print('Dispatch tables:    {:>10.1f} ns/Node'.format(table_time * 1e9 / counter.count))
+    print('Speedup:            {:>10.2f}x'.format(reference_time / table_time))
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,248 @@
+# coding=utf-8
+"""
+Caches parsed ASTs on disk, similar to the .pyc files of Python.
+The AST of a script is stored next to it in "<script>.ssc", keyed by
+the SHA-256 of the source text and by CACHE_VERSION. Nodes are stored
+as a flat tuple in post-order, each one holding the indices of its
+children, so neither writing nor reading recurses however deep the
+AST is. Offsets are stored relative to the start of the source and
+rebased on load onto a freshly registered Source.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+
+from bin.nodes import *
+from bin.source import OFFSET_MASK, Source
+
+# Note: Bump the version whenever Node classes, their constructors,
+#       or the int Token kinds in bin/constants.py change
+CACHE_MAGIC = 'SimpleScript AST'
+CACHE_VERSION = 2
+CACHE_EXTENSION = '.ssc'
+
+######################################
+# CONSTRUCTOR ARGUMENTS OF ALL NODES #
+######################################
+
+# Note: Every Node is rebuilt by calling its constructor with these
+#       attributes, in this order. The kind tells how to store them.
+NODE_FIELDS = {
+    NumberNode: (('value', 'value'), ('start_pos', 'offset'), ('end_pos', 'offset')),
+    StringNode: (('value', 'value'), ('start_pos', 'offset'), ('end_pos', 'offset')),
+    VarAccessNode: (('var_name', 'name'), ('start_pos', 'offset'), ('end_pos', 'offset')),
+    VarAssignNode: (('var_name', 'name'), ('value_node', 'node'), ('start_pos', 'offset')),
+    BinOpNode: (('left_node', 'node'), ('op_type', 'value'), ('right_node', 'node')),
+    UnaryOpNode: (('op_type', 'value'), ('right_node', 'node'), ('start_pos', 'offset')),
+    IfNode: (('cases', 'cases'), ('else_case', 'else_case')),
+    ForNode: (('var_name', 'name'), ('start_value_node', 'node'), ('end_value_node', 'node'),
+              ('step_value_node', 'node'), ('body_node', 'node'), ('should_return_null', 'value'),
+              ('start_pos', 'offset')),
+    WhileNode: (('condition', 'node'), ('body_node', 'node'), ('should_return_null', 'value')),
+    FuncDefNode: (('var_name', 'name'), ('arg_names', 'names'), ('body_node', 'node'),
+                  ('should_auto_return', 'value'), ('start_pos', 'offset')),
+    CallNode: (('node_to_call', 'node'), ('arg_nodes', 'nodes')),
+    ListNode: (('element_nodes', 'nodes'), ('start_pos', 'offset'), ('end_pos', 'offset')),
+    ReturnNode: (('node_to_return', 'node'), ('start_pos', 'offset'), ('end_pos', 'offset')),
+    ContinueNode: (('start_pos', 'offset'), ('end_pos', 'offset')),
+    BreakNode: (('start_pos', 'offset'), ('end_pos', 'offset')),
+}
+NODE_CLASSES = list(NODE_FIELDS)
+NODE_INDICES = {node_class: index for index, node_class in enumerate(NODE_CLASSES)}
+
+
+def get_cache_path(fn):
+    """
+    Returns the path of the cache file of a script.
+    :param fn: File name of the script.
+    :return: Path of the cache file.
+    """
+    return fn + CACHE_EXTENSION
+
+
+def get_digest(text):
+    """
+    Hashes the source text of a script.
+    :param text: Source text of the script.
+    :return: SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest()
+
+
+def load(fn, text):
+    """
+    Loads the cached AST of a script, if it matches the text.
+    :param fn: File name of the script.
+    :param text: Current source text of the script.
+    :return: Root Node of the AST, or None if there is no valid cache.
+    """
+    try:
+        with open(get_cache_path(fn), 'rb') as file:
+            # Note: marshal.load() reads a file in small pieces, which is slower
+            magic, version, digest, records = marshal.loads(file.read())
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or digest != get_digest(text):
+            return None
+        return decode(records, Source(fn, text).base)
+    except Exception:
+        return None  # Note: Missing, unreadable, foreign or corrupted files are ignored
+
+
+def dump(fn, text, node):
+    """
+    Writes the AST of a script to its cache file. Failures are ignored,
+    the script simply gets parsed again next time.
+    :param fn: File name of the script.
+    :param text: Source text the AST was parsed from.
+    :param node: Root Node of the AST.
+    """
+    path = get_cache_path(fn)
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        data = marshal.dumps((CACHE_MAGIC, CACHE_VERSION, get_digest(text), encode(node)))
+        with open(temporary_path, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_path, path)  # Note: Readers never see half a file
+    except (OSError, ValueError):
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+############################
+# ENCODING AND DECODING    #
+# BOTH WITHOUT RECURSION   #
+############################
+
+def get_children(node):
+    """
+    Lists the child Nodes of a Node, in constructor order.
+    :param node: Node whose children we want.
+    :return: List of child Nodes.
+    """
+    children = []
+    for name, kind in NODE_FIELDS[type(node)]:
+        value = getattr(node, name)
+        if kind == 'node' and value is not None:
+            children.append(value)
+        elif kind == 'nodes':
+            children.extend(value)
+        elif kind == 'cases':
+            for condition, expr, _ in value:
+                children.extend((condition, expr))
+        elif kind == 'else_case' and value is not None:
+            children.append(value[0])
+    return children
+
+
+def encode(root):
+    """
+    Flattens an AST into a tuple of records in post-order. A record
+    holds the index of the Node class and its constructor arguments,
+    where child Nodes are replaced by the index of their record.
+    :param root: Root Node of the AST.
+    :return: Tuple of records, the root being the last one.
+    """
+    records, indices = [], {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(get_children(node)))
+            continue
+        record = [NODE_INDICES[type(node)]]
+        for name, kind in NODE_FIELDS[type(node)]:
+            value = getattr(node, name)
+            if kind == 'names':
+                record.append(tuple(value))
+            elif kind == 'node':
+                record.append(None if value is None else indices[id(value)])
+            elif kind == 'nodes':
+                record.append(tuple(indices[id(child)] for child in value))
+            elif kind == 'cases':
+                record.append(tuple((indices[id(condition)], indices[id(expr)], should_return_null)
+                                    for condition, expr, should_return_null in value))
+            elif kind == 'else_case':
+                record.append(None if value is None else (indices[id(value[0])], value[1]))
+            elif kind == 'offset':
+                record.append(value & OFFSET_MASK)
+            else:  # Plain values are stored as they are
+                record.append(value)
+        indices[id(node)] = len(records)
+        records.append(tuple(record))
+    return tuple(records)
+
+
+##################################################
+# One decoder per Node class, in NODE_CLASSES    #
+# order. Each takes the record, the Nodes decoded #
+# so far and the base offset of the Source.      #
+# Note: Names are interned, like the Lexer does. #
+##################################################
+
+def decode_if(record, nodes, base):
+    else_case = record[2]
+    return IfNode([(nodes[condition], nodes[expr], should_return_null)
+                   for condition, expr, should_return_null in record[1]],
+                  None if else_case is None else (nodes[else_case[0]], else_case[1]))
+
+
+def decode_for(record, nodes, base):
+    step_index = record[4]
+    return ForNode(sys.intern(record[1]), nodes[record[2]], nodes[record[3]],
+                   None if step_index is None else nodes[step_index], nodes[record[5]], record[6],
+                   base + record[7])
+
+
+def decode_func_def(record, nodes, base):
+    name = record[1]
+    return FuncDefNode(None if name is None else sys.intern(name),
+                       [sys.intern(arg_name) for arg_name in record[2]],
+                       nodes[record[3]], record[4], base + record[5])
+
+
+def decode_return(record, nodes, base):
+    return_index = record[1]
+    return ReturnNode(None if return_index is None else nodes[return_index],
+                      base + record[2], base + record[3])
+
+
+DECODERS = {
+    NumberNode: lambda record, nodes, base: NumberNode(record[1], base + record[2], base + record[3]),
+    StringNode: lambda record, nodes, base: StringNode(record[1], base + record[2], base + record[3]),
+    VarAccessNode: lambda record, nodes, base: VarAccessNode(
+        sys.intern(record[1]), base + record[2], base + record[3]),
+    VarAssignNode: lambda record, nodes, base: VarAssignNode(
+        sys.intern(record[1]), nodes[record[2]], base + record[3]),
+    BinOpNode: lambda record, nodes, base: BinOpNode(nodes[record[1]], record[2], nodes[record[3]]),
+    UnaryOpNode: lambda record, nodes, base: UnaryOpNode(record[1], nodes[record[2]], base + record[3]),
+    IfNode: decode_if,
+    ForNode: decode_for,
+    WhileNode: lambda record, nodes, base: WhileNode(nodes[record[1]], nodes[record[2]], record[3]),
+    FuncDefNode: decode_func_def,
+    CallNode: lambda record, nodes, base: CallNode(
+        nodes[record[1]], [nodes[index] for index in record[2]]),
+    ListNode: lambda record, nodes, base: ListNode(
+        [nodes[index] for index in record[1]], base + record[2], base + record[3]),
+    ReturnNode: decode_return,
+    ContinueNode: lambda record, nodes, base: ContinueNode(base + record[1], base + record[2]),
+    BreakNode: lambda record, nodes, base: BreakNode(base + record[1], base + record[2]),
+}
+DECODER_LIST = [DECODERS[node_class] for node_class in NODE_CLASSES]
+
+
+def decode(records, base):
+    """
+    Rebuilds an AST from its flat records.
+    :param records: Tuple of records made by encode().
+    :param base: Base offset of the Source the AST belongs to.
+    :return: Root Node of the AST.
+    """
+    nodes = []
+    append, decoders = nodes.append, DECODER_LIST
+    for record in records:
+        append(decoders[record[0]](record, nodes, base))
+    return nodes[-1]
@@ -0,0 +1,278 @@
+# coding=utf-8
+"""
+Represents the bytecode of the SimpleScript virtual machine.
+The BytecodeCompiler turns an AST into a Code object: a flat list of
+(opcode, argument) pairs run by bin/virtual_machine.py. Arguments are
+Python objects, most of them the Node being compiled, which keeps
+the offsets needed by errors. FOR and WHILE loops become
+jumps, BREAK and CONTINUE jump to the targets of their loop block.
+"""
+
+from bin.closure_compiler import BINARY_METHODS, NUMBER_OPERATIONS, SHORT_CIRCUITS
+from bin.nodes import NODE_TYPES
+
+################################
+# OPCODES OF THE VIRTUAL       #
+# MACHINE, MOST FREQUENT FIRST #
+################################
+
+LOAD_NAME = 0         # VarAccessNode, pushes the value of the variable
+LOAD_NUMBER = 1       # NumberNode, pushes a new Number
+BINARY_OP = 2         # (number operation, Value method, BinOpNode), pops two values
+STORE_NAME = 3        # Variable name, keeps the value on the stack
+POP_JUMP_IF_FALSE = 4  # Target, pops the condition
+JUMP = 5              # Target
+FOR_ITER = 6          # (variable name, target), sets the variable or jumps out
+POP_TOP = 7           # Ends the body of a loop whose List is never used
+LOOP_APPEND = 8       # Pops the value of a loop body into the elements of the loop
+BUILD_LIST = 9        # (element count, ListNode)
+CALL = 10             # (CallNode, argument count), pops the arguments and the callee
+RETURN_VALUE = 11     # True when implicit, at the end of a body
+LOAD_NULL = 12        # Pushes Number.null
+LOAD_STRING = 13      # StringNode
+UNARY_OP = 14         # UnaryOpNode
+MAKE_FUNCTION = 15    # (FuncDefNode, Code of the body)
+SETUP_FOR = 16        # (has step, continue target, break target), pops start, end and step
+SETUP_WHILE = 17      # (continue target, break target)
+END_LOOP = 18         # ForNode or WhileNode, pops the loop block and its elements
+BREAK_LOOP = 19
+CONTINUE_LOOP = 20
+LOAD_INVARIANT = 21   # (InvariantNode, target), pushes its kept Value and jumps, if valid
+STORE_INVARIANT = 22  # InvariantNode, keeps the value on the stack
+END_INLINED_CALL = 23  # InlinedCallNode, removes its arguments
+TAIL_CALL = 24        # (TailCallNode, argument count), like CALL, reruns the running Function in its frame
+SHORT_CIRCUIT = 25    # (deciding truth, target), replaces a deciding Number by TRUE or FALSE and jumps
+
+OPCODE_NAMES = {value: name for name, value in list(globals().items())
+                if name.isupper() and isinstance(value, int)}
+
+
+class Code:
+    """Compiled bytecode of an AST."""
+
+    def __init__(self, name):
+        """
+        Initializes an empty Code instance.
+        :param name: Name of the Function or program being compiled.
+        """
+        self.name = name
+        self.instructions = []
+        self.inlined_calls = []  # Note: (start, end, InlinedCallNode) of every inlined body
+
+    def __repr__(self):
+        return '<code {}>'.format(self.name)
+
+    def emit(self, opcode, argument=None):
+        """
+        Appends an instruction.
+        :param opcode: Opcode of the instruction.
+        :param argument: Argument of the instruction.
+        :return: Index of the argument, to patch jump targets.
+        """
+        self.instructions.append(opcode)
+        self.instructions.append(argument)
+        return len(self.instructions) - 1
+
+    def here(self):
+        """
+        Returns the index of the next instruction, as a jump target.
+        :return: Index in the instruction list.
+        """
+        return len(self.instructions)
+
+    def disassemble(self):
+        """
+        Lists the instructions, for debugging the compiler.
+        :return: String with one instruction per line.
+        """
+        lines = []
+        for index in range(0, len(self.instructions), 2):
+            opcode, argument = self.instructions[index], self.instructions[index + 1]
+            lines.append('{:>5} {:<18} {}'.format(index, OPCODE_NAMES[opcode],
+                                                  '' if argument is None else repr(argument)))
+        return '\n'.join(lines)
+
+
+class BytecodeCompiler:
+    """Compiles Nodes into Code instances."""
+
+    # Note: Maps every Node class to its compile_ function, like
+    #       the visit_methods of the Interpreter
+    compile_methods = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compile_methods = cls.make_compile_methods()
+
+    @classmethod
+    def make_compile_methods(cls):
+        """
+        Builds the dispatch table of the compile_ methods of the class.
+        :return: Dictionary mapping Node classes to unbound compile_ functions.
+        """
+        return {node_class: getattr(cls, 'compile_{}'.format(node_class.__name__.lower()), cls.no_compile_method)
+                for node_class in NODE_TYPES}
+
+    def compile_code(self, node, name='<program>'):
+        """
+        Compiles a program or the body of a Function.
+        :param node: Root Node to compile.
+        :param name: Name of the Code.
+        :return: Code instance, which returns the value of the Node.
+        """
+        code = Code(name)
+        self.compile(node, code)
+        code.emit(RETURN_VALUE, True)
+        return code
+
+    def compile(self, node, code):
+        """
+        Compiles a Node and its children, leaving its value on the stack.
+        :param node: Node we wish to compile.
+        :param code: Code instance to append to.
+        """
+        self.compile_methods.get(type(node), BytecodeCompiler.no_compile_method)(self, node, code)
+
+    def no_compile_method(self, node, code):
+        """
+        Handle unknown methods for compiling Nodes.
+        :param node: Node we tried to compile.
+        :param code: Code instance being compiled.
+        """
+        raise Exception('No compile_{} method defined.'.format(type(node).__name__.lower()))
+
+    #####################################################
+    # Every compile_ method pushes exactly one value,   #
+    # mirroring the visit_ method of the Interpreter.   #
+    #####################################################
+
+    def compile_numbernode(self, node, code):
+        code.emit(LOAD_NUMBER, node)
+
+    def compile_stringnode(self, node, code):
+        code.emit(LOAD_STRING, node)
+
+    def compile_varaccessnode(self, node, code):
+        code.emit(LOAD_NAME, node)
+
+    def compile_varassignnode(self, node, code):
+        self.compile(node.value_node, code)
+        code.emit(STORE_NAME, node.var_name)
+
+    def compile_binopnode(self, node, code):
+        self.compile(node.left_node, code)
+        deciding = SHORT_CIRCUITS.get(node.op_type)
+        if deciding is not None:  # Note: AND and OR skip their right operand
+            end_jump = code.emit(SHORT_CIRCUIT)
+        self.compile(node.right_node, code)
+        code.emit(BINARY_OP, (NUMBER_OPERATIONS.get(node.op_type), BINARY_METHODS[node.op_type], node))
+        if deciding is not None:
+            code.instructions[end_jump] = (deciding, code.here())
+
+    def compile_unaryopnode(self, node, code):
+        self.compile(node.right_node, code)
+        code.emit(UNARY_OP, node)
+
+    def compile_ifnode(self, node, code):
+        end_jumps = []
+        for condition, expr, should_return_null in node.cases:
+            self.compile(condition, code)
+            next_jump = code.emit(POP_JUMP_IF_FALSE)
+            self.compile_branch(expr, should_return_null, code)
+            end_jumps.append(code.emit(JUMP))
+            code.instructions[next_jump] = code.here()
+        if node.else_case:
+            self.compile_branch(node.else_case[0], node.else_case[1], code)
+        else:
+            code.emit(LOAD_NULL)
+        for end_jump in end_jumps:
+            code.instructions[end_jump] = code.here()
+
+    def compile_branch(self, expr, should_return_null, code):
+        self.compile(expr, code)
+        if should_return_null:
+            code.emit(POP_TOP)
+            code.emit(LOAD_NULL)
+
+    def compile_fornode(self, node, code):
+        self.compile(node.start_value_node, code)
+        self.compile(node.end_value_node, code)
+        if node.step_value_node:
+            self.compile(node.step_value_node, code)
+        setup = code.emit(SETUP_FOR)
+        loop_start = code.here()
+        iteration = code.emit(FOR_ITER)
+        self.compile(node.body_node, code)
+        code.emit(POP_TOP if node.should_return_null else LOOP_APPEND)
+        code.emit(JUMP, loop_start)
+        loop_end = code.here()
+        code.emit(END_LOOP, node)
+        code.instructions[setup] = (node.step_value_node is not None, loop_start, loop_end)
+        code.instructions[iteration] = (node.var_name, loop_end)
+
+    def compile_whilenode(self, node, code):
+        setup = code.emit(SETUP_WHILE)
+        loop_start = code.here()
+        self.compile(node.condition, code)
+        exit_jump = code.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.body_node, code)
+        code.emit(POP_TOP if node.should_return_null else LOOP_APPEND)
+        code.emit(JUMP, loop_start)
+        loop_end = code.here()
+        code.emit(END_LOOP, node)
+        code.instructions[setup] = (loop_start, loop_end)
+        code.instructions[exit_jump] = loop_end
+
+    def compile_funcdefnode(self, node, code):
+        # Note: The body is compiled once, every call runs the same Code
+        body_code = self.compile_code(node.body_node, node.var_name or '<anonymous>')
+        code.emit(MAKE_FUNCTION, (node, body_code))
+
+    def compile_callnode(self, node, code):
+        self.compile(node.node_to_call, code)
+        for arg_node in node.arg_nodes:
+            self.compile(arg_node, code)
+        code.emit(CALL, (node, len(node.arg_nodes)))
+
+    def compile_tailcallnode(self, node, code):
+        self.compile(node.node_to_call, code)
+        for arg_node in node.arg_nodes:
+            self.compile(arg_node, code)
+        code.emit(TAIL_CALL, (node, len(node.arg_nodes)))
+
+    def compile_inlinedcallnode(self, node, code):
+        for var_name, arg_node in zip(node.var_names, node.arg_nodes):
+            self.compile(arg_node, code)
+            code.emit(STORE_NAME, var_name)
+            code.emit(POP_TOP)
+        start = code.here()
+        self.compile(node.body_node, code)
+        code.inlined_calls.append((start, code.here(), node))
+        code.emit(END_INLINED_CALL, node)
+
+    def compile_listnode(self, node, code):
+        for element_node in node.element_nodes:
+            self.compile(element_node, code)
+        code.emit(BUILD_LIST, (len(node.element_nodes), node))
+
+    def compile_returnnode(self, node, code):
+        if node.node_to_return:
+            self.compile(node.node_to_return, code)
+        else:
+            code.emit(LOAD_NULL)
+        code.emit(RETURN_VALUE, False)
+
+    def compile_continuenode(self, node, code):
+        code.emit(CONTINUE_LOOP)
+
+    def compile_breaknode(self, node, code):
+        code.emit(BREAK_LOOP)
+
+    def compile_invariantnode(self, node, code):
+        load = code.emit(LOAD_INVARIANT)
+        self.compile(node.expr_node, code)
+        code.emit(STORE_INVARIANT, node)
+        code.instructions[load] = (node, code.here())
+
+
+BytecodeCompiler.compile_methods = BytecodeCompiler.make_compile_methods()
@@ -0,0 +1,376 @@
+# coding=utf-8
+"""
+Represents the closure-compiling backend.
+Every Node is compiled once into a Python closure taking the Context
+and returning the Value of the Node, with its children compiled into
+the closures it calls. Evaluating a Node then costs a single call,
+without dispatching on its class or allocating a RuntimeResult. The
+closures build the same Values as the Interpreter, so results and
+error positions do not change. Errors, RETURN, BREAK and CONTINUE
+are raised as the signals of bin/signals.py.
+"""
+
+import operator
+
+from bin.constants import *
+from bin.errors import ActiveRuntimeError
+from bin.inlining import add_inlined_frame
+from bin.interpreter import BINARY_METHODS, SHORT_CIRCUITS, UNARY_METHODS, Function
+from bin.invariants import load_invariant, store_invariant
+from bin.list import List
+from bin.nodes import NODE_TYPES
+from bin.number import Number, make_number
+from bin.signals import *
+from bin.stack_interpreter import StackInterpreter
+from bin.string import String
+from bin.value import operation_error
+
+# Note: Operators computed inline when both operands are Numbers,
+#       giving the same result as the Number methods. Divisions
+#       are left out, they check for zero.
+NUMBER_OPERATIONS = {
+    TP_PLUS: operator.add,
+    TP_MINUS: operator.sub,
+    TP_MUL: operator.mul,
+    TP_POWER: operator.pow,
+}
+NUMBER_OPERATIONS.update({op_type: (lambda function: lambda left, right: int(function(left, right)))(function)
+                          for op_type, function in operations.items()})
+
+
+class CompiledFunction(Function):
+    """Function whose body has been compiled into a closure."""
+
+    def __init__(self, name, body_node, arg_names, should_auto_return, body_code):
+        """
+        Initializes a CompiledFunction instance.
+        :param name: Name of the function.
+        :param body_node: Body Node instance of the function.
+        :param arg_names: Argument names for the function.
+        :param should_auto_return: True if the Function should automatically return its value.
+        :param body_code: Closure compiled from the body Node.
+        """
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.body_code = body_code
+
+    def run_body(self, exec_context):
+        """
+        Runs the compiled body of the Function once.
+        :param exec_context: Context of the call, with the arguments set.
+        :return: Value returned by the body.
+        """
+        try:
+            value = self.body_code(exec_context)
+        except ReturnSignal as signal:
+            return signal.value
+        return value if self.should_auto_return else Number.null
+
+    def copy(self):
+        """
+        Copies a CompiledFunction instance.
+        :return: A new CompiledFunction instance.
+        """
+        return CompiledFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.body_code)
+
+
+class ClosureCompiler:
+    """Compiles Nodes into closures, and runs them as a backend."""
+
+    # Note: Maps every Node class to its compile_ function, like
+    #       the visit_methods of the Interpreter
+    compile_methods = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compile_methods = cls.make_compile_methods()
+
+    @classmethod
+    def make_compile_methods(cls):
+        """
+        Builds the dispatch table of the compile_ methods of the class.
+        :return: Dictionary mapping Node classes to unbound compile_ functions.
+        """
+        return {node_class: getattr(cls, 'compile_{}'.format(node_class.__name__.lower()), cls.no_compile_method)
+                for node_class in NODE_TYPES}
+
+    def visit(self, node, context):
+        """
+        Compiles and runs a Node, like Interpreter.visit().
+        :param node: Node we wish to run.
+        :param context: Context of the caller.
+        :return: The RuntimeResult of the Node.
+        """
+        try:
+            closure = self.compile(node)
+        except RecursionError:
+            # Note: Compiling recurses on the Python stack, ASTs too deep
+            #       for it run on the explicit stack, which never recurses
+            return StackInterpreter().visit(node, context)
+        return capture(closure, context)
+
+    def compile(self, node):
+        """
+        Compiles a Node and its children.
+        :param node: Node we wish to compile.
+        :return: Closure taking a Context and returning the Value of the Node.
+        """
+        return self.compile_methods.get(type(node), ClosureCompiler.no_compile_method)(self, node)
+
+    def no_compile_method(self, node):
+        """
+        Handle unknown methods for compiling Nodes.
+        :param node: Node we tried to compile.
+        """
+        raise Exception('No compile_{} method defined.'.format(type(node).__name__.lower()))
+
+    ##########################################################
+    # Every compile_ method returns the closure of its Node, #
+    # mirroring the visit_ method of the Interpreter.        #
+    ##########################################################
+
+    def compile_numbernode(self, node):
+        value = make_number(node.value)  # Note: Numbers never change, every run returns this one
+
+        def number(context):
+            return value
+        return number
+
+    def compile_stringnode(self, node):
+        value = node.value
+
+        def string(context):
+            return String(value)
+        return string
+
+    def compile_binopnode(self, node):
+        left_code, right_code = self.compile(node.left_node), self.compile(node.right_node)
+        method = BINARY_METHODS[node.op_type]
+        left_node, right_node = node.left_node, node.right_node
+        number_operation = NUMBER_OPERATIONS.get(node.op_type)
+
+        def binary_operation(context):
+            left = left_code(context)
+            right = right_code(context)
+            if number_operation and type(left) is Number and type(right) is Number:
+                return make_number(number_operation(left.value, right.value))
+            result, error = method(left, right)
+            if error:
+                raise ErrorSignal(operation_error(method, ((left, left_node), (right, right_node)), context))
+            return result
+
+        deciding = SHORT_CIRCUITS.get(node.op_type)
+        if deciding is None:
+            return binary_operation
+        decided = Number.true if deciding else Number.false
+
+        def logical_operation(context):
+            left = left_code(context)
+            if type(left) is Number and left.is_true() is deciding:
+                return decided  # Note: The right operand is never evaluated
+            right = right_code(context)
+            if type(left) is Number and type(right) is Number:
+                return make_number(number_operation(left.value, right.value))
+            result, error = method(left, right)
+            if error:
+                raise ErrorSignal(operation_error(method, ((left, left_node), (right, right_node)), context))
+            return result
+        return logical_operation
+
+    def compile_unaryopnode(self, node):
+        right_code = self.compile(node.right_node)
+        op_type, right_node = node.op_type, node.right_node
+
+        def unary_operation(context):
+            number = right_code(context)
+            operand, error = number, None
+            if op_type == TP_MINUS:
+                number, error = number.multiply_by(make_number(-1))
+            elif op_type == TP_NOT:
+                number, error = number.notted()
+            if error:
+                raise ErrorSignal(operation_error(UNARY_METHODS[op_type], ((operand, right_node),), context))
+            return number
+        return unary_operation
+
+    def compile_varaccessnode(self, node):
+        var_name, start_pos, end_pos = node.var_name, node.start_pos, node.end_pos
+
+        def var_access(context):
+            var_value = context.symbol_table.get(var_name)
+            if var_value is None:
+                raise ErrorSignal(ActiveRuntimeError('VAR "{}" not defined'.format(var_name),
+                                                     start_pos, end_pos, context))
+            return var_value
+        return var_access
+
+    def compile_varassignnode(self, node):
+        var_name, value_code = node.var_name, self.compile(node.value_node)
+
+        def var_assign(context):
+            var_value = value_code(context)
+            context.symbol_table.set(var_name, var_value)
+            return var_value
+        return var_assign
+
+    def compile_ifnode(self, node):
+        cases = [(self.compile(condition), self.compile(expr), should_return_null)
+                 for condition, expr, should_return_null in node.cases]
+        else_case = None
+        if node.else_case:
+            else_case = (self.compile(node.else_case[0]), node.else_case[1])
+
+        def if_statement(context):
+            for condition_code, expr_code, should_return_null in cases:
+                if condition_code(context).is_true():
+                    expr_value = expr_code(context)
+                    return Number.null if should_return_null else expr_value
+            if else_case:
+                expr_code, should_return_null = else_case
+                expr_value = expr_code(context)
+                return Number.null if should_return_null else expr_value
+            return Number.null
+        return if_statement
+
+    def compile_fornode(self, node):
+        var_name, body_code = node.var_name, self.compile(node.body_node)
+        start_value_code = self.compile(node.start_value_node)
+        end_value_code = self.compile(node.end_value_node)
+        step_value_code = self.compile(node.step_value_node) if node.step_value_node else None
+        should_return_null = node.should_return_null
+
+        def for_loop(context):
+            elements = []
+            index = start_value_code(context).value
+            end_value = end_value_code(context).value
+            step_value = step_value_code(context).value if step_value_code else 1
+            symbol_table = context.symbol_table
+            while index < end_value if step_value >= 0 else index > end_value:
+                symbol_table.set(var_name, make_number(index))
+                index += step_value
+                try:
+                    value = body_code(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+                if not should_return_null:
+                    elements.append(value)
+            return Number.null if should_return_null else List(elements)
+        return for_loop
+
+    def compile_whilenode(self, node):
+        condition_code, body_code = self.compile(node.condition), self.compile(node.body_node)
+        should_return_null = node.should_return_null
+
+        def while_loop(context):
+            elements = []
+            while condition_code(context).is_true():
+                try:
+                    value = body_code(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+                if not should_return_null:
+                    elements.append(value)
+            return Number.null if should_return_null else List(elements)
+        return while_loop
+
+    def compile_funcdefnode(self, node):
+        # Note: The body is compiled once, every call reuses its closure
+        body_code = self.compile(node.body_node)
+        func_name, body_node, arg_names = node.var_name, node.body_node, node.arg_names
+        should_auto_return = node.should_auto_return
+
+        def function_definition(context):
+            func_value = CompiledFunction(func_name, body_node, arg_names, should_auto_return, body_code)
+            if func_name:
+                context.symbol_table.set(func_name, func_value)
+            return func_value
+        return function_definition
+
+    def compile_callnode(self, node):
+        callee_code = self.compile(node.node_to_call)
+        arg_codes = [self.compile(arg_node) for arg_node in node.arg_nodes]
+        start_pos, end_pos = node.start_pos, node.end_pos
+
+        def call(context):
+            value_to_call = callee_code(context)
+            args = [arg_code(context) for arg_code in arg_codes]
+            if type(value_to_call) is CompiledFunction:
+                return value_to_call.call(args, context, start_pos, end_pos)
+            # Note: Built-ins, and Functions of the other backends
+            return unwrap(value_to_call.execute(args, context, start_pos, end_pos))
+        return call
+
+    def compile_tailcallnode(self, node):
+        callee_code = self.compile(node.node_to_call)
+        arg_codes = [self.compile(arg_node) for arg_node in node.arg_nodes]
+        start_pos, end_pos = node.start_pos, node.end_pos
+
+        def tail_call(context):
+            value_to_call = callee_code(context)
+            args = [arg_code(context) for arg_code in arg_codes]
+            if type(value_to_call) is CompiledFunction:
+                if len(args) == len(value_to_call.arg_names):
+                    raise TailCallSignal(value_to_call, args, node)
+                return value_to_call.call(args, context, start_pos, end_pos)
+            return unwrap(value_to_call.execute(args, context, start_pos, end_pos))
+        return tail_call
+
+    def compile_inlinedcallnode(self, node):
+        arg_codes = list(zip(node.var_names, [self.compile(arg_node) for arg_node in node.arg_nodes]))
+        body_code = self.compile(node.body_node)
+        var_names = node.var_names
+
+        def inlined_call(context):
+            symbols = context.symbol_table.symbols
+            for var_name, arg_code in arg_codes:
+                symbols[var_name] = arg_code(context)
+            try:
+                return_value = body_code(context)
+            except ErrorSignal as signal:
+                add_inlined_frame(signal.error, node, context)
+                raise
+            for var_name in var_names:
+                del symbols[var_name]
+            return return_value
+        return inlined_call
+
+    def compile_listnode(self, node):
+        element_codes = [self.compile(element_node) for element_node in node.element_nodes]
+
+        def list_expression(context):
+            return List([element_code(context) for element_code in element_codes])
+        return list_expression
+
+    def compile_returnnode(self, node):
+        return_code = self.compile(node.node_to_return) if node.node_to_return else None
+
+        def return_statement(context):
+            raise ReturnSignal(return_code(context) if return_code else Number.null)
+        return return_statement
+
+    def compile_continuenode(self, node):
+        def continue_statement(context):
+            raise ContinueSignal()
+        return continue_statement
+
+    def compile_breaknode(self, node):
+        def break_statement(context):
+            raise BreakSignal()
+        return break_statement
+
+    def compile_invariantnode(self, node):
+        expr_code = self.compile(node.expr_node)
+
+        def invariant(context):
+            value = load_invariant(node, context)
+            if value is None:
+                value = expr_code(context)
+                store_invariant(node, context, value)
+            return value
+        return invariant
+
+
+ClosureCompiler.compile_methods = ClosureCompiler.make_compile_methods()
@@ -4,44 +4,50 @@
 import operator
 from string import ascii_letters, digits
 
-#############
-# OPERATORS #
-#############
-
-operations = {'>': operator.gt,
-              '<': operator.lt,
-              '>=': operator.ge,
-              '<=': operator.le,
-              '==': operator.eq,
-              '!=': operator.ne,
-              'AND': operator.and_,
-              'OR': operator.or_}
-
 ####################
 # LIST OF KEYWORDS #
 ####################
 
-TP_IDENTIFIER = 'IDENTIFIER'
-TP_KEYWORD = 'KEYWORD'
-KEYWORDS = [
-    'VAR',
-    'AND',
-    'OR',
-    'NOT',
-    'IF',
-    'THEN',
-    'ELIF',
-    'ELSE',
-    'FOR',
-    'TO',
-    'STEP',
-    'WHILE',
-    'FUNC',
-    'END',
-    'RETURN',
-    'CONTINUE',
-    'BREAK'
-]
+# Note: Token kinds are small ints rather than strings, so that
+#       comparing and hashing them is as cheap as it gets. Every
+#       keyword is its own kind, the Parser never checks values.
+TP_IDENTIFIER = 0
+TP_VAR = 1
+TP_AND = 2
+TP_OR = 3
+TP_NOT = 4
+TP_IF = 5
+TP_THEN = 6
+TP_ELIF = 7
+TP_ELSE = 8
+TP_FOR = 9
+TP_TO = 10
+TP_STEP = 11
+TP_WHILE = 12
+TP_FUNC = 13
+TP_END = 14
+TP_RETURN = 15
+TP_CONTINUE = 16
+TP_BREAK = 17
+KEYWORDS = {
+    'VAR': TP_VAR,
+    'AND': TP_AND,
+    'OR': TP_OR,
+    'NOT': TP_NOT,
+    'IF': TP_IF,
+    'THEN': TP_THEN,
+    'ELIF': TP_ELIF,
+    'ELSE': TP_ELSE,
+    'FOR': TP_FOR,
+    'TO': TP_TO,
+    'STEP': TP_STEP,
+    'WHILE': TP_WHILE,
+    'FUNC': TP_FUNC,
+    'END': TP_END,
+    'RETURN': TP_RETURN,
+    'CONTINUE': TP_CONTINUE,
+    'BREAK': TP_BREAK
+}
 
 #################
 # ALL CONSTANTS #
@@ -54,48 +60,65 @@ LETTERS = ascii_letters
 # ALL DATA TYPES #
 ##################
 
-TP_INT = 'INT'
-TP_FLOAT = 'FLOAT'
-TP_STRING = 'STRING'
+TP_INT = 18
+TP_FLOAT = 19
+TP_STRING = 20
 
 #############
 # ALL MATHS #
 #############
 
-TP_PLUS = 'PLUS'
-TP_MINUS = 'MINUS'
-TP_MUL = 'MUL'
-TP_DIV = 'DIV'
-TP_CLEAN_DIV = 'CLEAN_DIV'
-TP_MODULO = 'MODULO'
-TP_POWER = 'POWER'
-TP_EQUALS = 'EQ'
-TP_COMMA = 'COMMA'
-TP_ARROW = 'ARROW'
+TP_PLUS = 21
+TP_MINUS = 22
+TP_MUL = 23
+TP_DIV = 24
+TP_CLEAN_DIV = 25
+TP_MODULO = 26
+TP_POWER = 27
+TP_EQUALS = 28
+TP_COMMA = 29
+TP_ARROW = 30
 
 ###############
 # COMPARISONS #
 ###############
 
-TP_EE = 'EE'
-TP_NE = 'NE'
-TP_LT = 'LT'
-TP_GT = 'GT'
-TP_LTE = 'LTE'
-TP_GTE = 'GTE'
+TP_EE = 31
+TP_NE = 32
+TP_LT = 33
+TP_GT = 34
+TP_LTE = 35
+TP_GTE = 36
 
 #################
 # ALL GROUPINGS #
 #################
 
-TP_LPAREN = 'LPAREN'
-TP_RPAREN = 'RPAREN'
-TP_LSQUARE = 'LSQUARE'
-TP_RSQUARE = 'RSQUARE'
+TP_LPAREN = 37
+TP_RPAREN = 38
+TP_LSQUARE = 39
+TP_RSQUARE = 40
 
 #############################
 # META-OPERATIONS AND FLAGS #
 #############################
 
-TP_EOF = 'EOF'
-TP_NEWLINE = 'NEWLINE'
+TP_EOF = 41
+TP_NEWLINE = 42
+
+# Names of the Token kinds, only used when printing Tokens
+TOKEN_NAMES = {token_type: name[3:] for name, token_type in list(globals().items())
+               if name.startswith('TP_')}
+
+#############
+# OPERATORS #
+#############
+
+operations = {TP_GT: operator.gt,
+              TP_LT: operator.lt,
+              TP_GTE: operator.ge,
+              TP_LTE: operator.le,
+              TP_EE: operator.eq,
+              TP_NE: operator.ne,
+              TP_AND: lambda left, right: left != 0 and right != 0,  # Note: Logical, not bitwise
+              TP_OR: lambda left, right: left != 0 or right != 0}
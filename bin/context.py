@@ -5,14 +5,18 @@
 class Context:
     """Keeps track of stack traces in runtime environment."""
 
-    def __init__(self, display_name, parent_context=None, parent_entry_pos=None):
+    def __init__(self, display_name, parent_context=None, parent_entry_pos=None, parent_end_pos=None):
         """
         Initializes a new Context instance with parents and positions.
         :param display_name: Name of the Context to be displayed.
         :param parent_context: Parent Context instance.
-        :param parent_entry_pos: Position of the parent Context instance.
+        :param parent_entry_pos: Offset where the parent Context entered this one.
+        :param parent_end_pos: Offset right after the call which entered this one.
         """
         self.display_name = display_name
         self.parent_context = parent_context
         self.parent_entry_pos = parent_entry_pos
+        self.parent_end_pos = parent_end_pos
         self.symbol_table = None
+        self.tail_calls = 0  # Note: Calls elided by rerunning the body in this Context
+        self.invariants = None  # Note: Values of the InvariantNodes run in this Context, see bin/invariants.py
@@ -2,6 +2,7 @@
 """Error representations for the SimpleScript backend."""
 
 from bin.helpers import string_with_arrows
+from bin.source import get_source, resolve_position
 
 
 class Error:
@@ -12,22 +13,24 @@ class Error:
         Create an Error instance with custom details.
         :param error_name: Name of the error instance.
         :param error_details: Description of the error.
-        :param start_pos: Starting position of the character.
-        :param end_pos: Ending position of the stream.
+        :param start_pos: Offset of the first character.
+        :param end_pos: Offset right after the last character.
         """
         self.error_name = error_name
         self.error_details = error_details
         self.start_pos = start_pos
         self.end_pos = end_pos
+        self.sources = [get_source(start_pos)]  # Note: Keeps the error printable
 
     def __str__(self):
         return repr(self)
 
     def __repr__(self):
         """Pretty-print error message."""
-        error_msg = '\nFile {}, on line {}\n'.format(self.start_pos.fn, self.start_pos.ln + 1)
+        start_pos = resolve_position(self.start_pos)
+        error_msg = '\nFile {}, on line {}\n'.format(start_pos.fn, start_pos.ln + 1)
         error_msg += '{}: {}'.format(self.error_name, self.error_details)
-        error_msg += '\n' + string_with_arrows(self.start_pos.ftxt, self.start_pos, self.end_pos) + '\n'
+        error_msg += '\n' + string_with_arrows(self.start_pos, self.end_pos) + '\n'
         return error_msg
 
 
@@ -59,11 +62,14 @@ class ActiveRuntimeError(Error):
                                                  start_pos,
                                                  end_pos)
         self.context = context
+        while context:
+            self.sources.append(get_source(context.parent_entry_pos))
+            context = context.parent_context
 
     def __repr__(self):
         error_msg = self.generate_traceback()
         error_msg += '{}\n'.format(self.error_details)
-        error_msg += string_with_arrows(self.start_pos.ftxt, self.start_pos, self.end_pos) + '\n'
+        error_msg += string_with_arrows(self.start_pos, self.end_pos) + '\n'
         return error_msg
 
     def generate_traceback(self):
@@ -73,14 +79,19 @@ class ActiveRuntimeError(Error):
         """
         result = ''
         context = self.context
-        position = self.start_pos
+        offset = self.start_pos
         while context:
             # Add result instead of using += because we wish to keep
             # the stack trace chronological when it's printed out
+            position = resolve_position(offset)
             result = 'File {}, line {}, in {}\n'.format(position.fn,
                                                         position.ln + 1,
                                                         context.display_name) + result
-            position = context.parent_entry_pos
+            if context.tail_calls:
+                result = '[{} tail call{} to {} elided]\n'.format(context.tail_calls,
+                                                                 's' if context.tail_calls > 1 else '',
+                                                                 context.display_name) + result
+            offset = context.parent_entry_pos
             context = context.parent_context
         return '\nTraceback (most recent call last):\n' + result
 
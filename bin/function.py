@@ -13,6 +13,10 @@ from bin.runtime_result import RuntimeResult
 from bin.symbol_table import SymbolTable
 from bin.value import Value
 
+# Note: Enough for the recursion depth of most scripts, a deeper
+#       recursion builds the Contexts the pool cannot hold
+MAX_POOLED_CONTEXTS = 256
+
 
 #############################################################
 # FUNCTION CLASS DEFINITION                                 #
@@ -23,43 +27,77 @@ from bin.value import Value
 class BaseFunction(Value):
     """Represents a basic built-in."""
 
+    # Note: Contexts of calls which returned, recycled by the next calls
+    #       instead of building a Context and a SymbolTable for each one.
+    #       The Context of a call which failed is never recycled, since
+    #       the traceback of its Error still points to it. Only the
+    #       Functions of the "vm" and "python" backends use the pool,
+    #       the calls of the other backends cost more than it saves.
+    context_pool = []
+    pools_contexts = False
+
     def __init__(self, name):
         """
         Initializes the BaseFunction class.
         :param name:
         """
-        super().__init__()
         self.name = name or '<anonymous>'
 
-    def generate_new_context(self):
+    def generate_new_context(self, context, start_pos, end_pos):
         """
         Generates a new Context instance.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
         :return: Context instance that was created.
         """
-        context = Context(self.name, self.context, self.start_pos)
-        context.symbol_table = SymbolTable(context.parent_context.symbol_table)
-        return context
+        if self.pools_contexts and BaseFunction.context_pool:
+            new_context = BaseFunction.context_pool.pop()
+            new_context.display_name = self.name
+            new_context.parent_context = context
+            new_context.parent_entry_pos = start_pos
+            new_context.parent_end_pos = end_pos
+            new_context.tail_calls = 0
+            new_context.symbol_table.reset(context.symbol_table)
+            return new_context
+        new_context = Context(self.name, context, start_pos, end_pos)
+        new_context.symbol_table = SymbolTable(context.symbol_table)
+        return new_context
+
+    @staticmethod
+    def release_context(context):
+        """
+        Hands the Context of a call which returned back to the pool.
+        Only for the Functions whose pools_contexts is True.
+        :param context: Context built by generate_new_context().
+        """
+        if len(BaseFunction.context_pool) < MAX_POOLED_CONTEXTS:
+            context.parent_context = None
+            context.invariants = None
+            context.symbol_table.symbols.clear()
+            BaseFunction.context_pool.append(context)
 
-    def check_args(self, arg_names, args):
+    def check_args(self, arg_names, args, exec_context):
         """
         Checks that correct number of args are present.
         :param arg_names: List of argument names.
         :param args: List of arguments passed into func.
+        :param exec_context: Context of the call, whose positions errors point to.
         :return: None, if there are no issues.
         """
         runtime_result = RuntimeResult()
         if len(args) > len(arg_names):
             return runtime_result.failure(ActiveRuntimeError(
                 'Too many arguments'.format(len(args) - len(arg_names)),
-                self.start_pos,
-                self.end_pos,
-                self.context))
+                exec_context.parent_entry_pos,
+                exec_context.parent_end_pos,
+                exec_context.parent_context))
         if len(args) < len(arg_names):
             return runtime_result.failure(ActiveRuntimeError(
                 'Too few arguments'.format(len(arg_names) - len(args)),
-                self.start_pos,
-                self.end_pos,
-                self.context))
+                exec_context.parent_entry_pos,
+                exec_context.parent_end_pos,
+                exec_context.parent_context))
         return runtime_result.success(None)
 
     def populate_args(self, arg_names, args, exec_context):
@@ -72,7 +110,6 @@ class BaseFunction(Value):
         for index in range(len(args)):
             arg_name = arg_names[index]
             arg_value = args[index]
-            arg_value.set_context(exec_context)
             exec_context.symbol_table.set(arg_name, arg_value)
 
     def check_and_populate_args(self, arg_names, args, exec_context):
@@ -84,7 +121,7 @@ class BaseFunction(Value):
         :return: None, if there are no issues.
         """
         runtime_result = RuntimeResult()
-        runtime_result.register(self.check_args(arg_names, args))
+        runtime_result.register(self.check_args(arg_names, args, exec_context))
         if runtime_result.error:
             return runtime_result
         self.populate_args(arg_names, args, exec_context)
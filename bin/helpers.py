@@ -1,16 +1,21 @@
 # coding=utf-8
 """All helper methods that do not belong to any module."""
 
+from bin.source import resolve_position, resolve_end_position
 
-def string_with_arrows(text, start_pos, end_pos):
+
+def string_with_arrows(start_pos, end_pos):
     """
     Prints incorrect string along with arrows pointing to issues.
-    :param text: Text string which was illegal or incorrect.
-    :param start_pos: Starting position for the error.
-    :param end_pos: Ending position for the error
+    Both offsets are resolved to lines and columns here, since
+    this only ever happens when an error is displayed.
+    :param start_pos: Starting offset for the error.
+    :param end_pos: Ending offset for the error
     :return: String with arrows pointing to incorrect text.
     """
     result = ''
+    start_pos, end_pos = resolve_position(start_pos), resolve_end_position(end_pos)
+    text = start_pos.ftxt
     idx_start = max(text.rfind('\n', 0, start_pos.idx), 0)
     idx_end = text.find('\n', idx_start + 1)
     if idx_end < 0:
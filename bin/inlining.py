@@ -0,0 +1,35 @@
+# coding=utf-8
+"""
+Represents the runtime side of function inlining.
+An InlinedCallNode runs the body of a Function in the Context of its
+caller, so no Context is created for it. When the body raises an
+error, the frame of the Function is added to its traceback, which
+then reads as if the Function had been called.
+"""
+
+from bin.context import Context
+
+
+def add_inlined_frame(error, node, context):
+    """
+    Adds the frame of an inlined Function to the traceback of an error.
+    :param error: Error raised by the inlined body.
+    :param node: InlinedCallNode instance.
+    :param context: Context of the caller, running the body.
+    :return: The same error.
+    """
+    inner_context = getattr(error, 'context', None)
+    if inner_context is None:
+        return error  # Note: Only runtime errors have a traceback
+    frame = Context(node.func_name, context, node.start_pos)
+    frame.symbol_table = context.symbol_table
+    if inner_context is context:
+        error.context = frame
+        return error
+    # Note: Calls made by the body return to the caller, the frame goes between
+    while inner_context.parent_context is not None:
+        if inner_context.parent_context is context:
+            inner_context.parent_context = frame
+            break
+        inner_context = inner_context.parent_context
+    return error
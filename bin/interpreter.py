@@ -1,28 +1,98 @@
 # coding=utf-8
-"""Represents the Interpreter mechanism."""
+"""
+Represents the Interpreter mechanism.
+Every visit_ method returns the Value of its Node. Errors, RETURN,
+BREAK and CONTINUE are rare, so instead of wrapping every Value in a
+RuntimeResult whose flags are checked after each child, they are
+raised as the signals of bin/signals.py. Loops catch BREAK and
+CONTINUE, Functions catch RETURN and their own tail calls, and visit()
+turns whatever is left back into the RuntimeResult the other backends
+return.
+"""
 
 from bin.constants import *
 from bin.errors import ActiveRuntimeError
 from bin.function import BaseFunction
+from bin.inlining import add_inlined_frame
+from bin.invariants import load_invariant, store_invariant
 from bin.list import List
-from bin.number import Number
-from bin.runtime_result import RuntimeResult
+from bin.nodes import NODE_TYPES
+from bin.number import Number, make_number
+from bin.signals import *
+from bin.source import get_source
 from bin.string import String
+from bin.value import operation_error
+
+# Note: The Value method applied by each binary operator
+BINARY_METHODS = {
+    TP_PLUS: lambda left, right: left.add_to(right),
+    TP_MINUS: lambda left, right: left.subtract_by(right),
+    TP_POWER: lambda left, right: left.power_by(right),
+    TP_MUL: lambda left, right: left.multiply_by(right),
+    TP_DIV: lambda left, right: left.divide_by(right),
+    TP_MODULO: lambda left, right: left.modulo_by(right),
+    TP_CLEAN_DIV: lambda left, right: left.divide_by(right, clean=True),
+    TP_NE: lambda left, right: left.get_comparison_ne(right),
+    TP_EE: lambda left, right: left.get_comparison_ee(right),
+    TP_LT: lambda left, right: left.get_comparison_lt(right),
+    TP_LTE: lambda left, right: left.get_comparison_lte(right),
+    TP_GT: lambda left, right: left.get_comparison_gt(right),
+    TP_GTE: lambda left, right: left.get_comparison_gte(right),
+    TP_AND: lambda left, right: left.anded_by(right),
+    TP_OR: lambda left, right: left.ored_by(right),
+}
+
+# Note: Truth of the left operand which decides AND and OR on its own,
+#       in which case their right operand is never evaluated
+SHORT_CIRCUITS = {
+    TP_AND: False,
+    TP_OR: True,
+}
+
+# Note: The Value method applied by each unary operator
+UNARY_METHODS = {
+    TP_MINUS: lambda number: number.multiply_by(make_number(-1)),
+    TP_NOT: lambda number: number.notted(),
+}
 
 
 class Interpreter:
     """The Interpreter mechanism for SimpleScript."""
 
+    # Note: Maps every Node class to its visit_ function, built once per
+    #       class rather than formatting a method name on every visit
+    visit_methods = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_methods = cls.make_visit_methods()
+
+    @classmethod
+    def make_visit_methods(cls):
+        """
+        Builds the dispatch table of the visit_ methods of the class.
+        :return: Dictionary mapping Node classes to unbound visit_ functions.
+        """
+        return {node_class: getattr(cls, 'visit_{}'.format(node_class.__name__.lower()), cls.no_visit_method)
+                for node_class in NODE_TYPES}
+
     def visit(self, node, context):
         """
-        Call the designated visit_ method given the Node.
+        Evaluates a Node, turning the signals it raises into a RuntimeResult.
         :param node: Node we wish to visit.
         :param context: Context of the caller.
-        :return: The result of the visit_ method.
+        :return: The RuntimeResult of the Node.
         """
-        method_name = 'visit_{}'.format(type(node).__name__.lower())
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        return capture(self.evaluate, node, context)
+
+    def evaluate(self, node, context):
+        """
+        Call the designated visit_ method given the Node.
+        :param node: Node we wish to evaluate.
+        :param context: Context of the caller.
+        :return: The Value returned by the visit_ method.
+        """
+        return self.visit_methods.get(type(node), Interpreter.no_visit_method)(self, node, context)
 
     def no_visit_method(self, node, context):
         """
@@ -44,8 +114,7 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Number instance with the Node value.
         """
-        return RuntimeResult().success(
-            Number(node.token.value).set_context(context).set_position(node.start_pos, node.end_pos))
+        return make_number(node.value)
 
     def visit_binopnode(self, node, context):
         """
@@ -54,47 +123,28 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Result of the binary operation on both child Nodes.
         """
-        result, error = None, None
-        runtime_result = RuntimeResult()
-        left_node = runtime_result.register(self.visit(node.left_node, context))
-        right_node = runtime_result.register(self.visit(node.right_node, context))
-        if runtime_result.should_return():
-            return runtime_result
-        if node.op_token.type == TP_PLUS:
-            result, error = left_node.add_to(right_node)
-        elif node.op_token.type == TP_MINUS:
-            result, error = left_node.subtract_by(right_node)
-        elif node.op_token.type == TP_POWER:
-            result, error = left_node.power_by(right_node)
-        elif node.op_token.type == TP_MUL:
-            result, error = left_node.multiply_by(right_node)
-        elif node.op_token.type == TP_DIV:
-            result, error = left_node.divide_by(right_node)
-        elif node.op_token.type == TP_MODULO:
-            result, error = left_node.modulo_by(right_node)
-        elif node.op_token.type == TP_CLEAN_DIV:
-            result, error = left_node.divide_by(right_node, clean=True)
-        elif node.op_token.type == TP_NE:
-            result, error = left_node.get_comparison_ne(right_node)
-        elif node.op_token.type == TP_EE:
-            result, error = left_node.get_comparison_ee(right_node)
-        elif node.op_token.type == TP_LT:
-            result, error = left_node.get_comparison_lt(right_node)
-        elif node.op_token.type == TP_LTE:
-            result, error = left_node.get_comparison_lte(right_node)
-        elif node.op_token.type == TP_GT:
-            result, error = left_node.get_comparison_gt(right_node)
-        elif node.op_token.type == TP_GTE:
-            result, error = left_node.get_comparison_gte(right_node)
-        elif node.op_token.matches(TP_KEYWORD, 'AND'):
-            result, error = left_node.anded_by(right_node)
-        elif node.op_token.matches(TP_KEYWORD, 'OR'):
-            result, error = left_node.ored_by(right_node)
-        if runtime_result.should_return():
-            return runtime_result.failure(runtime_result)
+        left_node = self.evaluate(node.left_node, context)
+        deciding = SHORT_CIRCUITS.get(node.op_type)
+        if deciding is not None and type(left_node) is Number and left_node.is_true() is deciding:
+            return Number.true if deciding else Number.false
+        right_node = self.evaluate(node.right_node, context)
+        return self.apply_binary_operation(node, left_node, right_node, context)
+
+    def apply_binary_operation(self, node, left_node, right_node, context):
+        """
+        Applies the operator of a BinOpNode to both evaluated operands.
+        :param node: The BinOpNode instance.
+        :param left_node: Value of the left child Node.
+        :param right_node: Value of the right child Node.
+        :param context: Context of the caller.
+        :return: Result of the binary operation on both values.
+        """
+        method = BINARY_METHODS[node.op_type]
+        result, error = method(left_node, right_node)
         if error:
-            return runtime_result.failure(error)
-        return runtime_result.success(result.set_position(node.start_pos, node.end_pos))
+            raise ErrorSignal(operation_error(
+                method, ((left_node, node.left_node), (right_node, node.right_node)), context))
+        return result
 
     def visit_unaryopnode(self, node, context):
         """
@@ -103,18 +153,25 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Result of the unary operation on the node.
         """
-        error = None
-        runtime_result = RuntimeResult()
-        number = runtime_result.register(self.visit(node.right_node, context))
-        if runtime_result.should_return():
-            return runtime_result
-        if node.op_token.type == TP_MINUS:
-            number, error = number.multiply_by(Number(-1))
-        elif node.op_token.matches(TP_KEYWORD, 'NOT'):
+        number = self.evaluate(node.right_node, context)
+        return self.apply_unary_operation(node, number, context)
+
+    def apply_unary_operation(self, node, number, context):
+        """
+        Applies the operator of a UnaryOpNode to the evaluated operand.
+        :param node: The UnaryOpNode instance.
+        :param number: Value of the child Node.
+        :param context: Context of the caller.
+        :return: Result of the unary operation on the value.
+        """
+        operand, error = number, None
+        if node.op_type == TP_MINUS:
+            number, error = number.multiply_by(make_number(-1))
+        elif node.op_type == TP_NOT:
             number, error = number.notted()
         if error:
-            return runtime_result.failure(error)
-        return runtime_result.success(number.set_position(node.start_pos, node.end_pos))
+            raise ErrorSignal(operation_error(UNARY_METHODS[node.op_type], ((operand, node.right_node),), context))
+        return number
 
     def visit_varaccessnode(self, node, context):
         """
@@ -123,16 +180,14 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Value of fetching a variable's value and executing it.
         """
-        runtime_result = RuntimeResult()
-        var_name = node.var_name.value
+        var_name = node.var_name
         var_value = context.symbol_table.get(var_name)
         if var_value is None:
-            runtime_result.failure(ActiveRuntimeError('VAR "{}" not defined'.format(var_name),
-                                                      node.start_pos,
-                                                      node.end_pos,
-                                                      context))
-        var_value = var_value.copy().set_position(node.start_pos, node.end_pos).set_context(context)
-        return runtime_result.success(var_value)
+            raise ErrorSignal(ActiveRuntimeError('VAR "{}" not defined'.format(var_name),
+                                                 node.start_pos,
+                                                 node.end_pos,
+                                                 context))
+        return var_value
 
     def visit_varassignnode(self, node, context):
         """
@@ -141,13 +196,9 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Value of the variable.
         """
-        runtime_result = RuntimeResult()
-        var_name = node.var_name.value
-        var_value = runtime_result.register(self.visit(node.value_node, context))
-        if runtime_result.should_return():
-            return runtime_result
-        context.symbol_table.set(var_name, var_value)
-        return runtime_result.success(var_value)
+        var_value = self.evaluate(node.value_node, context)
+        context.symbol_table.set(node.var_name, var_value)
+        return var_value
 
     def visit_ifnode(self, node, context):
         """
@@ -156,23 +207,15 @@ class Interpreter:
         :param context: Context of the caller.
         :return: Value of the if-statement, or None.
         """
-        runtime_result = RuntimeResult()
         for condition, expr, should_return_null in node.cases:
-            condition_value = runtime_result.register(self.visit(condition, context))
-            if runtime_result.should_return():
-                return runtime_result
-            if condition_value.is_true():
-                expr_value = runtime_result.register(self.visit(expr, context))
-                if runtime_result.should_return():
-                    return runtime_result
-                return runtime_result.success(Number(0) if should_return_null else expr_value)
+            if self.evaluate(condition, context).is_true():
+                expr_value = self.evaluate(expr, context)
+                return Number.null if should_return_null else expr_value
         if node.else_case:
             expr, should_return_null = node.else_case
-            expr_value = runtime_result.register(self.visit(expr, context))
-            if runtime_result.should_return():
-                return runtime_result
-            return runtime_result.success(Number(0) if should_return_null else expr_value)
-        return runtime_result.success(Number(0))
+            expr_value = self.evaluate(expr, context)
+            return Number.null if should_return_null else expr_value
+        return Number.null
 
     def visit_fornode(self, node, context):
         """
@@ -182,19 +225,12 @@ class Interpreter:
         :return: List of evaluated values.
         """
         elements = []
-        runtime_result = RuntimeResult()
-        start_value = runtime_result.register(self.visit(node.start_value_node, context))
-        if runtime_result.should_return():
-            return runtime_result
-        end_value = runtime_result.register(self.visit(node.end_value_node, context))
-        if runtime_result.should_return():
-            return runtime_result
+        start_value = self.evaluate(node.start_value_node, context)
+        end_value = self.evaluate(node.end_value_node, context)
         if node.step_value_node:
-            step_value = runtime_result.register(self.visit(node.step_value_node, context))
-            if runtime_result.should_return():
-                return runtime_result
+            step_value = self.evaluate(node.step_value_node, context)
         else:  # Default to one iteration
-            step_value = Number(1)
+            step_value = make_number(1)
 
         # Note: PEP 8 doesn't allow for lambda expressions to be assigned to
         #       variables directly. They prefer a function definition. However, this
@@ -208,21 +244,17 @@ class Interpreter:
             condition = lambda: index > end_value.value
 
         while condition():
-            context.symbol_table.set(node.var_name_token.value, Number(index))
+            context.symbol_table.set(node.var_name, make_number(index))
             index += step_value.value
-            current_value = runtime_result.register(self.visit(node.body_node, context))
-            if runtime_result.should_return() \
-                    and runtime_result.loop_should_continue is False \
-                    and runtime_result.loop_should_break is False:
-                return runtime_result
-            if runtime_result.loop_should_continue:
+            try:
+                current_value = self.evaluate(node.body_node, context)
+            except ContinueSignal:
                 continue
-            if runtime_result.loop_should_break:
+            except BreakSignal:
                 break
-            elements.append(current_value)
-        return runtime_result.success(
-            Number(0) if node.should_return_null else
-            List(elements).set_context(context).set_position(node.start_pos, node.end_pos))
+            if not node.should_return_null:  # Note: Set by the optimizer when the List is unused
+                elements.append(current_value)
+        return Number.null if node.should_return_null else List(elements)
 
     def visit_whilenode(self, node, context):
         """
@@ -232,26 +264,16 @@ class Interpreter:
         :return: List of all evaluated results.
         """
         elements = []
-        runtime_result = RuntimeResult()
-        while True:
-            condition = runtime_result.register(self.visit(node.condition, context))
-            if runtime_result.should_return():
-                return runtime_result
-            if not condition.is_true():
-                break
-            current_value = runtime_result.register(self.visit(node.body_node, context))
-            if runtime_result.should_return() \
-                    and runtime_result.loop_should_continue is False \
-                    and runtime_result.loop_should_break is False:
-                return runtime_result
-            if runtime_result.loop_should_continue:
+        while self.evaluate(node.condition, context).is_true():
+            try:
+                current_value = self.evaluate(node.body_node, context)
+            except ContinueSignal:
                 continue
-            if runtime_result.loop_should_break:
+            except BreakSignal:
                 break
-            elements.append(current_value)
-        return runtime_result.success(
-            Number(0) if node.should_return_null else
-            List(elements).set_context(context).set_position(node.start_pos, node.end_pos))
+            if not node.should_return_null:  # Note: Set by the optimizer when the List is unused
+                elements.append(current_value)
+        return Number.null if node.should_return_null else List(elements)
 
     def visit_funcdefnode(self, node, context):
         """
@@ -260,15 +282,11 @@ class Interpreter:
         :param context: The caller's context.
         :return: Function Node instance.
         """
-        runtime_result = RuntimeResult()
-        func_name = node.var_name_token.value if node.var_name_token else None
-        body_node = node.body_node
-        arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
-        func_node = Function(func_name, body_node, arg_names, node.should_auto_return) \
-            .set_context(context).set_position(node.start_pos, node.end_pos)
-        if node.var_name_token:
+        func_name = node.var_name
+        func_node = Function(func_name, node.body_node, node.arg_names, node.should_auto_return)
+        if func_name:
             context.symbol_table.set(func_name, func_node)
-        return runtime_result.success(func_node)
+        return func_node
 
     def visit_callnode(self, node, context):
         """
@@ -277,21 +295,27 @@ class Interpreter:
         :param context: The caller's context.
         :return: The resulting Node from the exec call.
         """
-        args = []
-        runtime_result = RuntimeResult()
-        value_to_call = runtime_result.register(self.visit(node.node_to_call, context))
-        if runtime_result.should_return():
-            return runtime_result
-        value_to_call = value_to_call.copy().set_position(node.start_pos, node.end_pos)
-        for arg_node in node.arg_nodes:
-            args.append(runtime_result.register(self.visit(arg_node, context)))
-            if runtime_result.should_return():
-                return runtime_result
-        return_value = runtime_result.register(value_to_call.execute(args))
-        if runtime_result.should_return():
-            return runtime_result
-        return_value = return_value.copy().set_position(node.start_pos, node.end_pos).set_context(context)
-        return runtime_result.success(return_value)
+        value_to_call = self.evaluate(node.node_to_call, context)
+        args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
+        if type(value_to_call) is Function:
+            return value_to_call.call(args, context, node.start_pos, node.end_pos)
+        # Note: Built-ins, and Functions of the other backends
+        return unwrap(value_to_call.execute(args, context, node.start_pos, node.end_pos))
+
+    def visit_tailcallnode(self, node, context):
+        """
+        Visits the TailCallNode instance.
+        :param node: The TailCallNode instance.
+        :param context: The caller's context.
+        :return: The resulting Node from the exec call, unless the call is rerun.
+        """
+        value_to_call = self.evaluate(node.node_to_call, context)
+        args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
+        if type(value_to_call) is Function:
+            if len(args) == len(value_to_call.arg_names):  # Note: A wrong count fails like the call would
+                raise TailCallSignal(value_to_call, args, node)
+            return value_to_call.call(args, context, node.start_pos, node.end_pos)
+        return unwrap(value_to_call.execute(args, context, node.start_pos, node.end_pos))
 
     def visit_listnode(self, node, context):
         """
@@ -300,14 +324,7 @@ class Interpreter:
         :param context: The caller's context.
         :return: List instance with all values.
         """
-        elements = []
-        runtime_result = RuntimeResult()
-        for element_node in node.element_nodes:
-            elements.append(runtime_result.register(self.visit(element_node, context)))
-            if runtime_result.should_return():
-                return runtime_result
-        return runtime_result.success(
-            List(elements).set_context(context).set_position(node.start_pos, node.end_pos))
+        return List([self.evaluate(element_node, context) for element_node in node.element_nodes])
 
     def visit_stringnode(self, node, context):
         """
@@ -316,42 +333,63 @@ class Interpreter:
         :param context: The caller's Context instance.
         :return: A String instance.
         """
-        return RuntimeResult().success(
-            String(node.token.value).set_context(context).set_position(node.start_pos, node.end_pos))
+        return String(node.value)
 
     def visit_returnnode(self, node, context):
         """
         Visits the ReturnNode instance.
         :param node: The ReturnNode instance.
         :param context: The caller's context.
-        :return: Value of the ReturnNode instance.
         """
-        runtime_result = RuntimeResult()
-        if node.node_to_return:
-            value = runtime_result.register(self.visit(node.node_to_return, context))
-            if runtime_result.should_return():
-                return runtime_result
-        else:
-            value = Number(0)
-        return runtime_result.success_return(value)
+        raise ReturnSignal(self.evaluate(node.node_to_return, context) if node.node_to_return else Number.null)
 
     def visit_continuenode(self, node, context):
         """
         Visits the ContinueNode instance.
         :param node: The ContinueNode instance.
         :param context: The caller's context.
-        :return: The RuntimeResult of a successful CONTINUE.
         """
-        return RuntimeResult().success_continue()
+        raise ContinueSignal()
 
     def visit_breaknode(self, node, context):
         """
         Visits the BreakNode instance.
         :param node: The BreakNode instance.
         :param context: The caller's context.
-        :return: The RuntimeResult of a successful BREAK.
         """
-        return RuntimeResult().success_break()
+        raise BreakSignal()
+
+    def visit_invariantnode(self, node, context):
+        """
+        Visits the InvariantNode instance, reusing its Value when it can.
+        :param node: The InvariantNode instance.
+        :param context: The caller's context.
+        :return: Value of the wrapped expression.
+        """
+        value = load_invariant(node, context)
+        if value is None:
+            value = self.evaluate(node.expr_node, context)
+            store_invariant(node, context, value)
+        return value
+
+    def visit_inlinedcallnode(self, node, context):
+        """
+        Visits the InlinedCallNode instance.
+        :param node: The InlinedCallNode instance.
+        :param context: The caller's context.
+        :return: Value of the inlined body, like the call would return.
+        """
+        symbols = context.symbol_table.symbols
+        for var_name, arg_node in zip(node.var_names, node.arg_nodes):
+            symbols[var_name] = self.evaluate(arg_node, context)
+        try:
+            return_value = self.evaluate(node.body_node, context)
+        except ErrorSignal as signal:
+            add_inlined_frame(signal.error, node, context)
+            raise
+        for var_name in node.var_names:
+            del symbols[var_name]
+        return return_value
 
 
 #############################################################
@@ -360,9 +398,15 @@ class Interpreter:
 # IMPLEMENTING THIS ELSEWHERE RESULTS IN CIRCULAR IMPORT    #
 #############################################################
 
+Interpreter.visit_methods = Interpreter.make_visit_methods()
+
+
 class Function(BaseFunction):
     """Represents a Function instance."""
 
+    # Note: An Interpreter keeps no state, every call evaluates its body with this one
+    interpreter = Interpreter()
+
     def __init__(self, name, body_node, arg_names, should_auto_return):
         """
         Initializes a Function instance.
@@ -375,35 +419,67 @@ class Function(BaseFunction):
         self.body_node = body_node
         self.arg_names = arg_names
         self.should_auto_return = should_auto_return
+        self.source = get_source(body_node.start_pos)  # Note: Keeps its errors printable
 
     def __repr__(self):
         return '<function {}>'.format(self.name)
 
-    def execute(self, args):
+    def call(self, args, context, start_pos, end_pos):
         """
-        Execute a Function instance.
+        Calls the Function, raising the signals of its body.
         :param args: Arguments being passed into the Function.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
         :return: Value of the executed Function.
         """
-        runtime_result = RuntimeResult()
-        interpreter = Interpreter()
-        exec_context = self.generate_new_context()
-        runtime_result.register(self.check_and_populate_args(self.arg_names, args, exec_context))
-        if runtime_result.should_return():
-            return runtime_result
-        value = runtime_result.register(interpreter.visit(self.body_node, exec_context))
-        if runtime_result.should_return() and runtime_result.func_return_value is None:
-            return runtime_result
-        return_value \
-            = (value if self.should_auto_return else None) or runtime_result.func_return_value or Number(0)
-        return runtime_result.success(return_value)
+        exec_context = self.generate_new_context(context, start_pos, end_pos)
+        result = self.check_and_populate_args(self.arg_names, args, exec_context)
+        if result.error:
+            raise ErrorSignal(result.error)
+        while True:
+            try:
+                value = self.run_body(exec_context)
+            except TailCallSignal as signal:
+                if signal.function.body_node is self.body_node:
+                    # Note: The body reruns in the same Context, which keeps the variables
+                    #       of the elided calls, where the new call would have found them
+                    self.populate_args(self.arg_names, signal.args, exec_context)
+                    exec_context.tail_calls += 1
+                    continue
+                # Note: The name of the Function has been bound to another one
+                value = signal.function.call(signal.args, exec_context, signal.node.start_pos, signal.node.end_pos)
+            break
+        if self.pools_contexts:
+            self.release_context(exec_context)
+        return value
+
+    def run_body(self, exec_context):
+        """
+        Evaluates the body of the Function once.
+        :param exec_context: Context of the call, with the arguments set.
+        :return: Value returned by the body.
+        """
+        try:
+            value = self.interpreter.evaluate(self.body_node, exec_context)
+        except ReturnSignal as signal:
+            return signal.value
+        return value if self.should_auto_return else Number.null
+
+    def execute(self, args, context, start_pos, end_pos):
+        """
+        Execute a Function instance.
+        :param args: Arguments being passed into the Function.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
+        :return: RuntimeResult with the value of the executed Function.
+        """
+        return capture(self.call, args, context, start_pos, end_pos)
 
     def copy(self):
         """
         Copies a Function instance.
         :return: A new Function instance.
         """
-        function_copy = Function(self.name, self.body_node, self.arg_names, self.should_auto_return)
-        function_copy.set_context(self.context)
-        function_copy.set_position(self.start_pos, self.end_pos)
-        return function_copy
+        return Function(self.name, self.body_node, self.arg_names, self.should_auto_return)
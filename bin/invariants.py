@@ -0,0 +1,70 @@
+# coding=utf-8
+"""
+Represents the runtime side of loop-invariant code motion.
+The optimizer wraps expressions which a loop never changes into an
+InvariantNode. The first time one runs, its Value is kept in the
+Context running the loop, keyed by the Node, so it goes away with the
+call or the run which computed it and no script can read it. Later
+iterations reuse it for as long as every variable the expression
+reads still holds the same Value, so no loop needs to reset anything,
+and a loop which runs zero times or raises an error behaves exactly
+as before. Only expressions which cannot have side
+effects are kept: operators over Numbers and Strings, and calls to
+the pure built-ins, which are marked with an is_pure attribute.
+"""
+
+from bin.list import List
+from bin.number import Number
+from bin.string import String
+
+# Note: How an InvariantNode reads each of its variables
+GUARD_VALUE = 0     # Operand of an operator, must be a Number or a String
+GUARD_CALLEE = 1    # Called, must be a pure built-in
+GUARD_ARGUMENT = 2  # Argument of a call, may be any Value
+
+
+def load_invariant(node, context):
+    """
+    Fetches the kept Value of an InvariantNode, if it is still valid.
+    :param node: InvariantNode instance.
+    :param context: Context running the loop.
+    :return: The kept Value, None if the expression must be evaluated.
+    """
+    invariants = context.invariants
+    if invariants is None:
+        return None
+    kept = invariants.get(node)
+    if kept is None:
+        return None
+    value, guards = kept
+    symbol_table = context.symbol_table
+    for var_name, var_value, length in guards:
+        if symbol_table.get(var_name) is not var_value:
+            return None
+        if length is not None and len(var_value.elements) != length:
+            return None  # Note: Lists change in place, LEN only depends on their length
+    return value
+
+
+def store_invariant(node, context, value):
+    """
+    Keeps the Value of an InvariantNode, if its expression had no side effects.
+    :param node: InvariantNode instance.
+    :param context: Context running the loop.
+    :param value: Value the expression has just been evaluated to.
+    """
+    if type(value) not in (Number, String):
+        return
+    symbol_table = context.symbol_table
+    guards = []
+    for var_name, kind in node.guards:
+        var_value = symbol_table.get(var_name)
+        var_type = type(var_value)
+        if kind == GUARD_VALUE and var_type not in (Number, String):
+            return  # Note: Operators over Lists change them in place
+        if kind == GUARD_CALLEE and not getattr(getattr(var_value, 'method', None), 'is_pure', False):
+            return
+        guards.append((var_name, var_value, len(var_value.elements) if var_type is List else None))
+    if context.invariants is None:
+        context.invariants = {}
+    context.invariants[node] = (value, tuple(guards))
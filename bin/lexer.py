@@ -1,11 +1,53 @@
 # coding=utf-8
 """Represents a Tokenizer of Tokens."""
 
+import re
+import sys
+
 from bin.constants import *
 from bin.errors import IllegalCharError, ExpectedCharError
-from bin.position import Position
+from bin.source import Source, StreamSource
 from bin.token import Token
 
+#########################################
+# MASTER PATTERN FOR THE WHOLE LANGUAGE #
+#########################################
+
+# Note: Alternatives are tried in order, so two-character
+#       symbols must come before their one-character prefixes.
+#       Only ASCII letters and digits are accepted, which
+#       matches the LETTERS and DIGITS constants.
+TOKEN_PATTERN = re.compile(r'''
+    (?P<SKIP>[ \t]+)
+  | (?P<NEWLINE>[;\n])
+  | (?P<IDENTIFIER>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<NUMBER>[0-9]+(?:\.[0-9]*)?)
+  | (?P<SYMBOL>->|[=<>!]=|[-+*^/|%()\[\],=<>])
+  | (?P<STRING>"[^"]*"?)
+  | (?P<COMMENT>\#[^\n]*\n?)
+''', re.VERBOSE)
+
+SYMBOLS = {'+': TP_PLUS,
+           '-': TP_MINUS,
+           '->': TP_ARROW,
+           '*': TP_MUL,
+           '^': TP_POWER,
+           '/': TP_DIV,
+           '|': TP_CLEAN_DIV,
+           '%': TP_MODULO,
+           '(': TP_LPAREN,
+           ')': TP_RPAREN,
+           '[': TP_LSQUARE,
+           ']': TP_RSQUARE,
+           ',': TP_COMMA,
+           '=': TP_EQUALS,
+           '==': TP_EE,
+           '!=': TP_NE,
+           '<': TP_LT,
+           '<=': TP_LTE,
+           '>': TP_GT,
+           '>=': TP_GTE}
+
 
 class Lexer:
     """The lexical analyzer component of the language."""
@@ -17,243 +59,154 @@ class Lexer:
         :param fn: File name of the document.
         """
         self.text = input_text
-        self.position = Position(-1, 0, -1, fn, input_text)
-        self.current_character = None
-        self.advance()  # 0-indexed array repr
         self.fn = fn
-
-    def advance(self):
-        """Advance the position of the input stream."""
-        self.position.advance(self.current_character)
-        self.current_character \
-            = self.text[self.position.idx] if self.position.idx < len(self.text) else None
+        self.source = Source(fn, input_text)
+        self.file = None
+        self.error = None
 
     def tokenize(self):
         """
-        Tokenize the input text stream.
+        Tokenize the input text stream in a single pass over
+        the master pattern. Tokens only store offsets, lines and
+        columns are resolved by the Source when an error is shown.
         :return: List of Token instances and/or Error instances.
         """
-        tokens = []
-        while self.current_character is not None:
+        tokens = list(self.generate_tokens())
+        if self.error:
+            return [], self.error
+        return tokens, None
 
-            chars_to_skip = [' ', '\t']
-            if self.current_character in chars_to_skip:
-                self.advance()  # Skip useless chars
+    def generate_tokens(self):
+        """
+        Lazily produces the Tokens of the stream, ending with TP_EOF.
+        When an illegal character is found the error is stored in
+        the Lexer and the stream ends with TP_EOF at that character.
+        :return: Generator of Token instances.
+        """
+        text, base = self.text, self.source.base
+        match, intern = TOKEN_PATTERN.match, sys.intern
+        idx, at_end = 0, self.file is None
+        while True:
+            if idx < len(text):
+                token_match = match(text, idx)
+            else:
+                token_match = None
+                if at_end:
+                    break
+
+            # Note: A Token touching the end of the buffered text
+            #       might continue in the next chunk of the file
+            if not at_end and (token_match is None or token_match.end() == len(text)):
+                chunk = self.read_chunk()
+                at_end = not chunk
+                text, base, idx = text[idx:] + chunk, base + idx, 0
+                continue
+            if token_match is None:
+                self.error = self.make_error(text[idx], base + idx)
+                yield Token(TP_EOF, start_pos=base + idx)
+                return
+            kind = token_match.lastgroup
+            end = token_match.end()
+
+            if kind == 'SKIP':
+                pass  # Skip useless chars
 
             # Tokenize all line endings
-            elif self.current_character in [';', '\n']:
-                tokens.append(Token(TP_NEWLINE, start_pos=self.position))
-                self.advance()
-
-            # Handle all comments
-            elif self.current_character == '#':
-                self.skip_comment()
-
-            # Transform input stream into a number Token
-            elif self.current_character in DIGITS:
-                tokens.append(self.make_number())
+            elif kind == 'NEWLINE':
+                yield Token(TP_NEWLINE, start_pos=base + idx)
 
             # Transform input stream into an identifier Token
-            elif self.current_character in LETTERS:
-                tokens.append(self.make_identifier())
-            elif self.current_character == '"':
-                tokens.append(self.make_string())
+            elif kind == 'IDENTIFIER':
+                # Note: Identifiers are interned, so the dictionary
+                #       lookups of the SymbolTable compare by identity
+                identifier_str = intern(token_match.group())
+                yield Token(KEYWORDS.get(identifier_str, TP_IDENTIFIER),
+                            identifier_str, base + idx, base + end)
 
-            # All maths and grouping operators
-            elif self.current_character == '+':
-                tokens.append(Token(TP_PLUS, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '-':
-                tokens.append(self.make_minus_or_arrow())
-            elif self.current_character == '*':
-                tokens.append(Token(TP_MUL, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '^':
-                tokens.append(Token(TP_POWER, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '/':
-                tokens.append(Token(TP_DIV, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '|':
-                tokens.append(Token(TP_CLEAN_DIV, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '%':
-                tokens.append(Token(TP_MODULO, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '(':
-                tokens.append(Token(TP_LPAREN, start_pos=self.position))
-                self.advance()
-            elif self.current_character == ')':
-                tokens.append(Token(TP_RPAREN, start_pos=self.position))
-                self.advance()
-            elif self.current_character == '[':
-                tokens.append(Token(TP_LSQUARE, start_pos=self.position))
-                self.advance()
-            elif self.current_character == ']':
-                tokens.append(Token(TP_RSQUARE, start_pos=self.position))
-                self.advance()
+            # Transform input stream into a number Token
+            elif kind == 'NUMBER':
+                number_str = token_match.group()
+                yield Token(TP_FLOAT if '.' in number_str else TP_INT,
+                            float(number_str) if '.' in number_str else int(number_str),
+                            base + idx, base + end)
 
-            # Comparison and boolean operators
-            elif self.current_character == '!':
-                token, error = self.make_not_equals()
-                if error:
-                    return [], error
-                tokens.append(token)
-            elif self.current_character == '=':
-                tokens.append(self.make_equals())
-            elif self.current_character == '<':
-                tokens.append(self.make_less_than())
-            elif self.current_character == '>':
-                tokens.append(self.make_greater_than())
+            # All maths, grouping, comparison and arrow operators
+            elif kind == 'SYMBOL':
+                yield Token(SYMBOLS[token_match.group()], start_pos=base + idx, end_pos=base + end)
 
-            # Function declarations
-            # Note: Arrows are used in function declarations
-            #       but they piggyback off of subtraction
-            elif self.current_character == ',':
-                tokens.append(Token(TP_COMMA, start_pos=self.position))
-                self.advance()
+            elif kind == 'STRING':
+                yield self.make_string(token_match.group(), base + idx, base + end)
 
-            # Tokenize all remaining possible characters
-            else:  # Report all illegal chars in stream
-                start_pos = self.position.copy()
-                illegal_character = self.current_character
-                self.advance()  # Note: Advance to ensure pointer doesn't detach
-                return [], IllegalCharError('"' + illegal_character + '"', start_pos, self.position)
+            # Note: Comments are skipped along with the newline
+            #       that ends them, no Token is produced for either
+            idx = end
 
         # Mark end with EOF and return
-        tokens.append(Token(TP_EOF, start_pos=self.position))
-        return tokens, None
-
-    #################################
-    # ALL MAKE FUNCTION DEFINITIONS #
-    #################################
+        yield Token(TP_EOF, start_pos=base + idx)
 
-    def make_number(self):
+    def read_chunk(self):
         """
-        Turn text stream into either a float or an int Token.
-        :return: Either a TP_FLOAT or a TP_INT number Token instance.
+        Reads the next chunk of text. Only StreamLexer reads files.
+        :return: Next chunk of text, empty at the end of the stream.
         """
-        number_str, dot_count = '', 0
-        start_pos = self.position.copy()
-        while self.current_character is not None \
-                and self.current_character in DIGITS + '.':
-            if self.current_character == '.':
-                if dot_count == 1:
-                    break  # Max one dot per float
-                dot_count += 1
-            number_str += self.current_character
-            self.advance()
-
-        # Tokenize the numeric value to INT or FLOAT types
-        if dot_count == 0:  # Tokenize an INT data type
-            return Token(TP_INT, int(number_str), start_pos, self.position)
-        else:  # Must be FLOAT data type
-            return Token(TP_FLOAT, float(number_str), start_pos, self.position)
+        return ''
 
-    def make_minus_or_arrow(self):
-        """
-        Returns either an arrow or a minus Token.
-        :return: Token with either the arrow or subtraction type.
-        """
-        token_type = TP_MINUS
-        start_pos = self.position.copy()
-        self.advance()
-        if self.current_character == '>':
-            self.advance()
-            token_type = TP_ARROW
-        return Token(token_type, start_pos=start_pos, end_pos=self.position)
-
-    def make_identifier(self):
-        identifier_str = ''
-        start_pos = self.position.copy()
-        while self.current_character is not None and self.current_character in LETTERS + DIGITS + '_':
-            identifier_str += self.current_character
-            self.advance()
-        token_type = TP_KEYWORD if identifier_str in KEYWORDS else TP_IDENTIFIER
-        return Token(token_type, identifier_str, start_pos, self.position)
+    #################################
+    # ALL MAKE FUNCTION DEFINITIONS #
+    #################################
 
-    def make_not_equals(self):
+    def make_string(self, literal, start_pos, end_pos):
         """
-        Makes a not-equals Token if the '!=' chars are found.
-        :return: Token for the not-equals symbol in the lexer.
+        Makes a String Token from a matched string literal.
+        Backslashes are dropped from the contents, exactly as
+        the character-by-character lexer used to do.
+        :param literal: Source text of the literal, quotes included.
+        :param start_pos: Offset of the opening quote.
+        :param end_pos: Offset right after the literal.
+        :return: a Token representing a String.
         """
-        start_pos = self.position.copy()
-        self.advance()
-        if self.current_character == '=':
-            self.advance()
-            return Token(TP_NE, start_pos=start_pos, end_pos=self.position), None
-        self.advance()
-        return None, ExpectedCharError('Expected "=" after "!"',
-                                       start_pos,
-                                       self.position)
+        closed = len(literal) > 1 and literal[-1] == '"'
+        if not closed:  # Note: Unterminated strings end one past the stream
+            end_pos += 1
+        string = literal[1:-1] if closed else literal[1:]
+        return Token(TP_STRING, string.replace('\\', ''), start_pos, end_pos)
 
-    def make_dual_use_token(self, initial_type, alternate_type, ):
+    def make_error(self, character, start_pos):
         """
-        Returns one of two Token types given the character string.
-        :param initial_type: Initial possible type of the Token.
-        :param alternate_type: Alternate Token type given the successive character.
-        :return: Token with either of the two possible types.
+        Creates the Error for a character no Token can start with.
+        :param character: The offending character.
+        :param start_pos: Offset of the offending character.
+        :return: ExpectedCharError for a lone "!", otherwise IllegalCharError.
         """
-        token_type = initial_type
-        start_pos = self.position.copy()
-        self.advance()
-        if self.current_character == '=':
-            self.advance()
-            token_type = alternate_type
-        return Token(token_type, start_pos, self.position)
+        if character == '!':
+            return ExpectedCharError('Expected "=" after "!"', start_pos, start_pos + 2)
+        return IllegalCharError('"' + character + '"', start_pos, start_pos + 1)
 
-    def make_equals(self):
-        """
-        Creates either a single equals or a double equals Token.
-        :return: Token with either a single or a double equals type.
-        """
-        return self.make_dual_use_token(TP_EQUALS, TP_EE)
 
-    def make_less_than(self):
-        """
-        Creates either a less or a less-than Token.
-        :return: Token with either a less or a less-than type.
-        """
-        return self.make_dual_use_token(TP_LT, TP_LTE)
-
-    def make_greater_than(self):
-        """
-        Creates either a greater or a greater-than Token.
-        :return: Token with either a greater or a greater-than type.
-        """
-        return self.make_dual_use_token(TP_GT, TP_GTE)
+class StreamLexer(Lexer):
+    """Lexer which reads its stream from a file object, chunk by chunk."""
 
-    def make_string(self):
+    def __init__(self, file, fn, chunk_size=1 << 16):
         """
-        Makes a string from the input stream.
-        :return: a Token representing a String.
+        Create instance of a StreamLexer. Only the text of the Token
+        being read is buffered, the StreamSource keeps the chunks read
+        so far for errors.
+        :param file: File object opened in text mode.
+        :param fn: File name of the document.
+        :param chunk_size: Number of characters read at once.
         """
-        string = ''
-        escape_character = False
-        start_pos = self.position.copy()
-        self.advance()
-        escape_characters = {'n': '\n', 't': '\t'}
-        while self.current_character is not None \
-                and (self.current_character != '"' or escape_character):
-            if escape_character:  # Try using provided escape character
-                string += escape_characters.get(self.current_character, self.current_character)
-            else:  # Check for other escape characters
-                if self.current_character == '\\':
-                    escape_character = True
-                else:
-                    string += self.current_character
-            self.advance()
-            escape_character = False
-        self.advance()
-        return Token(TP_STRING, string, start_pos, self.position)
+        self.text = ''
+        self.fn = fn
+        self.source = StreamSource(fn)
+        self.file = file
+        self.error = None
+        self.chunk_size = chunk_size
 
-    def skip_comment(self):
+    def read_chunk(self):
         """
-        Skips all comments in the stream.
-        All text to the right of a '#' character is a
-        comment and will be completely skipped over.
+        Reads the next chunk of the file.
+        :return: Next chunk of text, empty at the end of the file.
         """
-        self.advance()
-        while self.current_character != '\n':
-            self.advance()
-        self.advance()
+        chunk = self.file.read(self.chunk_size)
+        self.source.add_chunk(chunk)
+        return chunk
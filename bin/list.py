@@ -14,7 +14,6 @@ class List(Value):
         Initializes a List instance.
         :param elements: Elements of the List.
         """
-        super().__init__()
         self.elements = elements
 
     def __str__(self):
@@ -102,7 +101,4 @@ class List(Value):
         Returns a copy of the List instance.
         :return: Copy of List current instance.
         """
-        new_list = List(self.elements)
-        new_list.set_position(self.start_pos, self.end_pos)
-        new_list.set_context(self.context)
-        return new_list
+        return List(self.elements)
@@ -0,0 +1,108 @@
+# coding=utf-8
+"""
+Represents the Functions wrapped by the MEMO built-in.
+A MemoizedFunction keeps the values its Function returned, keyed by
+the values of the arguments, in a bounded LRU cache. Only Numbers,
+Strings and Lists of them make a key; a List is keyed by a snapshot
+of its elements, so changing it in place later never hits an older
+entry. Like the invariants of bin/invariants.py, only Numbers and
+Strings are kept, since a List returned from the cache could have
+been changed in place. Scoping is dynamic: MEMO is opt-in, for
+Functions whose value only depends on their arguments, and the
+side effects of a call only happen when it misses the cache.
+"""
+
+from collections import OrderedDict
+
+from bin.function import BaseFunction
+from bin.list import List
+from bin.number import Number
+from bin.runtime_result import RuntimeResult
+from bin.string import String
+
+# Note: Entries kept per MEMO, the least recently used ones are dropped first
+MAX_MEMO_ENTRIES = 1024
+
+
+def memo_key(value):
+    """
+    Builds the key of an argument.
+    :param value: Value of the argument.
+    :return: Hashable snapshot of the Value, None if it cannot be keyed.
+    """
+    value_type = type(value)
+    if value_type is Number or value_type is String:
+        return value_type, type(value.value), value.value  # Note: 1 and 1.0 print differently
+    if value_type is List:
+        keys = tuple(memo_key(element) for element in value.elements)
+        return None if None in keys else (List, keys)
+    return None
+
+
+class MemoCache:
+    """LRU cache of a MemoizedFunction, with its statistics."""
+
+    def __init__(self, max_entries=MAX_MEMO_ENTRIES):
+        """
+        Initializes an empty MemoCache instance.
+        :param max_entries: Number of entries kept at most.
+        """
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+
+class MemoizedFunction(BaseFunction):
+    """Function whose values are kept for the arguments they were called with."""
+
+    def __init__(self, function, cache=None):
+        """
+        Initializes a MemoizedFunction instance.
+        :param function: Function being wrapped, from any backend.
+        :param cache: MemoCache shared with other copies, a new one if None.
+        """
+        super().__init__(function.name)
+        self.function = function
+        self.cache = cache or MemoCache()
+
+    def __repr__(self):
+        return '<memo function {}>'.format(self.name)
+
+    def execute(self, args, context, start_pos, end_pos):
+        """
+        Returns the kept value of a call, or calls the wrapped Function.
+        :param args: Arguments being passed into the Function.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
+        :return: Value of the call, or the RuntimeResult of a call which failed.
+        """
+        cache = self.cache
+        key = tuple(memo_key(arg) for arg in args)
+        if None in key:
+            key = None
+        else:
+            value = cache.entries.get(key)
+            if value is not None:
+                cache.entries.move_to_end(key)
+                cache.hits += 1
+                return value
+            cache.misses += 1
+        value = self.function.execute(args, context, start_pos, end_pos)
+        if isinstance(value, RuntimeResult):
+            if value.should_return():  # Note: Errors, BREAK and CONTINUE are never kept
+                return value
+            value = value.value
+        if key is not None and type(value) in (Number, String):
+            cache.entries[key] = value
+            if len(cache.entries) > cache.max_entries:
+                cache.entries.popitem(last=False)
+        return value
+
+    def copy(self):
+        """
+        Copies a MemoizedFunction instance, sharing its cache.
+        :return: A new MemoizedFunction instance.
+        """
+        return MemoizedFunction(self.function, self.cache)
@@ -1,92 +1,118 @@
 # coding=utf-8
-"""Represents Nodes in the backend of the SimpleScript language."""
+"""
+Represents Nodes in the backend of the SimpleScript language.
+Nodes use __slots__ rather than an instance __dict__, as large
+programs hold many thousands of them for their whole lifetime.
+They keep only what evaluation needs: values, names and operator
+kinds are copied out of their Tokens, which are not referenced.
+"""
+
+from bin.constants import TOKEN_NAMES
 
 
 class NumberNode:
     """Represents a Node of a number."""
 
-    def __init__(self, token):
+    __slots__ = ('value', 'start_pos', 'end_pos')
+
+    def __init__(self, value, start_pos, end_pos):
         """
         Initialize the number node.
-        :param token: Token instance to use.
+        :param value: Int or float value of the number.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         """
-        self.token = token
-        self.start_pos = self.token.start_pos
-        self.end_pos = self.token.end_pos
+        self.value = value
+        self.start_pos = start_pos
+        self.end_pos = end_pos
 
     def __repr__(self):
-        return '{}'.format(self.token)
+        return '{}'.format(self.value)
 
 
 class VarAccessNode:
     """Supports accessing the variables in the grammar."""
 
-    def __init__(self, var_name):
+    __slots__ = ('var_name', 'start_pos', 'end_pos')
+
+    def __init__(self, var_name, start_pos, end_pos):
         """
         Initializes a VarAccessNode instance.
-        :param var_name: Name of the VAR Token.
+        :param var_name: Name of the variable.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         """
         self.var_name = var_name
-        self.start_pos = self.var_name.start_pos
-        self.end_pos = self.var_name.end_pos
+        self.start_pos = start_pos
+        self.end_pos = end_pos
 
 
 class VarAssignNode:
     """Supports assigning values to variables in the grammar."""
 
-    def __init__(self, var_name, value_node):
+    __slots__ = ('var_name', 'value_node', 'start_pos', 'end_pos')
+
+    def __init__(self, var_name, value_node, start_pos):
         """
         Initializes a VarAssignNode instance.
         :param var_name: Name of the VAR object.
         :param value_node: Node value of the object.
+        :param start_pos: Starting offset of the name.
         """
         self.var_name = var_name
         self.value_node = value_node
-        self.start_pos = self.var_name.start_pos
+        self.start_pos = start_pos
         self.end_pos = self.value_node.end_pos
 
 
 class BinOpNode:
     """Represents a Node for binary operations."""
 
-    def __init__(self, left_node, op_token, right_node):
+    __slots__ = ('left_node', 'op_type', 'right_node', 'start_pos', 'end_pos')
+
+    def __init__(self, left_node, op_type, right_node):
         """
         Initializes the binary operation node.
         :param left_node: Left node instance.
-        :param op_token: Operator token instance.
+        :param op_type: Token kind of the operator.
         :param right_node: Right node instance.
         """
         self.left_node = left_node
-        self.op_token = op_token
+        self.op_type = op_type
         self.right_node = right_node
         self.start_pos = self.left_node.start_pos
         self.end_pos = self.right_node.end_pos
 
     def __repr__(self):
-        return '({}, {}, {})'.format(self.left_node, self.op_token, self.right_node)
+        return '({}, {}, {})'.format(self.left_node, TOKEN_NAMES[self.op_type], self.right_node)
 
 
 class UnaryOpNode:
     """Represents a Node for unary operations."""
 
-    def __init__(self, op_token, right_node):
+    __slots__ = ('op_type', 'right_node', 'start_pos', 'end_pos')
+
+    def __init__(self, op_type, right_node, start_pos):
         """
         Initializes the unary operator.
-        :param op_token: Operator Token for the unary operation.
+        :param op_type: Token kind of the operator.
         :param right_node: Node which has a unary operation.
+        :param start_pos: Starting offset of the operator.
         """
-        self.op_token = op_token
+        self.op_type = op_type
         self.right_node = right_node
-        self.start_pos = self.op_token.start_pos
+        self.start_pos = start_pos
         self.end_pos = self.right_node.end_pos
 
     def __repr__(self):
-        return '({}, {})'.format(self.op_token, self.right_node)
+        return '({}, {})'.format(TOKEN_NAMES[self.op_type], self.right_node)
 
 
 class IfNode:
     """Represents a Node for if-statements."""
 
+    __slots__ = ('cases', 'else_case', 'start_pos', 'end_pos')
+
     def __init__(self, cases, else_case):
         """
         Initializes an IfNode with cases and an else case.
@@ -103,23 +129,27 @@ class IfNode:
 class ForNode:
     """Represents a Node for for-loops."""
 
-    def __init__(self, var_name_token, start_value_node, end_value_node,
-                 step_value_node, body_node, should_return_null):
+    __slots__ = ('var_name', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node',
+                 'should_return_null', 'start_pos', 'end_pos')
+
+    def __init__(self, var_name, start_value_node, end_value_node,
+                 step_value_node, body_node, should_return_null, start_pos):
         """
         Initializes a ForNode for-loop statement.
-        :param var_name_token: Name of the variable Token.
+        :param var_name: Name of the loop variable.
         :param start_value_node: When to begin the iteration.
         :param end_value_node: When to end the iteration.
         :param step_value_node: Value of each step in the loop.
         :param body_node: What gets evaluated on every iteration.
         :param should_return_null: True if the ForNode should return NULL.
+        :param start_pos: Starting offset of the loop variable.
         """
-        self.var_name_token = var_name_token
+        self.var_name = var_name
         self.start_value_node = start_value_node
         self.end_value_node = end_value_node
         self.step_value_node = step_value_node
         self.body_node = body_node
-        self.start_pos = self.var_name_token.start_pos
+        self.start_pos = start_pos
         self.end_pos = self.body_node.end_pos
         self.should_return_null = should_return_null
 
@@ -127,6 +157,8 @@ class ForNode:
 class WhileNode:
     """Represents a Node for while-loops."""
 
+    __slots__ = ('condition', 'body_node', 'should_return_null', 'start_pos', 'end_pos')
+
     def __init__(self, condition, body_node, should_return_null):
         """
         Initializes a WhileNode for while loops.
@@ -144,31 +176,32 @@ class WhileNode:
 class FuncDefNode:
     """Represents a function definition."""
 
-    def __init__(self, var_name_token, arg_name_tokens, body_node, should_auto_return):
+    __slots__ = ('var_name', 'arg_names', 'body_node', 'should_auto_return', 'start_pos', 'end_pos')
+
+    def __init__(self, var_name, arg_names, body_node, should_auto_return, start_pos=None):
         """
         Initializes a FuncDefNode for functions in stream.
-        :param var_name_token: Name of the function to create.
-        :param arg_name_tokens: Argument Tokens for the function.
+        :param var_name: Name of the function to create, None if anonymous.
+        :param arg_names: Argument names for the function.
         :param body_node: Expression assigned to new function.
         :param should_auto_return: True if the FuncDefNode should return the value automatically..
+        :param start_pos: Offset of the name or first argument, if any.
         """
-        self.var_name_token = var_name_token
-        self.arg_name_tokens = arg_name_tokens
+        self.var_name = var_name
+        self.arg_names = arg_names
         self.body_node = body_node
-        self.start_pos = None
         self.should_auto_return = should_auto_return
-        if self.var_name_token:
-            self.start_pos = self.var_name_token.start_pos
-        elif len(self.arg_name_tokens) > 0:
-            self.start_pos = self.arg_name_tokens[0].start_pos
-        else:  # Assume no arguments or variable names
-            self.start_pos = self.body_node.start_pos
+        if start_pos is None:  # Assume no arguments or variable names
+            start_pos = self.body_node.start_pos
+        self.start_pos = start_pos
         self.end_pos = self.body_node.end_pos
 
 
 class CallNode:
     """Represents a call to a function"""
 
+    __slots__ = ('node_to_call', 'arg_nodes', 'start_pos', 'end_pos')
+
     def __init__(self, node_to_call, arg_nodes):
         """
         Initializes a CallNode for calling functions.
@@ -188,12 +221,14 @@ class CallNode:
 class ListNode:
     """Represents a list."""
 
+    __slots__ = ('element_nodes', 'start_pos', 'end_pos')
+
     def __init__(self, element_nodes, start_pos, end_pos):
         """
         Initializes a ListNode for lists.
         :param element_nodes: Element Nodes in the list.
-        :param start_pos: Starting Position instance.
-        :param end_pos: Ending Position instance.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         """
         self.element_nodes = element_nodes
         self.start_pos = start_pos
@@ -203,28 +238,34 @@ class ListNode:
 class StringNode:
     """Represents a String instance."""
 
-    def __init__(self, token):
+    __slots__ = ('value', 'start_pos', 'end_pos')
+
+    def __init__(self, value, start_pos, end_pos):
         """
         Initializes a StringNode instance.
-        :param token: Token with the string content.
+        :param value: Content of the string.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         """
-        self.token = token
-        self.start_pos = self.token.start_pos
-        self.end_pos = self.token.end_pos
+        self.value = value
+        self.start_pos = start_pos
+        self.end_pos = end_pos
 
     def __repr__(self):
-        return '{}'.format(self.token)
+        return '{}'.format(self.value)
 
 
 class ReturnNode:
     """Represents an instance of the RETURN function."""
 
+    __slots__ = ('node_to_return', 'start_pos', 'end_pos')
+
     def __init__(self, node_to_return, start_pos, end_pos):
         """
         Initializes a ReturnNode instance.
         :param node_to_return: Node we wish to return.
-        :param start_pos: Starting Position of the Node.
-        :param end_pos: Ending Position of the Node.
+        :param start_pos: Starting offset of the Node.
+        :param end_pos: Ending offset of the Node.
         """
         self.node_to_return = node_to_return
         self.start_pos = start_pos
@@ -234,11 +275,13 @@ class ReturnNode:
 class ContinueNode:
     """Represents an instance of the CONTINUE function."""
 
+    __slots__ = ('start_pos', 'end_pos')
+
     def __init__(self, start_pos, end_pos):
         """
         Initializes a ContinueNode instance.
-        :param start_pos: Starting Position instance.
-        :param end_pos: Ending Position instance.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         """
         self.start_pos = start_pos
         self.end_pos = end_pos
@@ -247,11 +290,146 @@ class ContinueNode:
 class BreakNode:
     """Represents an instance of the BREAK function."""
 
+    __slots__ = ('start_pos', 'end_pos')
+
     def __init__(self, start_pos, end_pos):
         """
         Initializes a BreakNode instance.
-        :param start_pos: Starting Position instance.
-        :param end_pos: Ending Position instance.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
+        """
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+
+
+class InvariantNode:
+    """
+    Represents an expression which a loop does not change, built by
+    the optimizer. Its Value is reused, see bin/invariants.py.
+    """
+
+    __slots__ = ('expr_node', 'guards', 'start_pos', 'end_pos')
+
+    def __init__(self, expr_node, guards):
         """
+        Initializes an InvariantNode instance.
+        :param expr_node: Node of the expression.
+        :param guards: Tuple of the (name, kind) pairs of the variables the expression reads.
+        """
+        self.expr_node = expr_node
+        self.guards = guards
+        self.start_pos = expr_node.start_pos
+        self.end_pos = expr_node.end_pos
+
+
+class InlinedCallNode:
+    """
+    Represents a call whose Function body has been inlined by the
+    optimizer. The arguments are set under names no script can use,
+    and the body runs in the Context of the caller.
+    """
+
+    __slots__ = ('func_name', 'var_names', 'arg_nodes', 'body_node', 'start_pos', 'end_pos')
+
+    def __init__(self, func_name, var_names, arg_nodes, body_node, start_pos, end_pos):
+        """
+        Initializes an InlinedCallNode instance.
+        :param func_name: Name of the Function, shown in tracebacks.
+        :param var_names: Names the arguments are set under.
+        :param arg_nodes: Nodes of the arguments.
+        :param body_node: Copy of the body Node, reading these names.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
+        """
+        self.func_name = func_name
+        self.var_names = var_names
+        self.arg_nodes = arg_nodes
+        self.body_node = body_node
         self.start_pos = start_pos
         self.end_pos = end_pos
+
+
+class TailCallNode:
+    """
+    Represents a call of a FUNC to itself in tail position, built by
+    the optimizer. When it does reach the same Function, the call
+    reruns the body in the Context of the running one, which is not
+    left on the stack.
+    """
+
+    __slots__ = ('node_to_call', 'arg_nodes', 'start_pos', 'end_pos')
+
+    def __init__(self, node_to_call, arg_nodes, start_pos, end_pos):
+        """
+        Initializes a TailCallNode instance.
+        :param node_to_call: Node of the function to call.
+        :param arg_nodes: Arguments for the function.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
+        """
+        self.node_to_call = node_to_call
+        self.arg_nodes = arg_nodes
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+
+
+# Note: Every Node class, the backends build their dispatch tables from it
+NODE_TYPES = (NumberNode, StringNode, VarAccessNode, VarAssignNode, BinOpNode, UnaryOpNode, IfNode,
+              ForNode, WhileNode, FuncDefNode, CallNode, ListNode, ReturnNode, ContinueNode, BreakNode,
+              InvariantNode, InlinedCallNode, TailCallNode)
+
+# Note: Attributes holding the child Nodes of the classes without
+#       lists of children, in the order they are evaluated
+CHILD_FIELDS = {
+    VarAssignNode: ('value_node',),
+    BinOpNode: ('left_node', 'right_node'),
+    UnaryOpNode: ('right_node',),
+    ForNode: ('start_value_node', 'end_value_node', 'step_value_node', 'body_node'),
+    WhileNode: ('condition', 'body_node'),
+    FuncDefNode: ('body_node',),
+    ReturnNode: ('node_to_return',),
+    InvariantNode: ('expr_node',),
+}
+
+
+def iter_child_nodes(node):
+    """
+    Yields the direct children of a Node, in the order they are evaluated.
+    :param node: Node whose children we wish to visit.
+    :return: Generator of the child Nodes.
+    """
+    node_type = type(node)
+    if node_type is IfNode:
+        for condition, expr, _ in node.cases:
+            yield condition
+            yield expr
+        if node.else_case:
+            yield node.else_case[0]
+    elif node_type is CallNode or node_type is TailCallNode:
+        yield node.node_to_call
+        yield from node.arg_nodes
+    elif node_type is ListNode:
+        yield from node.element_nodes
+    elif node_type is InlinedCallNode:
+        yield from node.arg_nodes
+        yield node.body_node
+    else:
+        for field in CHILD_FIELDS.get(node_type, ()):
+            child = getattr(node, field)
+            if child is not None:
+                yield child
+
+
+def iter_body_nodes(node):
+    """
+    Yields a Node and its descendants which run in the same Context,
+    leaving out the bodies of the Functions defined there.
+    :param node: Root Node of a body.
+    :return: Generator of the Nodes.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        if type(node) is not FuncDefNode:
+            stack.extend(iter_child_nodes(node))
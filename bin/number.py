@@ -1,10 +1,16 @@
 # coding=utf-8
 """Represents Values in the context of SimpleScript."""
 
-from bin.constants import operations
+from bin.constants import *
 from bin.errors import ActiveRuntimeError
 from bin.value import Value
 
+# Note: Numbers never change, so the ones holding small ints are built
+#       once and shared by make_number(). The range can be changed with
+#       cache_small_ints(), an empty range turns the sharing off.
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+
 
 class Number(Value):
     """Represents a Number instance in the interpreter."""
@@ -12,28 +18,13 @@ class Number(Value):
     def __init__(self, value):
         """
         Initialize a Number instance with a value.
-        Note that we initialize context and positions to None so
-        that Python's interpreter doesn't complain of unresolved
-        class-level variables.
         :param value: Value of the new Number instance.
         """
-        super().__init__()
         self.value = value
 
     def __repr__(self):
         return str(self.value)
 
-    def set_position(self, start_pos=None, end_pos=None):
-        """
-        Set the position of the number in the context of the AST.
-        :param start_pos: Starting position in the stream.
-        :param end_pos: Ending position in the stream.
-        :return: Self instance of Number with new positions.
-        """
-        self.start_pos = start_pos
-        self.end_pos = end_pos
-        return self
-
     def add_to(self, other):
         """
         Add two Number values together.
@@ -42,7 +33,7 @@ class Number(Value):
         :return: Number instance with the summed value.
         """
         if isinstance(other, Number):
-            return Number(self.value + other.value).set_context(self.context), None
+            return Number(self.value + other.value), None
         else:
             return None, Value.illegal_operation(other)
 
@@ -54,7 +45,7 @@ class Number(Value):
         :return: Number instance with the subtracted value.
         """
         if isinstance(other, Number):
-            return Number(self.value - other.value).set_context(self.context), None
+            return Number(self.value - other.value), None
         else:
             return None, Value.illegal_operation(other)
 
@@ -66,7 +57,7 @@ class Number(Value):
         :return: Number instance with the multiplied value.
         """
         if isinstance(other, Number):
-            return Number(self.value * other.value).set_context(self.context), None
+            return Number(self.value * other.value), None
         else:
             return None, Value.illegal_operation(other)
 
@@ -78,7 +69,7 @@ class Number(Value):
         :return: Number instance with the multiplied value.
         """
         if isinstance(other, Number):
-            return Number(self.value ** other.value).set_context(self.context), None
+            return Number(self.value ** other.value), None
         else:
             return None, Value.illegal_operation(other)
 
@@ -94,7 +85,7 @@ class Number(Value):
                                                 other.start_pos,
                                                 other.end_pos,
                                                 self.context)
-            return Number(self.value % other.value).set_context(self.context), None
+            return Number(self.value % other.value), None
         else:
             return None, Value.illegal_operation(other)
 
@@ -112,20 +103,12 @@ class Number(Value):
                                                 other.end_pos,
                                                 self.context)
             if clean:  # Perform integer division
-                return Number(self.value // other.value).set_context(self.context), None
+                return Number(self.value // other.value), None
             else:  # Perform regular floating point division
-                return Number(self.value / other.value).set_context(self.context), None
+                return Number(self.value / other.value), None
         else:
             return None, Value.illegal_operation(other)
 
-    def set_context(self, context=None):
-        """
-        Sets the class-level context to be a Context instance.
-        :param context: Context instance to be set.
-        """
-        self.context = context
-        return self
-
     def is_true(self):
         """
         Returns True if the value of the Number is not 0.
@@ -138,50 +121,53 @@ class Number(Value):
         Makes a copy of the Number instance.
         :return: A copy of the Number instance.
         """
-        copy = Number(self.value)
-        copy.set_position(self.start_pos, self.end_pos)
-        copy.set_context(self.context)
-        return copy
+        return Number(self.value)
 
     ###############################
     # ALL LOGICAL OPERATIONS      #
     # EVERY FUNCTION IS IDENTICAL #
     ###############################
 
-    def apply_comparison(self, other, op_str):
+    def apply_comparison(self, other, op_type):
         """
         Applies the comparison operator to the other Number.
         Call the int() function to convert our output
         to either a 1 (TRUE) or 0 (FALSE) result.
         :param other: Other Number to apply the operation to.
-        :param op_str: The string of the operator of the operation we desire.
+        :param op_type: The Token kind of the operator of the operation we desire.
         :return: Number with the resulting operation.
         """
-        return Number(int(operations[op_str](self.value, other.value))).set_context(self.context), None
+        return make_number(int(operations[op_type](self.value, other.value))), None
 
     def get_comparison_ee(self, other):
-        return self.apply_comparison(other, '==')
+        return self.apply_comparison(other, TP_EE)
 
     def get_comparison_ne(self, other):
-        return self.apply_comparison(other, '!=')
+        return self.apply_comparison(other, TP_NE)
 
     def get_comparison_lt(self, other):
-        return self.apply_comparison(other, '<')
+        return self.apply_comparison(other, TP_LT)
 
     def get_comparison_lte(self, other):
-        return self.apply_comparison(other, '<=')
+        return self.apply_comparison(other, TP_LTE)
 
     def get_comparison_gt(self, other):
-        return self.apply_comparison(other, '>')
+        return self.apply_comparison(other, TP_GT)
 
     def get_comparison_gte(self, other):
-        return self.apply_comparison(other, '>=')
+        return self.apply_comparison(other, TP_GTE)
 
     def anded_by(self, other):
-        return self.apply_comparison(other, 'AND')
+        if isinstance(other, Number):
+            return self.apply_comparison(other, TP_AND)
+        else:
+            return None, Value.illegal_operation(other)
 
     def ored_by(self, other):
-        return self.apply_comparison(other, 'OR')
+        if isinstance(other, Number):
+            return self.apply_comparison(other, TP_OR)
+        else:
+            return None, Value.illegal_operation(other)
 
     def notted(self):
         """
@@ -189,4 +175,37 @@ class Number(Value):
         into a Node. Only unique comparison.
         :return: Number node with the negated value.
         """
-        return Number(1 if self.value == 0 else 0).set_context(self.context), None
+        return make_number(1 if self.value == 0 else 0), None
+
+
+Number.null = Number.false = Number(0)
+Number.true = Number(1)
+
+small_ints = []
+small_int_min, small_int_max = 0, -1
+
+
+def cache_small_ints(low=SMALL_INT_MIN, high=SMALL_INT_MAX):
+    """
+    Builds the shared Numbers of a range of ints.
+    :param low: Smallest int of the range.
+    :param high: Largest int of the range.
+    """
+    global small_ints, small_int_min, small_int_max
+    shared = {0: Number.false, 1: Number.true}
+    small_ints = [shared.get(value) or Number(value) for value in range(low, high + 1)]
+    small_int_min, small_int_max = low, high
+
+
+def make_number(value):
+    """
+    Returns a Number holding a value, shared if it is a small int.
+    :param value: int or float of the Number.
+    :return: Number instance.
+    """
+    if type(value) is int and small_int_min <= value <= small_int_max:
+        return small_ints[value - small_int_min]
+    return Number(value)
+
+
+cache_small_ints()
@@ -0,0 +1,676 @@
+# coding=utf-8
+"""
+Represents the optimizer, run between parsing and interpreting.
+Every pass rewrites the AST in place and returns its new root, which
+any backend can then run. Passes never change what a script prints or
+returns: operations which would fail are left in place, so that their
+errors are still raised at runtime with their original positions.
+Scoping is dynamic, a Function sees the variables of its caller, so
+values are only propagated within the body which sets them.
+"""
+
+import copy
+from collections import Counter
+
+from bin.closure_compiler import BINARY_METHODS, SHORT_CIRCUITS
+from bin.constants import *
+from bin.invariants import GUARD_ARGUMENT, GUARD_CALLEE, GUARD_VALUE
+from bin.nodes import *
+from bin.number import Number, make_number
+from bin.string import String
+from bin.symbol_table import TABLE_CONSTANTS
+
+# Note: Global variables folded into the program, with the values they
+#       have in the global SymbolTable when the program is optimized
+GLOBAL_CONSTANTS = ('NULL', 'TRUE', 'FALSE', 'MATH_PI')
+
+# Note: Bigger powers could take long to fold, for code which may never run
+MAX_FOLDED_EXPONENT = 64
+
+# Note: Bigger bodies gain little from skipping the call
+MAX_INLINED_NODES = 24
+
+# Note: Nodes an inlined body may contain, they run the same way in any Context
+INLINABLE_NODE_TYPES = (NumberNode, StringNode, VarAccessNode, BinOpNode, UnaryOpNode, IfNode, ListNode, CallNode)
+
+
+def get_literal(node):
+    """
+    Returns the Value of a literal Node.
+    :param node: Node to check.
+    :return: Number or String instance, None if the Node is not a literal.
+    """
+    if type(node) is NumberNode:
+        return Number(node.value)
+    if type(node) is StringNode:
+        return String(node.value)
+    return None
+
+
+def make_literal(value, start_pos, end_pos):
+    """
+    Builds the literal Node of a Value.
+    :param value: Number or String instance.
+    :param start_pos: Starting offset of the Node.
+    :param end_pos: Ending offset of the Node.
+    :return: NumberNode or StringNode instance, None if the Value has no literal.
+    """
+    if type(value) is Number and type(value.value) in (int, float):
+        return NumberNode(value.value, start_pos, end_pos)
+    if type(value) is String:
+        return StringNode(value.value, start_pos, end_pos)
+    return None
+
+
+def count_assignments(node):
+    """
+    Counts how many times each variable is set by a body.
+    :param node: Root Node of the body.
+    :return: Counter of the variable names.
+    """
+    assignments = Counter()
+    for body_node in iter_body_nodes(node):
+        node_type = type(body_node)
+        if node_type in (VarAssignNode, ForNode, FuncDefNode) and body_node.var_name:
+            assignments[body_node.var_name] += 1
+        elif node_type is InlinedCallNode:
+            assignments.update(body_node.var_names)
+    return assignments
+
+
+def count_bindings(node):
+    """
+    Counts how many times each name is bound anywhere in an AST, by
+    assignments, FOR loops, Function definitions and arguments.
+    :param node: Root Node of the AST.
+    :return: Counter of the names.
+    """
+    bindings, stack = Counter(), [node]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type in (VarAssignNode, ForNode, FuncDefNode) and node.var_name:
+            bindings[node.var_name] += 1
+        if node_type is FuncDefNode:
+            bindings.update(node.arg_names)
+        elif node_type is InlinedCallNode:
+            bindings.update(node.var_names)
+        stack.extend(iter_child_nodes(node))
+    return bindings
+
+
+def references_run(node):
+    """
+    Checks if an AST may call RUN, the only built-in which sets global
+    variables, from any of its bodies.
+    :param node: Root Node of the AST.
+    :return: True if the name RUN is read anywhere.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if type(node) is VarAccessNode and node.var_name == 'RUN':
+            return True
+        stack.extend(iter_child_nodes(node))
+    return False
+
+
+class NodeTransformer:
+    """Superclass of the optimization passes."""
+
+    # Note: Maps every Node class to its transform_ function, like
+    #       the visit_methods of the Interpreter
+    transform_methods = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.transform_methods = cls.make_transform_methods()
+
+    @classmethod
+    def make_transform_methods(cls):
+        """
+        Builds the dispatch table of the transform_ methods of the class.
+        :return: Dictionary mapping Node classes to unbound transform_ functions.
+        """
+        return {node_class: getattr(cls, 'transform_{}'.format(node_class.__name__.lower()), cls.transform_children)
+                for node_class in NODE_TYPES}
+
+    def transform(self, node):
+        """
+        Rewrites a Node and its children.
+        :param node: Node we wish to rewrite.
+        :return: The Node replacing it, possibly itself.
+        """
+        return self.transform_methods[type(node)](self, node)
+
+    def transform_children(self, node):
+        """
+        Rewrites the children of a Node, in the order they are evaluated.
+        :param node: Node whose children we wish to rewrite.
+        :return: The Node itself.
+        """
+        node_type = type(node)
+        if node_type is IfNode:
+            node.cases = [(self.transform(condition), self.transform(expr), should_return_null)
+                          for condition, expr, should_return_null in node.cases]
+            if node.else_case:
+                node.else_case = (self.transform(node.else_case[0]), node.else_case[1])
+        elif node_type is CallNode or node_type is TailCallNode:
+            node.node_to_call = self.transform(node.node_to_call)
+            node.arg_nodes = [self.transform(arg_node) for arg_node in node.arg_nodes]
+        elif node_type is ListNode:
+            node.element_nodes = [self.transform(element_node) for element_node in node.element_nodes]
+        elif node_type is InlinedCallNode:
+            node.arg_nodes = [self.transform(arg_node) for arg_node in node.arg_nodes]
+            node.body_node = self.transform(node.body_node)
+        else:
+            for field in CHILD_FIELDS.get(node_type, ()):
+                child = getattr(node, field)
+                if child is not None:
+                    setattr(node, field, self.transform(child))
+        return node
+
+
+NodeTransformer.transform_methods = NodeTransformer.make_transform_methods()
+
+
+class ConstantFolder(NodeTransformer):
+    """
+    Folds operators over literals, propagates the variables which a body
+    sets only once, to a literal, and prunes IF cases with literal conditions.
+    """
+
+    def __init__(self, global_constants):
+        """
+        Initializes a ConstantFolder instance.
+        :param global_constants: Values of the global constants, by name.
+        """
+        self.global_constants = global_constants
+        self.constants = {}  # Note: Literal Values of the variables, where they are known
+        self.assignments = Counter()
+        self.may_propagate = True
+
+    def fold_program(self, node):
+        """
+        Folds a program, which runs in the global SymbolTable.
+        :param node: Root Node of the AST.
+        :return: Root Node of the folded AST.
+        """
+        if references_run(node):  # Note: A script run with RUN could set any global
+            return self.fold_body(node, {}, (), False)
+        return self.fold_body(node, self.global_constants, (), True)
+
+    def fold_body(self, node, constants, arg_names, may_propagate):
+        """
+        Folds the body of a program or Function, in its own SymbolTable.
+        :param node: Root Node of the body.
+        :param constants: Values of the variables known when the body starts.
+        :param arg_names: Names of the arguments set before the body starts.
+        :param may_propagate: False if the variables the body sets may change.
+        :return: Root Node of the folded body.
+        """
+        saved_state = self.constants, self.assignments, self.may_propagate
+        self.assignments = count_assignments(node)
+        self.constants = {var_name: value for var_name, value in constants.items()
+                          if var_name not in self.assignments and var_name not in arg_names}
+        self.may_propagate = may_propagate
+        node = self.transform(node)
+        self.constants, self.assignments, self.may_propagate = saved_state
+        return node
+
+    def transform_varaccessnode(self, node):
+        value = self.constants.get(node.var_name)
+        if value is None:
+            return node
+        return make_literal(value, node.start_pos, node.end_pos)
+
+    def transform_listnode(self, node):
+        # Note: A variable set once to a literal keeps it in the elements
+        #       which follow, and only there
+        saved_constants, self.constants = self.constants, dict(self.constants)
+        element_nodes = []
+        for element_node in node.element_nodes:
+            element_node = self.transform(element_node)
+            element_nodes.append(element_node)
+            if self.may_propagate and type(element_node) is VarAssignNode \
+                    and self.assignments[element_node.var_name] == 1:
+                value = get_literal(element_node.value_node)
+                if value is not None:
+                    self.constants[element_node.var_name] = value
+        node.element_nodes = element_nodes
+        self.constants = saved_constants
+        return node
+
+    def transform_binopnode(self, node):
+        node.left_node = self.transform(node.left_node)
+        node.right_node = self.transform(node.right_node)
+        left, right = get_literal(node.left_node), get_literal(node.right_node)
+        deciding = SHORT_CIRCUITS.get(node.op_type)
+        if deciding is not None and type(left) is Number and left.is_true() is deciding:
+            return NumberNode(int(deciding), node.start_pos, node.end_pos)  # Note: The right operand never runs
+        if left is None or right is None:
+            return node
+        if node.op_type == TP_POWER and not (type(right) is Number and abs(right.value) <= MAX_FOLDED_EXPONENT):
+            return node
+        if node.op_type == TP_MUL and (type(left) is String or type(right) is String):
+            return node  # Note: Repeated Strings can be huge
+        try:
+            result, error = BINARY_METHODS[node.op_type](left, right)
+        except Exception:
+            return node  # Note: The backends fail the same way at runtime, if the operation ever runs
+        if error:
+            return node
+        return make_literal(result, node.start_pos, node.end_pos) or node
+
+    def transform_unaryopnode(self, node):
+        node.right_node = self.transform(node.right_node)
+        value = get_literal(node.right_node)
+        if value is None:
+            return node
+        try:
+            if node.op_type == TP_MINUS:
+                result, error = value.multiply_by(make_number(-1))
+            elif node.op_type == TP_NOT:
+                result, error = value.notted()
+            else:
+                result, error = value, None
+        except Exception:
+            return node
+        if error:
+            return node
+        return make_literal(result, node.start_pos, node.end_pos) or node
+
+    def transform_ifnode(self, node):
+        self.transform_children(node)
+        cases, else_case = [], node.else_case
+        for case in node.cases:
+            condition = get_literal(case[0])
+            if condition is None:
+                cases.append(case)
+            elif condition.is_true():
+                if cases:  # Note: Taken whenever the cases before are not
+                    else_case = case[1:]
+                elif case[2]:
+                    cases.append(case)
+                    else_case = None
+                else:  # Note: Always taken, gives the value of its branch
+                    return case[1]
+                break
+        if not cases and else_case and not else_case[1]:
+            return else_case[0]
+        node.cases, node.else_case = cases, else_case
+        return node
+
+    def transform_funcdefnode(self, node):
+        node.body_node = self.fold_body(node.body_node, TABLE_CONSTANTS, node.arg_names, True)
+        return node
+
+
+class BodyCopier(NodeTransformer):
+    """Copies the body of a Function, to inline it at one call."""
+
+    def __init__(self, renames):
+        """
+        Initializes a BodyCopier instance.
+        :param renames: New names of the arguments, by name.
+        """
+        self.renames = renames
+
+    def transform(self, node):
+        return super().transform(copy.copy(node))
+
+    def transform_varaccessnode(self, node):
+        var_name = node.var_name
+        if var_name in self.renames:
+            node.var_name = self.renames[var_name]
+        elif var_name in TABLE_CONSTANTS:  # Note: The SymbolTable of the call reads them from there
+            return make_literal(TABLE_CONSTANTS[var_name], node.start_pos, node.end_pos)
+        return node
+
+
+class FunctionInliner(NodeTransformer):
+    """
+    Inlines the calls to small Functions defined at the top level of
+    the program, under a name bound nowhere else, at the calls made
+    after their definition, which always reach them. Only bodies which
+    return an expression without assignments or calls to Functions are
+    inlined, as they run the same way in the Context of their caller.
+    """
+
+    def __init__(self, symbol_table):
+        """
+        Initializes a FunctionInliner instance.
+        :param symbol_table: Global SymbolTable, to tell which names are built-ins.
+        """
+        self.symbol_table = symbol_table
+        self.functions = {}  # Note: FuncDefNodes which may be inlined, by name
+        self.bindings = Counter()
+
+    def inline_program(self, node):
+        """
+        Inlines the calls of a program.
+        :param node: Root Node of the AST.
+        :return: Root Node of the rewritten AST.
+        """
+        if type(node) is not ListNode or references_run(node):  # Note: RUN could bind any global
+            return node
+        self.bindings = count_bindings(node)
+        element_nodes = []
+        for element_node in node.element_nodes:
+            element_node = self.transform(element_node)
+            element_nodes.append(element_node)
+            if type(element_node) is FuncDefNode and self.is_inlinable(element_node):
+                self.functions[element_node.var_name] = element_node
+        node.element_nodes = element_nodes
+        return node
+
+    def is_built_in(self, var_name):
+        """
+        Checks if a name always refers to a built-in other than RUN.
+        :param var_name: Name being called.
+        :return: True if the program never binds the name, and it refers to a built-in.
+        """
+        value = self.symbol_table.get(var_name)
+        return not self.bindings[var_name] and getattr(value, 'method', None) is not None \
+            and value.name.lower() != 'run'
+
+    def is_inlinable(self, node):
+        """
+        Checks if the calls to a Function may be inlined.
+        :param node: FuncDefNode instance.
+        :return: True if the Function is small, returns an expression, and
+                 its name and arguments are bound nowhere else.
+        """
+        if not node.var_name or self.bindings[node.var_name] != 1 or not node.should_auto_return \
+                or len(set(node.arg_names)) != len(node.arg_names):
+            return False
+        size, stack = 0, [node.body_node]
+        while stack:
+            body_node = stack.pop()
+            size += 1
+            if size > MAX_INLINED_NODES or type(body_node) not in INLINABLE_NODE_TYPES:
+                return False
+            if type(body_node) is CallNode and not (type(body_node.node_to_call) is VarAccessNode and
+                                                    self.is_built_in(body_node.node_to_call.var_name)):
+                return False
+            stack.extend(iter_child_nodes(body_node))
+        return True
+
+    def transform_callnode(self, node):
+        self.transform_children(node)
+        func_def = self.functions.get(node.node_to_call.var_name) \
+            if type(node.node_to_call) is VarAccessNode else None
+        if func_def is None or len(node.arg_nodes) != len(func_def.arg_names):
+            return node  # Note: A wrong argument count fails like the call would
+        # Note: Offsets are unique, and no name of a script contains an @
+        var_names = tuple('{}@{}'.format(arg_name, node.start_pos) for arg_name in func_def.arg_names)
+        body_node = BodyCopier(dict(zip(func_def.arg_names, var_names))).transform(func_def.body_node)
+        return InlinedCallNode(func_def.var_name, var_names, node.arg_nodes, body_node, node.start_pos, node.end_pos)
+
+
+class DeadCodeEliminator(NodeTransformer):
+    """
+    Tells the loops whose List is never used not to build it, and
+    removes the statements which follow a RETURN, BREAK or CONTINUE,
+    and the literal statements of Function bodies.
+    """
+
+    # Note: Assignments to variables which nothing reads are kept.
+    #       Scoping is dynamic, so a Function defined by another run(),
+    #       statement of run_stream() or script run with RUN can still
+    #       read them, and no single AST is ever the whole program.
+
+    def __init__(self):
+        """Initializes a DeadCodeEliminator instance."""
+        self.used = True  # Note: False while rewriting a Node whose value is dropped
+
+    def is_dead(self, node):
+        """
+        Checks if a statement whose value is dropped may be removed.
+        :param node: Node of the statement.
+        :return: True if running it has no effect.
+        """
+        return type(node) in (NumberNode, StringNode)
+
+    def transform_used(self, node, used):
+        """
+        Rewrites a Node, telling it whether its value is used.
+        :param node: Node we wish to rewrite.
+        :param used: False if the value of the Node is dropped.
+        :return: The Node replacing it.
+        """
+        saved_used, self.used = self.used, used
+        node = self.transform(node)
+        self.used = saved_used
+        return node
+
+    def transform_children(self, node):
+        saved_used, self.used = self.used, True
+        node = super().transform_children(node)
+        self.used = saved_used
+        return node
+
+    def transform_listnode(self, node):
+        element_nodes = []
+        for element_node in node.element_nodes:
+            if not self.used and self.is_dead(element_node):
+                continue
+            element_nodes.append(self.transform_used(element_node, self.used))
+            if type(element_node) in (ReturnNode, BreakNode, ContinueNode):
+                break  # Note: The statements which follow never run
+        node.element_nodes = element_nodes
+        return node
+
+    def transform_ifnode(self, node):
+        node.cases = [(self.transform_used(condition, True),
+                       self.transform_used(expr, self.used and not should_return_null), should_return_null)
+                      for condition, expr, should_return_null in node.cases]
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            node.else_case = (self.transform_used(expr, self.used and not should_return_null), should_return_null)
+        return node
+
+    def transform_fornode(self, node):
+        node.start_value_node = self.transform_used(node.start_value_node, True)
+        node.end_value_node = self.transform_used(node.end_value_node, True)
+        if node.step_value_node:
+            node.step_value_node = self.transform_used(node.step_value_node, True)
+        node.should_return_null = node.should_return_null or not self.used
+        node.body_node = self.transform_used(node.body_node, not node.should_return_null)
+        return node
+
+    def transform_whilenode(self, node):
+        node.condition = self.transform_used(node.condition, True)
+        node.should_return_null = node.should_return_null or not self.used
+        node.body_node = self.transform_used(node.body_node, not node.should_return_null)
+        return node
+
+    def transform_funcdefnode(self, node):
+        saved_used, self.used = self.used, node.should_auto_return
+        node.body_node = self.transform(node.body_node)
+        self.used = saved_used
+        return node
+
+    def transform_inlinedcallnode(self, node):
+        node.arg_nodes = [self.transform_used(arg_node, True) for arg_node in node.arg_nodes]
+        node.body_node = self.transform(node.body_node)
+        return node
+
+
+def get_guards(node):
+    """
+    Lists how an expression reads its variables, if it may be invariant.
+    :param node: Node of the expression.
+    :return: List of (name, kind) pairs, None if the expression sets
+             variables, calls something other than a name, or contains
+             statements.
+    """
+    guards, stack = [], [(node, GUARD_VALUE)]
+    while stack:
+        node, kind = stack.pop()
+        node_type = type(node)
+        if node_type is VarAccessNode:
+            guards.append((node.var_name, kind))
+        elif node_type is CallNode:
+            if type(node.node_to_call) is not VarAccessNode:
+                return None
+            guards.append((node.node_to_call.var_name, GUARD_CALLEE))
+            stack.extend((arg_node, GUARD_ARGUMENT) for arg_node in node.arg_nodes)
+        elif node_type in (BinOpNode, UnaryOpNode, InvariantNode):
+            stack.extend((child, GUARD_VALUE) for child in iter_child_nodes(node))
+        elif node_type not in (NumberNode, StringNode):
+            return None
+    return guards
+
+
+class InvariantHoister(NodeTransformer):
+    """
+    Wraps the expressions of loops which only read variables the loop
+    never sets into InvariantNodes, so that they are computed once per
+    loop rather than on every iteration. An expression which is also
+    invariant in the outer loops is kept across their iterations, and
+    its parts which are only invariant there are wrapped as well.
+    """
+
+    def __init__(self, symbol_table):
+        """
+        Initializes an InvariantHoister instance.
+        :param symbol_table: Global SymbolTable, to tell which names are pure built-ins.
+        """
+        self.symbol_table = symbol_table
+        self.loops = []  # Note: Variables set by each enclosing loop, innermost last
+        self.level = 0   # Note: Loops the closest wrapped expression is invariant in
+
+    def is_pure(self, var_name):
+        """
+        Checks if a name refers to a built-in without side effects.
+        :param var_name: Name being called.
+        :return: True if calling the name cannot have side effects, when it
+                 still refers to its global Value. The InvariantNode checks
+                 it again at runtime.
+        """
+        return getattr(getattr(self.symbol_table.get(var_name), 'method', None), 'is_pure', False)
+
+    def get_level(self, guards):
+        """
+        Finds how many enclosing loops an expression is invariant in.
+        :param guards: Guards of the expression, see get_guards().
+        :return: Index of the outermost such loop, the number of loops if none.
+        """
+        var_names = {var_name for var_name, _ in guards}
+        level = len(self.loops)
+        while level and not var_names.intersection(self.loops[level - 1]):
+            level -= 1
+        return level
+
+    def transform(self, node):
+        if self.loops and type(node) in (BinOpNode, UnaryOpNode, CallNode):
+            guards = get_guards(node)
+            if guards is not None and all(self.is_pure(var_name) for var_name, kind in guards
+                                          if kind == GUARD_CALLEE):
+                level = self.get_level(guards)
+                if level < self.level:
+                    saved_level, self.level = self.level, level
+                    node = self.transform_children(node)
+                    self.level = saved_level
+                    return InvariantNode(node, tuple(dict.fromkeys(guards)))
+        return super().transform(node)
+
+    def transform_loop(self, node, fields):
+        """
+        Rewrites the parts of a loop which run on every iteration.
+        :param node: ForNode or WhileNode instance.
+        :param fields: Names of the attributes holding these parts.
+        """
+        saved_level = self.level
+        self.loops.append(count_assignments(node))
+        self.level = len(self.loops)
+        for field in fields:
+            setattr(node, field, self.transform(getattr(node, field)))
+        self.loops.pop()
+        self.level = saved_level
+        return node
+
+    def transform_fornode(self, node):
+        node.start_value_node = self.transform(node.start_value_node)
+        node.end_value_node = self.transform(node.end_value_node)
+        if node.step_value_node:
+            node.step_value_node = self.transform(node.step_value_node)
+        return self.transform_loop(node, ('body_node',))
+
+    def transform_whilenode(self, node):
+        return self.transform_loop(node, ('condition', 'body_node'))
+
+    def transform_funcdefnode(self, node):
+        # Note: A body runs in its own Context, whatever loop defines it
+        saved_state, self.loops, self.level = (self.loops, self.level), [], 0
+        node.body_node = self.transform(node.body_node)
+        self.loops, self.level = saved_state
+        return node
+
+
+class TailCallMarker(NodeTransformer):
+    """
+    Turns the calls a FUNC makes to its own name in tail position into
+    TailCallNodes: the value returned by RETURN, and the branches of
+    the IF whose value an arrow body returns. Runs last, as the other
+    passes only know CallNodes.
+    """
+
+    def __init__(self):
+        self.func_name = None  # Note: Name of the FUNC whose body is being rewritten
+
+    def mark(self, node):
+        """
+        Rewrites a Node whose value the FUNC returns.
+        :param node: Node in tail position.
+        :return: The Node replacing it.
+        """
+        node_type = type(node)
+        if node_type is IfNode:
+            node.cases = [(condition, expr if should_return_null else self.mark(expr), should_return_null)
+                          for condition, expr, should_return_null in node.cases]
+            if node.else_case and not node.else_case[1]:
+                node.else_case = (self.mark(node.else_case[0]), False)
+        elif node_type is CallNode and type(node.node_to_call) is VarAccessNode \
+                and node.node_to_call.var_name == self.func_name:
+            return TailCallNode(node.node_to_call, node.arg_nodes, node.start_pos, node.end_pos)
+        return node
+
+    def transform_funcdefnode(self, node):
+        saved_func_name, self.func_name = self.func_name, node.var_name
+        node.body_node = self.transform(node.body_node)
+        if node.should_auto_return and self.func_name:
+            node.body_node = self.mark(node.body_node)
+        self.func_name = saved_func_name
+        return node
+
+    def transform_returnnode(self, node):
+        self.transform_children(node)
+        if node.node_to_return and self.func_name:
+            node.node_to_return = self.mark(node.node_to_return)
+        return node
+
+
+def optimize(ast, symbol_table):
+    """
+    Runs the optimization passes over an AST.
+    :param ast: Root Node of the AST, rewritten in place.
+    :param symbol_table: Global SymbolTable the AST will run in.
+    :return: Root Node of the optimized AST.
+    """
+    global_constants = {}
+    for var_name in GLOBAL_CONSTANTS:
+        value = symbol_table.get(var_name)
+        if type(value) is Number:
+            global_constants[var_name] = value
+    try:
+        ast = ConstantFolder(global_constants).fold_program(ast)
+        ast = FunctionInliner(symbol_table).inline_program(ast)
+        ast = DeadCodeEliminator().transform(ast)
+        ast = InvariantHoister(symbol_table).transform(ast)
+        return TailCallMarker().transform(ast)
+    except RecursionError:
+        # Note: Every rewrite keeps the AST valid, an AST too deep to
+        #       finish stays partly optimized
+        return ast
@@ -9,7 +9,6 @@ class ParseResult:
         self.error = None
         self.node = None
         self.advance_count = 0
-        self.to_reverse_count = 0
         self.last_registered_advance_count = 0
 
     def register(self, result):
@@ -47,14 +46,3 @@ class ParseResult:
     def register_advancement(self):
         self.last_registered_advance_count = 1
         self.advance_count += 1
-
-    def try_register(self, result):
-        """
-        Tries to register a result instance.
-        :param result: Current ParseResult instance.
-        :return: The result of the register() call.
-        """
-        if result.error:
-            self.to_reverse_count = result.advance_count
-            return None  # Assume execution error
-        return self.register(result)
@@ -11,6 +11,28 @@ from bin.errors import InvalidSyntaxError
 from bin.nodes import *
 from bin.parse_result import ParseResult
 
+# Note: Tokens which can start an expression or a statement. The
+#       Parser looks at a single Token to decide whether another
+#       statement or a RETURN value follows, it never backtracks.
+EXPR_START_TYPES = frozenset([TP_VAR, TP_IF, TP_FOR, TP_WHILE, TP_FUNC, TP_NOT,
+                              TP_INT, TP_FLOAT, TP_STRING, TP_IDENTIFIER,
+                              TP_PLUS, TP_MINUS, TP_LPAREN, TP_LSQUARE])
+STATEMENT_START_TYPES = EXPR_START_TYPES | {TP_RETURN, TP_CONTINUE, TP_BREAK}
+
+# Note: A higher precedence binds more tightly. The operand of a
+#       prefix operator is parsed at its own precedence, so "NOT"
+#       takes a whole comparison while "-" only takes a power.
+#       New operators only need an entry in these tables.
+BINARY_PRECEDENCE = {TP_AND: 1, TP_OR: 1,
+                     TP_EE: 2, TP_NE: 2, TP_LT: 2, TP_GT: 2, TP_LTE: 2, TP_GTE: 2,
+                     TP_PLUS: 3, TP_MINUS: 3,
+                     TP_MUL: 4, TP_DIV: 4, TP_CLEAN_DIV: 4, TP_MODULO: 4,
+                     TP_POWER: 5}
+PREFIX_PRECEDENCE = {TP_NOT: 2, TP_PLUS: 5, TP_MINUS: 5}
+RIGHT_ASSOCIATIVE_TYPES = frozenset([TP_POWER])
+LEAF_NODE_TYPES = {TP_INT: NumberNode, TP_FLOAT: NumberNode,
+                   TP_STRING: StringNode, TP_IDENTIFIER: VarAccessNode}
+
 
 class Parser:
     """Represents the Parser object for Nodes."""
@@ -18,9 +40,14 @@ class Parser:
     def __init__(self, tokens):
         """
         Initializes the Parser instance.
-        :param tokens: Tokens to be parsed by the Parser.
-        """
-        self.tokens = tokens
+        :param tokens: Tokens to be parsed by the Parser, either a list
+                       or an iterator such as Lexer.generate_tokens().
+        """
+        if isinstance(tokens, list):
+            self.tokens, self.stream = tokens, None
+        else:  # Note: Tokens are pulled from the stream on demand
+            self.tokens, self.stream = [], iter(tokens)
+        self.tokens_released = 0
         self.token_idx = -1
         self.current_token = None
         self.advance()
@@ -31,8 +58,15 @@ class Parser:
         :return: Current Token instance.
         """
         self.token_idx += 1
-        if self.token_idx < len(self.tokens):
-            self.current_token = self.tokens[self.token_idx]
+        idx = self.token_idx - self.tokens_released
+        if idx >= len(self.tokens) and self.stream:
+            token = next(self.stream, None)
+            if token is None:
+                self.stream = None
+            else:
+                self.tokens.append(token)
+        if idx < len(self.tokens):
+            self.current_token = self.tokens[idx]
         return self.current_token
 
     def reverse(self, amount=1):
@@ -52,31 +86,77 @@ class Parser:
         Only performs an update when Token doesn't match the IDX of
         the list of Tokens it stores.
         """
-        if len(self.tokens) > self.token_idx >= 0:
-            self.current_token = self.tokens[self.token_idx]
+        idx = self.token_idx - self.tokens_released
+        if len(self.tokens) > idx >= 0:
+            self.current_token = self.tokens[idx]
+
+    def release(self):
+        """
+        Drops the buffered Tokens before the current Token. The Parser
+        can no longer reverse past this point afterwards. Lists of
+        Tokens are kept as they are, only streams are released.
+        """
+        if self.stream is not None:
+            del self.tokens[:self.token_idx - self.tokens_released]
+            self.tokens_released = self.token_idx
+
+    def run_rule(self, rule):
+        """
+        Runs a grammar rule. The rules of the Parser recurse on the
+        Python stack, so a rule has already run once it is called and
+        this only returns its ParseResult; see StackParser.
+        :param rule: ParseResult of the grammar rule.
+        :return: ParseResult of the rule.
+        """
+        return rule
 
     def parse(self):
         """
         Triggers the parsing of the input stream.
         :return: Parser instance.
         """
-        parser = self.statements()
+        parser = self.run_rule(self.statements())
         if not parser.error and self.current_token.type != TP_EOF:
-            return parser.failure(InvalidSyntaxError(self.current_token.start_pos,
-                                                     self.current_token.end_pos,
-                                                     'Expected "+", "-", "*", or "/"'))
+            return parser.failure(InvalidSyntaxError('Expected "+", "-", "*", or "/"',
+                                                     self.current_token.start_pos,
+                                                     self.current_token.end_pos))
         return parser
 
-    def call(self):
+    def parse_incrementally(self):
+        """
+        Parses the stream one top-level statement at a time, so that
+        only the Tokens of the current statement are kept in memory.
+        Stops after the first ParseResult holding an error.
+        :return: Generator of one ParseResult per statement.
+        """
+        while True:
+            while self.current_token.type == TP_NEWLINE:
+                self.advance()
+            if self.current_token.type == TP_EOF:
+                return
+            self.release()
+            parse_result = ParseResult()
+            statement = parse_result.register(self.run_rule(self.statement()))
+            if not parse_result.error and self.current_token.type not in (TP_NEWLINE, TP_EOF):
+                parse_result.failure(InvalidSyntaxError('Expected "+", "-", "*", or "/"',
+                                                        self.current_token.start_pos,
+                                                        self.current_token.end_pos))
+            yield parse_result if parse_result.error else parse_result.success(statement)
+            if parse_result.error:
+                return
+
+    def call(self, atom=None):
         """
         Returns a CallNode for calling functions. Also returns
         the pure atom if there are no arguments in parenthesis.
+        :param atom: Node of the atom, when it was already parsed.
         :return: CallNode for calling functions or the pure atom..
         """
         parse_result = ParseResult()
-        atom = parse_result.register(self.atom())
-        if parse_result.error:
-            return parse_result
+        if atom is None:
+            atom = parse_result.register(self.atom())
+            if parse_result.error:
+                return parse_result
         if self.current_token.type == TP_LPAREN:
             parse_result.register_advancement()
             self.advance()
@@ -117,19 +197,19 @@ class Parser:
         if token.type in (TP_INT, TP_FLOAT):
             parse_result.register_advancement()
             self.advance()
-            return parse_result.success(NumberNode(token))
+            return parse_result.success(NumberNode(token.value, token.start_pos, token.end_pos))
 
         # Parse all strings
         elif token.type == TP_STRING:
             parse_result.register_advancement()
             self.advance()
-            return parse_result.success(StringNode(token))
+            return parse_result.success(StringNode(token.value, token.start_pos, token.end_pos))
 
         # Parse all possible identifiers
         elif token.type == TP_IDENTIFIER:
             parse_result.register_advancement()
             self.advance()
-            return parse_result.success(VarAccessNode(token))
+            return parse_result.success(VarAccessNode(token.value, token.start_pos, token.end_pos))
 
         # Parse all grouped expressions
         elif token.type == TP_LPAREN:
@@ -156,26 +236,26 @@ class Parser:
             return parse_result.success(list_expr)
 
         # Parse all if-statements
-        elif token.matches(TP_KEYWORD, 'IF'):
+        elif token.type == TP_IF:
             if_expr = parse_result.register(self.if_expr())
             if parse_result.error:
                 return parse_result
             return parse_result.success(if_expr)
 
         # Parse for- and while-loops
-        elif token.matches(TP_KEYWORD, 'FOR'):
+        elif token.type == TP_FOR:
             for_expr = parse_result.register(self.for_expr())
             if parse_result.error:
                 return parse_result
             return parse_result.success(for_expr)
-        elif token.matches(TP_KEYWORD, 'WHILE'):
+        elif token.type == TP_WHILE:
             while_expr = parse_result.register(self.while_expr())
             if parse_result.error:
                 return parse_result
             return parse_result.success(while_expr)
 
         # Parse all function definitions
-        elif token.matches(TP_KEYWORD, 'FUNC'):
+        elif token.type == TP_FUNC:
             func_def = parse_result.register(self.func_def())
             if parse_result.error:
                 return parse_result
@@ -192,11 +272,13 @@ class Parser:
     def statements(self):
         """
         Parse all lists of statements separated by newlines.
-        :return:
+        The list ends at the first Token after a newline which
+        cannot start a statement, without parsing ahead.
+        :return: ListNode of all statements.
         """
         parse_result = ParseResult()
-        statements, more_statements = [], True
-        start_pos = self.current_token.start_pos.copy()
+        statements = []
+        start_pos = self.current_token.start_pos
         while self.current_token.type == TP_NEWLINE:
             parse_result.register_advancement()
             self.advance()
@@ -204,29 +286,19 @@ class Parser:
         if parse_result.error:
             return parse_result
         statements.append(statement)
-        while True:
-            newline_count = 0
-            while self.current_token.type == TP_NEWLINE:
-                parse_result.register_advancement()
-                self.advance()
-                newline_count += 1
-            if newline_count == 0:
-                more_statements = False
-            if not more_statements:
-                # Note: Could break in the if-statement
-                #       above, but we'd run into trouble on
-                #       subsequent loops. Unless the following
-                #       statement also lacks newlines, the loop
-                #       would never terminate.
-                break
-            statement = parse_result.try_register(self.statement())
-            if not statement:
-                self.reverse(parse_result.to_reverse_count)
-                more_statements = False
+        while self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+            if self.current_token.type == TP_NEWLINE:
                 continue
+            if self.current_token.type not in STATEMENT_START_TYPES:
+                break  # Note: END, ELSE, ELIF or EOF closes the list
+            statement = parse_result.register(self.statement())
+            if parse_result.error:
+                return parse_result
             statements.append(statement)
         return parse_result.success(
-            ListNode(statements, start_pos, self.current_token.end_pos.copy()))
+            ListNode(statements, start_pos, self.current_token.end_pos))
 
     def statement(self):
         """
@@ -234,25 +306,27 @@ class Parser:
         :return: An expression in the grammar.
         """
         parse_result = ParseResult()
-        start_pos = self.current_token.start_pos.copy()
-        if self.current_token.matches(TP_KEYWORD, 'RETURN'):
+        start_pos = self.current_token.start_pos
+        if self.current_token.type == TP_RETURN:
             parse_result.register_advancement()
             self.advance()
-            expr = parse_result.try_register(self.expr())
-            if not expr:
-                self.reverse(parse_result.to_reverse_count)
+            expr = None
+            if self.current_token.type in EXPR_START_TYPES:
+                expr = parse_result.register(self.expr())
+                if parse_result.error:
+                    return parse_result
             return parse_result.success(
-                ReturnNode(expr, start_pos, self.current_token.start_pos.copy()))
-        if self.current_token.matches(TP_KEYWORD, 'CONTINUE'):
+                ReturnNode(expr, start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_CONTINUE:
             parse_result.register_advancement()
             self.advance()
             return parse_result.success(
-                ContinueNode(start_pos, self.current_token.start_pos.copy()))
-        if self.current_token.matches(TP_KEYWORD, 'BREAK'):
+                ContinueNode(start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_BREAK:
             parse_result.register_advancement()
             self.advance()
             return parse_result.success(
-                BreakNode(start_pos, self.current_token.start_pos.copy()))
+                BreakNode(start_pos, self.current_token.start_pos))
         expr = parse_result.register(self.expr())
         if parse_result.error:
             return parse_result.failure(InvalidSyntaxError(
@@ -261,56 +335,13 @@ class Parser:
                 self.current_token.start_pos, self.current_token.end_pos))
         return parse_result.success(expr)
 
-    def factor(self):
-        """
-        Implements the FACTOR grammar.
-        :return: The Node of the numeral Token.
-        """
-        token = self.current_token
-        parse_result = ParseResult()
-        if token.type in [TP_PLUS, TP_MINUS]:
-            parse_result.register_advancement()
-            self.advance()
-            factor = parse_result.register(self.factor())
-            if parse_result.error:
-                return parse_result
-            return parse_result.success(UnaryOpNode(token, factor))
-        return self.power()
-
-    def comparison_expr(self):
-        """
-        Implements the comparison expression grammar.
-        :return: Node with the result of the comparison operation.
-        """
-        parse_result = ParseResult()
-        if self.current_token.matches(TP_KEYWORD, 'NOT'):
-            op_token = self.current_token
-            parse_result.register_advancement()
-            self.advance()
-            node = parse_result.register(self.comparison_expr())
-            if parse_result.error:
-                return parse_result
-            return parse_result.success(UnaryOpNode(op_token, node))
-        node = parse_result.register(self.binary_operation(self.arithmetic_expr, [TP_EE,
-                                                                                  TP_NE,
-                                                                                  TP_LT,
-                                                                                  TP_GT,
-                                                                                  TP_LTE,
-                                                                                  TP_GTE]))
-        if parse_result.error:
-            return parse_result.failure(InvalidSyntaxError(
-                "Expected int, float, identifier, '+', '-', '(', or 'NOT'",
-                self.current_token.start_pos,
-                self.current_token.end_pos))
-        return parse_result.success(node)
-
     def expr(self):
         """
         Implements the EXPR grammar for variables.
         :return: BinOpNode of all possible TERM objects.
         """
         parse_result = ParseResult()
-        if self.current_token.matches(TP_KEYWORD, 'VAR'):
+        if self.current_token.type == TP_VAR:
             parse_result.register_advancement()
             self.advance()
             if self.current_token.type != TP_IDENTIFIER:
@@ -327,9 +358,8 @@ class Parser:
             expression = parse_result.register(self.expr())
             if parse_result.error:
                 return parse_result
-            return parse_result.success(VarAssignNode(var_name, expression))
-        node = parse_result.register(self.binary_operation(self.comparison_expr,
-                                                           [(TP_KEYWORD, 'AND'), (TP_KEYWORD, 'OR')]))
+            return parse_result.success(VarAssignNode(var_name.value, expression, var_name.start_pos))
+        node = parse_result.register(self.operation())
         if parse_result.error:
             return parse_result.failure(InvalidSyntaxError('Expected VAR or mathematical operator',
                                                            self.current_token.start_pos,
@@ -342,15 +372,17 @@ class Parser:
         :return: FuncDefNode with the function definition.
         """
         parse_result = ParseResult()
-        if not self.current_token.matches(TP_KEYWORD, 'FUNC'):
+        if self.current_token.type != TP_FUNC:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'FUNC'",
                 self.current_token.start_pos,
                 self.current_token.end_pos))
         parse_result.register_advancement()
         self.advance()
+        start_pos = None
         if self.current_token.type == TP_IDENTIFIER:
-            var_name_tok = self.current_token
+            var_name = self.current_token.value
+            start_pos = self.current_token.start_pos
             parse_result.register_advancement()
             self.advance()
             if self.current_token.type != TP_LPAREN:
@@ -359,7 +391,7 @@ class Parser:
                     self.current_token.start_pos,
                     self.current_token.end_pos))
         else:
-            var_name_tok = None
+            var_name = None
             if self.current_token.type != TP_LPAREN:
                 return parse_result.failure(InvalidSyntaxError(
                     "Expected identifier or '('",
@@ -367,9 +399,11 @@ class Parser:
                     self.current_token.end_pos))
         parse_result.register_advancement()
         self.advance()
-        arg_name_tokens = []
+        arg_names = []
         if self.current_token.type == TP_IDENTIFIER:
-            arg_name_tokens.append(self.current_token)
+            arg_names.append(self.current_token.value)
+            if start_pos is None:
+                start_pos = self.current_token.start_pos
             parse_result.register_advancement()
             self.advance()
             while self.current_token.type == TP_COMMA:
@@ -380,7 +414,7 @@ class Parser:
                         "Expected identifier",
                         self.current_token.start_pos,
                         self.current_token.end_pos))
-                arg_name_tokens.append(self.current_token)
+                arg_names.append(self.current_token.value)
                 parse_result.register_advancement()
                 self.advance()
             if self.current_token.type != TP_RPAREN:
@@ -403,7 +437,7 @@ class Parser:
             if parse_result.error:
                 return parse_result
             return parse_result.success(
-                FuncDefNode(var_name_tok, arg_name_tokens, body, True))
+                FuncDefNode(var_name, arg_names, body, True, start_pos))
         if self.current_token.type != TP_NEWLINE:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected '->' or NEWLINE",
@@ -415,7 +449,7 @@ class Parser:
         body = parse_result.register(self.statements())
         if parse_result.error:
             return parse_result
-        if not self.current_token.matches(TP_KEYWORD, 'END'):
+        if self.current_token.type != TP_END:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'END'",
                 self.current_token.start_pos,
@@ -423,7 +457,7 @@ class Parser:
         parse_result.register_advancement()
         self.advance()
         return parse_result.success(
-            FuncDefNode(var_name_tok, arg_name_tokens, body, False))
+            FuncDefNode(var_name, arg_names, body, False, start_pos))
 
     def list_expr(self):
         """
@@ -432,7 +466,7 @@ class Parser:
         """
         element_nodes = []
         parse_result = ParseResult()
-        start_pos = self.current_token.start_pos.copy()
+        start_pos = self.current_token.start_pos
         if self.current_token.type != TP_LSQUARE:
             return parse_result.failure(InvalidSyntaxError('Expected "["',
                                                            self.current_token.start_pos,
@@ -460,66 +494,58 @@ class Parser:
                                                                self.current_token.end_pos))
             parse_result.register_advancement()
             self.advance()
-        return parse_result.success(ListNode(element_nodes, start_pos, self.current_token.end_pos.copy()))
+        return parse_result.success(ListNode(element_nodes, start_pos, self.current_token.end_pos))
 
     ################################
     # ALL BINARY OPERATION PARSERS #
     ################################
 
-    def binary_operation(self, func_a, ops, func_b=None):
+    def operation(self, min_precedence=1):
         """
-        Generic binary operation handling for all
-        multi-term grammars and their factors.
-        :param func_a: Function which returns a factor.
-        :param ops: Possible operations that can be handled.
-        :param func_b: Optional second function.
-        :return: Node of all possible TERM factors.
+        Parses unary and binary operations by precedence climbing.
+        Only operators binding at least as tightly as the minimum
+        precedence are consumed, see BINARY_PRECEDENCE.
+        :param min_precedence: Lowest precedence this call may consume.
+        :return: Node of the operation, or the pure call or atom.
         """
-        if not func_b:
-            func_b = func_a
         parse_result = ParseResult()
-        left_factor = parse_result.register(func_a())
-        if parse_result.error:
-            return parse_result
-        while self.current_token.type in ops or \
-                (self.current_token.type, self.current_token.value) in ops:
+        token = self.current_token
+        precedence = PREFIX_PRECEDENCE.get(token.type)
+        if precedence is not None and precedence >= min_precedence:
+            parse_result.register_advancement()
+            self.advance()
+            operand = parse_result.register(self.operation(precedence))
+            if parse_result.error:
+                return parse_result
+            left_node = UnaryOpNode(token.type, operand, token.start_pos)
+        elif token.type in LEAF_NODE_TYPES:
+            # Note: Literals and names are by far the most common
+            #       operands, they skip the call and atom rules
+            parse_result.register_advancement()
+            self.advance()
+            left_node = LEAF_NODE_TYPES[token.type](token.value, token.start_pos, token.end_pos)
+            if self.current_token.type == TP_LPAREN:
+                left_node = parse_result.register(self.call(left_node))
+                if parse_result.error:
+                    return parse_result
+        else:
+            left_node = parse_result.register(self.call())
+            if parse_result.error:
+                return parse_result
+        while True:
             op_token = self.current_token
+            precedence = BINARY_PRECEDENCE.get(op_token.type)
+            if precedence is None or precedence < min_precedence:
+                break
             parse_result.register_advancement()
             self.advance()
-            right_factor = parse_result.register(func_b())
+            if op_token.type not in RIGHT_ASSOCIATIVE_TYPES:
+                precedence += 1
+            right_node = parse_result.register(self.operation(precedence))
             if parse_result.error:
                 return parse_result
-            left_factor = BinOpNode(left_factor, op_token, right_factor)
-        return parse_result.success(left_factor)
-
-    def power(self):
-        """
-        Executes the power operation.
-        :return: BinOpNode from the resulting operation.
-        """
-        return self.binary_operation(self.call, [TP_POWER], self.factor)
-
-    def term(self):
-        """
-        Implements the TERM grammar.
-        :return: BinOpNode of all possible FACTOR objects.
-        """
-        return self.binary_operation(self.factor, [TP_MUL,
-                                                   TP_DIV,
-                                                   TP_POWER,
-                                                   TP_CLEAN_DIV,
-                                                   TP_MODULO])
-
-    def arithmetic_expr(self):
-        """
-        Implements the grammar for the arithmetic expression.
-        :return: Node of the result of the arithmetic expression.
-        """
-        return self.binary_operation(self.term, [TP_PLUS, TP_MINUS])
-
-    ################################
-    # ALL CONTROL FLOW EXPRESSIONS #
-    ################################
+            left_node = BinOpNode(left_node, op_token.type, right_node)
+        return parse_result.success(left_node)
 
     def if_expr(self):
         """
@@ -548,7 +574,7 @@ class Parser:
         """
         else_case = None
         parse_result = ParseResult()
-        if self.current_token.matches(TP_KEYWORD, 'ELSE'):
+        if self.current_token.type == TP_ELSE:
             parse_result.register_advancement()
             self.advance()
             if self.current_token.type == TP_NEWLINE:
@@ -558,7 +584,7 @@ class Parser:
                 if parse_result.error:
                     return parse_result
                 else_case = (statements, True)
-                if self.current_token.matches(TP_KEYWORD, 'END'):
+                if self.current_token.type == TP_END:
                     parse_result.register_advancement()
                     self.advance()
                 else:
@@ -580,7 +606,7 @@ class Parser:
         """
         cases, else_case = [], None
         parse_result = ParseResult()
-        if self.current_token.matches(TP_KEYWORD, 'ELIF'):
+        if self.current_token.type == TP_ELIF:
             all_cases = parse_result.register(self.if_expr_b())
             if parse_result.error:
                 return parse_result
@@ -599,7 +625,7 @@ class Parser:
         """
         cases, else_case = [], None
         parse_result = ParseResult()
-        if not self.current_token.matches(TP_KEYWORD, case_keyword):
+        if self.current_token.type != KEYWORDS[case_keyword]:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected '{}'".format(case_keyword),
                 self.current_token.start_pos,
@@ -609,9 +635,9 @@ class Parser:
         condition = parse_result.register(self.expr())
         if parse_result.error:
             return parse_result
-        if not self.current_token.matches(TP_KEYWORD, 'THEN'):
+        if self.current_token.type != TP_THEN:
             return parse_result.failure(InvalidSyntaxError(
-                f"Expected 'THEN'",
+                "Expected 'THEN'",
                 self.current_token.start_pos,
                 self.current_token.end_pos))
         parse_result.register_advancement()
@@ -623,7 +649,7 @@ class Parser:
             if parse_result.error:
                 return parse_result
             cases.append((condition, statements, True))
-            if self.current_token.matches(TP_KEYWORD, 'END'):
+            if self.current_token.type == TP_END:
                 parse_result.register_advancement()
                 self.advance()
             else:
@@ -650,7 +676,7 @@ class Parser:
         :return: ForNode with the for-loop expression.
         """
         parse_result = ParseResult()
-        if not self.current_token.matches(TP_KEYWORD, 'FOR'):
+        if self.current_token.type != TP_FOR:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'FOR'",
                 self.current_token.start_pos,
@@ -675,7 +701,7 @@ class Parser:
         start_value = parse_result.register(self.expr())
         if parse_result.error:
             return parse_result
-        if not self.current_token.matches(TP_KEYWORD, 'TO'):
+        if self.current_token.type != TP_TO:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'TO'",
                 self.current_token.start_pos, self.current_token.end_pos))
@@ -684,7 +710,7 @@ class Parser:
         end_value = parse_result.register(self.expr())
         if parse_result.error:
             return parse_result
-        if self.current_token.matches(TP_KEYWORD, 'STEP'):
+        if self.current_token.type == TP_STEP:
             parse_result.register_advancement()
             self.advance()
             step_value = parse_result.register(self.expr())
@@ -692,7 +718,7 @@ class Parser:
                 return parse_result
         else:
             step_value = None
-        if not self.current_token.matches(TP_KEYWORD, 'THEN'):
+        if self.current_token.type != TP_THEN:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'THEN'",
                 self.current_token.start_pos, self.current_token.end_pos))
@@ -704,19 +730,19 @@ class Parser:
             body = parse_result.register(self.statements())
             if parse_result.error:
                 return parse_result
-            if not self.current_token.matches(TP_KEYWORD, 'END'):
+            if self.current_token.type != TP_END:
                 return parse_result.failure(InvalidSyntaxError(
                     "Expected 'END'",
                     self.current_token.start_pos, self.current_token.end_pos))
             parse_result.register_advancement()
             self.advance()
             return parse_result.success(
-                ForNode(var_name, start_value, end_value, step_value, body, True))
+                ForNode(var_name.value, start_value, end_value, step_value, body, True, var_name.start_pos))
         body = parse_result.register(self.statement())
         if parse_result.error:
             return parse_result
         return parse_result.success(
-            ForNode(var_name, start_value, end_value, step_value, body, False))
+            ForNode(var_name.value, start_value, end_value, step_value, body, False, var_name.start_pos))
 
     def while_expr(self):
         """
@@ -724,7 +750,7 @@ class Parser:
         :return: WhileNode with all conditions of the while-loop.
         """
         parse_result = ParseResult()
-        if not self.current_token.matches(TP_KEYWORD, 'WHILE'):
+        if self.current_token.type != TP_WHILE:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'WHILE'",
                 self.current_token.start_pos,
@@ -734,7 +760,7 @@ class Parser:
         condition = parse_result.register(self.expr())
         if parse_result.error:
             return parse_result
-        if not self.current_token.matches(TP_KEYWORD, 'THEN'):
+        if self.current_token.type != TP_THEN:
             return parse_result.failure(InvalidSyntaxError(
                 "Expected 'THEN'",
                 self.current_token.start_pos,
@@ -747,7 +773,7 @@ class Parser:
             body = parse_result.register(self.statements())
             if parse_result.error:
                 return parse_result
-            if not self.current_token.matches(TP_KEYWORD, 'END'):
+            if self.current_token.type != TP_END:
                 return parse_result.failure(InvalidSyntaxError(
                     "Expected 'END'",
                     self.current_token.start_pos,
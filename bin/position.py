@@ -3,7 +3,10 @@
 
 
 class Position:
-    """Represents the position of streamed text."""
+    """
+    Represents the resolved position of streamed text.
+    Only created on demand from an offset, see bin/source.py.
+    """
 
     def __init__(self, idx, ln, col, fn, ftxt):
         """
@@ -19,24 +22,3 @@ class Position:
         self.col = col
         self.fn = fn
         self.ftxt = ftxt
-
-    def advance(self, current_char=None):
-        """
-        Advance the position of the stream.
-        :param current_char: Current char in the stream.
-        """
-        self.idx += 1
-        self.col += 1
-        if current_char == '\n':
-            self.ln += 1
-            self.col = 0
-        return self
-
-    def copy(self):
-        """
-        Deep-copy the Position instance.
-        New Position instance is made and stored whenever an illegal
-        character is encountered. This is so that the error can be more
-        easily traceable (this will, however expend more memory).
-        """
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
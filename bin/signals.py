@@ -0,0 +1,102 @@
+# coding=utf-8
+"""
+Represents the internal signals of the compiled backends.
+Errors, RETURN, BREAK and CONTINUE are rare, so instead of checking
+a RuntimeResult after every Node, compiled code returns plain values
+and raises one of these signals. They never reach the user: they are
+turned back into a RuntimeResult where the backend hands over.
+"""
+
+from bin.runtime_result import RuntimeResult
+
+
+class RuntimeSignal(Exception):
+    """Superclass of all internal signals."""
+
+
+class ErrorSignal(RuntimeSignal):
+    """Carries an Error out of compiled code."""
+
+    def __init__(self, error):
+        """
+        Initializes an ErrorSignal instance.
+        :param error: Error instance being raised.
+        """
+        super().__init__()
+        self.error = error
+
+
+class ReturnSignal(RuntimeSignal):
+    """Carries the value of a RETURN to the enclosing Function."""
+
+    def __init__(self, value):
+        """
+        Initializes a ReturnSignal instance.
+        :param value: Value being returned.
+        """
+        super().__init__()
+        self.value = value
+
+
+class TailCallSignal(RuntimeSignal):
+    """Carries a self-recursive tail call to the Function it reruns."""
+
+    def __init__(self, function, args, node):
+        """
+        Initializes a TailCallSignal instance.
+        :param function: Function being called.
+        :param args: Arguments being passed into the Function.
+        :param node: The TailCallNode instance.
+        """
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.node = node
+
+
+class BreakSignal(RuntimeSignal):
+    """Stops the enclosing loop."""
+
+
+class ContinueSignal(RuntimeSignal):
+    """Skips to the next iteration of the enclosing loop."""
+
+
+def unwrap(result):
+    """
+    Turns the RuntimeResult of an interpreted call into a value,
+    raising the signal matching its flags.
+    :param result: RuntimeResult, or a plain value as built-ins return.
+    :return: Value of the result.
+    """
+    if not isinstance(result, RuntimeResult):
+        return result
+    if result.error:
+        raise ErrorSignal(result.error)
+    if result.func_return_value:
+        raise ReturnSignal(result.func_return_value)
+    if result.loop_should_continue:
+        raise ContinueSignal()
+    if result.loop_should_break:
+        raise BreakSignal()
+    return result.value
+
+
+def capture(function, *args):
+    """
+    Calls compiled code, turning its signals back into a RuntimeResult.
+    :param function: Compiled code to call.
+    :param args: Arguments of the code.
+    :return: RuntimeResult with the value or the signal of the code.
+    """
+    runtime_result = RuntimeResult()
+    try:
+        return runtime_result.success(function(*args))
+    except ErrorSignal as signal:
+        return runtime_result.failure(signal.error)
+    except ReturnSignal as signal:
+        return runtime_result.success_return(signal.value)
+    except ContinueSignal:
+        return runtime_result.success_continue()
+    except BreakSignal:
+        return runtime_result.success_break()
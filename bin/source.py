@@ -0,0 +1,142 @@
+# coding=utf-8
+"""
+Represents the Source of a stream and the registry of all Sources.
+Tokens, Nodes, Values and Errors only store plain integer offsets.
+Every offset carries the index of its Source in its high bits, so a
+single int is enough to find the file, the line and the column again
+once an error actually needs to be printed.
+The registry only holds weak references. A Source stays registered
+while it is among the most recent ones, while a Function defined in
+it or an Error pointing into it is alive, and while its AST runs.
+"""
+
+import weakref
+from bisect import bisect_right
+from collections import deque
+
+from bin.position import Position
+
+SOURCE_SHIFT = 32
+OFFSET_MASK = (1 << SOURCE_SHIFT) - 1
+
+# Note: Sources kept alive after their Lexer is gone, which covers the
+#       AST of a run between parsing and interpreting it
+MAX_RECENT_SOURCES = 16
+
+
+class Source:
+    """The text of one stream and its index of line starts."""
+
+    # Note: Index 0 is never used so that no offset is ever 0
+    registry = weakref.WeakValueDictionary()
+    recent = deque(maxlen=MAX_RECENT_SOURCES)
+    count = 0
+
+    def __init__(self, fn, text):
+        """
+        Creates a Source and registers it.
+        :param fn: File name of the stream.
+        :param text: Full text of the stream.
+        """
+        self.fn = fn
+        self.text = text
+        self.line_starts = None
+        Source.count += 1
+        self.base = Source.count << SOURCE_SHIFT
+        Source.registry[Source.count] = self
+        Source.recent.append(self)
+
+    def get_line_starts(self):
+        """
+        Builds the index of line starts the first time it is needed.
+        :return: Sorted list with the index of the first character of every line.
+        """
+        if self.line_starts is None:
+            text, line_starts = self.text, [0]
+            idx = text.find('\n')
+            while idx >= 0:
+                line_starts.append(idx + 1)
+                idx = text.find('\n', idx + 1)
+            self.line_starts = line_starts
+        return self.line_starts
+
+    def position(self, idx):
+        """
+        Resolves an index of the text to its line and column.
+        :param idx: Index in the text, relative to the Source.
+        :return: Position instance for the index.
+        """
+        line_starts = self.get_line_starts()
+        ln = bisect_right(line_starts, idx) - 1
+        return Position(idx, ln, idx - line_starts[ln], self.fn, self.text)
+
+
+class StreamSource(Source):
+    """
+    Source of a stream which is lexed chunk by chunk. It keeps the
+    chunks it was lexed from, which are only joined when an error is
+    printed, so errors show the text which ran even if the file on
+    disk has changed since.
+    """
+
+    def __init__(self, fn):
+        """
+        Creates a StreamSource and registers it.
+        :param fn: File name of the stream.
+        """
+        super().__init__(fn, None)
+        self.chunks = []
+
+    def add_chunk(self, chunk):
+        """
+        Keeps a chunk of the stream.
+        :param chunk: Text read from the stream.
+        """
+        if chunk:
+            self.chunks.append(chunk)
+            self.text, self.line_starts = None, None
+
+    def position(self, idx):
+        """
+        Resolves an index of the stream to its line and column.
+        :param idx: Index in the stream, relative to the Source.
+        :return: Position instance for the index.
+        """
+        if self.text is None:
+            self.text = ''.join(self.chunks)
+        return super().position(idx)
+
+
+def get_source(offset):
+    """
+    Finds the Source of an offset, if it is still registered.
+    :param offset: Offset produced by the Lexer, or None.
+    :return: Source instance of the offset, None if it is unknown.
+    """
+    return Source.registry.get(offset >> SOURCE_SHIFT) if offset else None
+
+
+def resolve_position(offset):
+    """
+    Resolves the offset of the first character of a span.
+    :param offset: Offset produced by the Lexer.
+    :return: Position instance of the character.
+    """
+    source = get_source(offset)
+    if source is None:  # Note: Nothing from its stream is alive anymore
+        return Position(offset & OFFSET_MASK, 0, 0, '<unknown>', '')
+    return source.position(offset & OFFSET_MASK)
+
+
+def resolve_end_position(offset):
+    """
+    Resolves the exclusive end offset of a span. The end stays on
+    the line of the last character of the span, even when that
+    character is a newline.
+    :param offset: Offset right after the last character of the span.
+    :return: Position instance one column after the last character.
+    """
+    position = resolve_position(offset - 1)
+    position.idx += 1
+    position.col += 1
+    return position
@@ -0,0 +1,253 @@
+# coding=utf-8
+"""
+Represents the explicit-stack mode of the Interpreter.
+Every visit_ method of a Node with children is a generator. It
+yields the (Node, Context) pairs it needs evaluated and receives
+their RuntimeResult back, instead of calling visit() itself. Calls
+to SimpleScript Functions are evaluated the same way, so neither
+nesting nor recursion depth is limited by the Python stack.
+"""
+
+from types import GeneratorType
+
+from bin.inlining import add_inlined_frame
+from bin.interpreter import SHORT_CIRCUITS, Function, Interpreter
+from bin.invariants import load_invariant, store_invariant
+from bin.list import List
+from bin.number import Number, make_number
+from bin.runtime_result import RuntimeResult
+from bin.signals import capture
+
+
+class StackInterpreter(Interpreter):
+    """Interpreter which evaluates Nodes on an explicit stack."""
+
+    def visit(self, node, context):
+        """
+        Evaluates a Node, driving the generators of all visit_ methods.
+        :param node: Node we wish to visit.
+        :param context: Context of the caller.
+        :return: The RuntimeResult of the Node.
+        """
+        stack, sent = [], None
+        result = self.start(node, context)
+        while True:
+            if isinstance(result, RuntimeResult):
+                if not stack:
+                    return result
+                sent = result
+            else:  # Note: A generator waiting for its children
+                stack.append(result)
+                sent = None
+            try:
+                result = self.start(*stack[-1].send(sent))
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+
+    def start(self, node, context):
+        """
+        Starts the visit_ method of a Node.
+        :param node: Node we wish to visit.
+        :param context: Context of the caller.
+        :return: A RuntimeResult for leaves, otherwise a generator.
+        """
+        # Note: Leaves are visited by the Interpreter methods, which return
+        #       plain Values and raise signals, so they are captured here.
+        result = capture(self.visit_methods.get(type(node), Interpreter.no_visit_method), self, node, context)
+        return result.value if type(result.value) is GeneratorType else result
+
+    ##################################################
+    # Leaves are visited by the Interpreter methods, #
+    # only Nodes with children are redefined here.   #
+    ##################################################
+
+    def visit_binopnode(self, node, context):
+        runtime_result = RuntimeResult()
+        left_node = runtime_result.register((yield node.left_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        deciding = SHORT_CIRCUITS.get(node.op_type)
+        if deciding is not None and type(left_node) is Number and left_node.is_true() is deciding:
+            return runtime_result.success(Number.true if deciding else Number.false)
+        right_node = runtime_result.register((yield node.right_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        return capture(self.apply_binary_operation, node, left_node, right_node, context)
+
+    def visit_unaryopnode(self, node, context):
+        runtime_result = RuntimeResult()
+        number = runtime_result.register((yield node.right_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        return capture(self.apply_unary_operation, node, number, context)
+
+    def visit_varassignnode(self, node, context):
+        runtime_result = RuntimeResult()
+        var_value = runtime_result.register((yield node.value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        context.symbol_table.set(node.var_name, var_value)
+        return runtime_result.success(var_value)
+
+    def visit_ifnode(self, node, context):
+        runtime_result = RuntimeResult()
+        for condition, expr, should_return_null in node.cases:
+            condition_value = runtime_result.register((yield condition, context))
+            if runtime_result.should_return():
+                return runtime_result
+            if condition_value.is_true():
+                expr_value = runtime_result.register((yield expr, context))
+                if runtime_result.should_return():
+                    return runtime_result
+                return runtime_result.success(Number.null if should_return_null else expr_value)
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            expr_value = runtime_result.register((yield expr, context))
+            if runtime_result.should_return():
+                return runtime_result
+            return runtime_result.success(Number.null if should_return_null else expr_value)
+        return runtime_result.success(Number.null)
+
+    def visit_fornode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        start_value = runtime_result.register((yield node.start_value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        end_value = runtime_result.register((yield node.end_value_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        if node.step_value_node:
+            step_value = runtime_result.register((yield node.step_value_node, context))
+            if runtime_result.should_return():
+                return runtime_result
+        else:  # Default to one iteration
+            step_value = make_number(1)
+        index = start_value.value
+        while index < end_value.value if step_value.value >= 0 else index > end_value.value:
+            context.symbol_table.set(node.var_name, make_number(index))
+            index += step_value.value
+            current_value = runtime_result.register((yield node.body_node, context))
+            if runtime_result.should_return() \
+                    and runtime_result.loop_should_continue is False \
+                    and runtime_result.loop_should_break is False:
+                return runtime_result
+            if runtime_result.loop_should_continue:
+                continue
+            if runtime_result.loop_should_break:
+                break
+            if not node.should_return_null:  # Note: Set by the optimizer when the List is unused
+                elements.append(current_value)
+        return runtime_result.success(Number.null if node.should_return_null else List(elements))
+
+    def visit_whilenode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        while True:
+            condition = runtime_result.register((yield node.condition, context))
+            if runtime_result.should_return():
+                return runtime_result
+            if not condition.is_true():
+                break
+            current_value = runtime_result.register((yield node.body_node, context))
+            if runtime_result.should_return() \
+                    and runtime_result.loop_should_continue is False \
+                    and runtime_result.loop_should_break is False:
+                return runtime_result
+            if runtime_result.loop_should_continue:
+                continue
+            if runtime_result.loop_should_break:
+                break
+            if not node.should_return_null:  # Note: Set by the optimizer when the List is unused
+                elements.append(current_value)
+        return runtime_result.success(Number.null if node.should_return_null else List(elements))
+
+    def visit_callnode(self, node, context):
+        args = []
+        runtime_result = RuntimeResult()
+        value_to_call = runtime_result.register((yield node.node_to_call, context))
+        if runtime_result.should_return():
+            return runtime_result
+        for arg_node in node.arg_nodes:
+            args.append(runtime_result.register((yield arg_node, context)))
+            if runtime_result.should_return():
+                return runtime_result
+        if isinstance(value_to_call, Function):
+            call_result = yield from self.execute_function(value_to_call, args, node, context)
+        else:  # Note: Built-in functions never evaluate Nodes
+            call_result = value_to_call.execute(args, context, node.start_pos, node.end_pos)
+        return_value = runtime_result.register(call_result)
+        if runtime_result.should_return():
+            return runtime_result
+        return runtime_result.success(return_value)
+
+    # Note: Calls do not grow the Python stack here, tail calls are plain calls
+    visit_tailcallnode = visit_callnode
+
+    def execute_function(self, function, args, node, context):
+        """
+        Executes a Function instance, like Function.execute(), but
+        evaluates its body on the explicit stack.
+        :param function: Function being called.
+        :param args: Arguments being passed into the Function.
+        :param node: The CallNode instance.
+        :param context: Context of the caller.
+        :return: Value of the executed Function.
+        """
+        runtime_result = RuntimeResult()
+        exec_context = function.generate_new_context(context, node.start_pos, node.end_pos)
+        runtime_result.register(function.check_and_populate_args(function.arg_names, args, exec_context))
+        if runtime_result.should_return():
+            return runtime_result
+        value = runtime_result.register((yield function.body_node, exec_context))
+        if runtime_result.should_return() and runtime_result.func_return_value is None:
+            return runtime_result
+        return_value \
+            = (value if function.should_auto_return else None) or runtime_result.func_return_value or Number.null
+        return runtime_result.success(return_value)
+
+    def visit_listnode(self, node, context):
+        elements = []
+        runtime_result = RuntimeResult()
+        for element_node in node.element_nodes:
+            elements.append(runtime_result.register((yield element_node, context)))
+            if runtime_result.should_return():
+                return runtime_result
+        return runtime_result.success(List(elements))
+
+    def visit_returnnode(self, node, context):
+        runtime_result = RuntimeResult()
+        if node.node_to_return:
+            value = runtime_result.register((yield node.node_to_return, context))
+            if runtime_result.should_return():
+                return runtime_result
+        else:
+            value = Number.null
+        return runtime_result.success_return(value)
+
+    def visit_invariantnode(self, node, context):
+        value = load_invariant(node, context)
+        if value is not None:
+            return RuntimeResult().success(value)
+        runtime_result = RuntimeResult()
+        value = runtime_result.register((yield node.expr_node, context))
+        if runtime_result.should_return():
+            return runtime_result
+        store_invariant(node, context, value)
+        return runtime_result.success(value)
+
+    def visit_inlinedcallnode(self, node, context):
+        runtime_result = RuntimeResult()
+        symbols = context.symbol_table.symbols
+        for var_name, arg_node in zip(node.var_names, node.arg_nodes):
+            symbols[var_name] = runtime_result.register((yield arg_node, context))
+            if runtime_result.should_return():
+                return runtime_result
+        return_value = runtime_result.register((yield node.body_node, context))
+        if runtime_result.error:
+            add_inlined_frame(runtime_result.error, node, context)
+            return runtime_result
+        for var_name in node.var_names:
+            del symbols[var_name]
+        return runtime_result.success(return_value)
@@ -0,0 +1,617 @@
+# coding=utf-8
+"""
+Represents the explicit-stack mode of the Parser.
+Every grammar rule is a generator. It yields the rules it depends on
+and receives their ParseResult back, instead of calling them itself,
+so the depth of nesting it accepts is only limited by memory. The
+generators make it slower than the Parser, which is used first; see
+simplescript.parse() for the fallback on inputs nested too deeply.
+"""
+
+from bin.constants import *
+from bin.errors import InvalidSyntaxError
+from bin.nodes import *
+from bin.parse_result import ParseResult
+from bin.parser import (BINARY_PRECEDENCE, EXPR_START_TYPES, LEAF_NODE_TYPES, PREFIX_PRECEDENCE,
+                        RIGHT_ASSOCIATIVE_TYPES, STATEMENT_START_TYPES, Parser)
+
+
+class StackParser(Parser):
+    """Parser which runs its grammar rules on an explicit stack."""
+
+    def run_rule(self, rule):
+        """
+        Runs a grammar rule on an explicit stack instead of the Python
+        stack. Every rule is a generator which yields the rules it
+        depends on and receives their ParseResult back, so the depth of
+        nesting the StackParser accepts is only limited by memory.
+        :param rule: Generator of the grammar rule to run.
+        :return: ParseResult of the rule.
+        """
+        stack, result = [rule], None
+        while True:
+            try:
+                stack.append(stack[-1].send(result))
+                result = None
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                if not stack:
+                    return result
+
+    ##############################################
+    # Every grammar rule is redefined here, with #
+    # the rules it depends on yielded.           #
+    ##############################################
+
+    def call(self, atom=None):
+        parse_result = ParseResult()
+        if atom is None:
+            atom = parse_result.register((yield self.atom()))
+            if parse_result.error:
+                return parse_result
+        if self.current_token.type == TP_LPAREN:
+            parse_result.register_advancement()
+            self.advance()
+            arg_nodes = []
+            if self.current_token.type == TP_RPAREN:
+                parse_result.register_advancement()
+                self.advance()
+            else:  # At least one argument being passed
+                arg_nodes.append(parse_result.register((yield self.expr())))
+                if parse_result.error:
+                    return parse_result.failure(InvalidSyntaxError(
+                        'Expected ")", "VAR", "IF", "FOR", "WHILE", "FUNC", int, float, or identifier',
+                        self.current_token.start_pos, self.current_token.end_pos))
+                while self.current_token.type == TP_COMMA:
+                    parse_result.register_advancement()
+                    self.advance()
+                    arg_nodes.append(parse_result.register((yield self.expr())))
+                    if parse_result.error:
+                        return parse_result
+                if self.current_token.type != TP_RPAREN:
+                    return parse_result.failure(InvalidSyntaxError('Expected "," or ")"',
+                                                                   self.current_token.start_pos,
+                                                                   self.current_token.end_pos))
+                parse_result.register_advancement()
+                self.advance()
+            return parse_result.success(CallNode(atom, arg_nodes))
+        return parse_result.success(atom)
+
+    def atom(self):
+        parse_result = ParseResult()
+        token = self.current_token
+
+        # Parse integers and floating values
+        if token.type in (TP_INT, TP_FLOAT):
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(NumberNode(token.value, token.start_pos, token.end_pos))
+
+        # Parse all strings
+        elif token.type == TP_STRING:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(StringNode(token.value, token.start_pos, token.end_pos))
+
+        # Parse all possible identifiers
+        elif token.type == TP_IDENTIFIER:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(VarAccessNode(token.value, token.start_pos, token.end_pos))
+
+        # Parse all grouped expressions
+        elif token.type == TP_LPAREN:
+            parse_result.register_advancement()
+            self.advance()
+            expression = parse_result.register((yield self.expr()))
+            if parse_result.error:
+                return parse_result
+            if self.current_token.type == TP_RPAREN:
+                parse_result.register_advancement()
+                self.advance()
+                return parse_result.success(expression)
+            else:
+                return parse_result.failure(InvalidSyntaxError(
+                    'Expected ")"',
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+
+        # Parse all list statements
+        if token.type == TP_LSQUARE:
+            list_expr = parse_result.register((yield self.list_expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(list_expr)
+
+        # Parse all if-statements
+        elif token.type == TP_IF:
+            if_expr = parse_result.register((yield self.if_expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(if_expr)
+
+        # Parse for- and while-loops
+        elif token.type == TP_FOR:
+            for_expr = parse_result.register((yield self.for_expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(for_expr)
+        elif token.type == TP_WHILE:
+            while_expr = parse_result.register((yield self.while_expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(while_expr)
+
+        # Parse all function definitions
+        elif token.type == TP_FUNC:
+            func_def = parse_result.register((yield self.func_def()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(func_def)
+
+        # Defaults to raising an error
+        # The InvalidSyntaxError will be raised if the Parser is
+        # unable to properly parse the Token stream you provide
+        return parse_result.failure(InvalidSyntaxError(
+            "Expected int, float, identifier, 'IF', 'FOR', 'WHILE', 'FUNC', '[', '+', '-' or '('",
+            token.start_pos, token.end_pos,
+        ))
+
+    def statements(self):
+        parse_result = ParseResult()
+        statements = []
+        start_pos = self.current_token.start_pos
+        while self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+        statement = parse_result.register((yield self.statement()))
+        if parse_result.error:
+            return parse_result
+        statements.append(statement)
+        while self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+            if self.current_token.type == TP_NEWLINE:
+                continue
+            if self.current_token.type not in STATEMENT_START_TYPES:
+                break  # Note: END, ELSE, ELIF or EOF closes the list
+            statement = parse_result.register((yield self.statement()))
+            if parse_result.error:
+                return parse_result
+            statements.append(statement)
+        return parse_result.success(
+            ListNode(statements, start_pos, self.current_token.end_pos))
+
+    def statement(self):
+        parse_result = ParseResult()
+        start_pos = self.current_token.start_pos
+        if self.current_token.type == TP_RETURN:
+            parse_result.register_advancement()
+            self.advance()
+            expr = None
+            if self.current_token.type in EXPR_START_TYPES:
+                expr = parse_result.register((yield self.expr()))
+                if parse_result.error:
+                    return parse_result
+            return parse_result.success(
+                ReturnNode(expr, start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_CONTINUE:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(
+                ContinueNode(start_pos, self.current_token.start_pos))
+        if self.current_token.type == TP_BREAK:
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(
+                BreakNode(start_pos, self.current_token.start_pos))
+        expr = parse_result.register((yield self.expr()))
+        if parse_result.error:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'RETURN', 'CONTINUE', 'BREAK', 'VAR', 'IF', 'FOR', "
+                "'WHILE', 'FUN', int, float, identifier, '+', '-', '(', '[' or 'NOT'",
+                self.current_token.start_pos, self.current_token.end_pos))
+        return parse_result.success(expr)
+
+    def expr(self):
+        parse_result = ParseResult()
+        if self.current_token.type == TP_VAR:
+            parse_result.register_advancement()
+            self.advance()
+            if self.current_token.type != TP_IDENTIFIER:
+                return parse_result.failure(InvalidSyntaxError('Expected identifier',
+                                                               self.current_token.start_pos,
+                                                               self.current_token.end_pos))
+            var_name = self.current_token
+            self.advance()
+            if self.current_token.type != TP_EQUALS:
+                return parse_result.failure(InvalidSyntaxError('Expected "="',
+                                                               self.current_token.start_pos,
+                                                               self.current_token.end_pos))
+            self.advance()
+            expression = parse_result.register((yield self.expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(VarAssignNode(var_name.value, expression, var_name.start_pos))
+        node = parse_result.register((yield self.operation()))
+        if parse_result.error:
+            return parse_result.failure(InvalidSyntaxError('Expected VAR or mathematical operator',
+                                                           self.current_token.start_pos,
+                                                           self.current_token.end_pos))
+        return parse_result.success(node)
+
+    def func_def(self):
+        parse_result = ParseResult()
+        if self.current_token.type != TP_FUNC:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'FUNC'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        start_pos = None
+        if self.current_token.type == TP_IDENTIFIER:
+            var_name = self.current_token.value
+            start_pos = self.current_token.start_pos
+            parse_result.register_advancement()
+            self.advance()
+            if self.current_token.type != TP_LPAREN:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected '('",
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+        else:
+            var_name = None
+            if self.current_token.type != TP_LPAREN:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected identifier or '('",
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        arg_names = []
+        if self.current_token.type == TP_IDENTIFIER:
+            arg_names.append(self.current_token.value)
+            if start_pos is None:
+                start_pos = self.current_token.start_pos
+            parse_result.register_advancement()
+            self.advance()
+            while self.current_token.type == TP_COMMA:
+                parse_result.register_advancement()
+                self.advance()
+                if self.current_token.type != TP_IDENTIFIER:
+                    return parse_result.failure(InvalidSyntaxError(
+                        "Expected identifier",
+                        self.current_token.start_pos,
+                        self.current_token.end_pos))
+                arg_names.append(self.current_token.value)
+                parse_result.register_advancement()
+                self.advance()
+            if self.current_token.type != TP_RPAREN:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected ',' or ')'",
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+        else:
+            if self.current_token.type != TP_RPAREN:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected identifier or ')'",
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type == TP_ARROW:
+            parse_result.register_advancement()
+            self.advance()
+            body = parse_result.register((yield self.expr()))
+            if parse_result.error:
+                return parse_result
+            return parse_result.success(
+                FuncDefNode(var_name, arg_names, body, True, start_pos))
+        if self.current_token.type != TP_NEWLINE:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected '->' or NEWLINE",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        parse_result.register_advancement()
+        self.advance()
+        body = parse_result.register((yield self.statements()))
+        if parse_result.error:
+            return parse_result
+        if self.current_token.type != TP_END:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'END'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        return parse_result.success(
+            FuncDefNode(var_name, arg_names, body, False, start_pos))
+
+    def list_expr(self):
+        element_nodes = []
+        parse_result = ParseResult()
+        start_pos = self.current_token.start_pos
+        if self.current_token.type != TP_LSQUARE:
+            return parse_result.failure(InvalidSyntaxError('Expected "["',
+                                                           self.current_token.start_pos,
+                                                           self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type == TP_RSQUARE:
+            parse_result.register_advancement()
+            self.advance()
+        else:  # Non-empty list detected
+            element_nodes.append(parse_result.register((yield self.expr())))
+            if parse_result.error:
+                return parse_result.failure(InvalidSyntaxError(
+                    'Expected "]", "VAR", "IF", "FOR", "WHILE", "FUNC", int, float, or identifier',
+                    self.current_token.start_pos, self.current_token.end_pos))
+            while self.current_token.type == TP_COMMA:
+                parse_result.register_advancement()
+                self.advance()
+                element_nodes.append(parse_result.register((yield self.expr())))
+                if parse_result.error:
+                    return parse_result
+            if self.current_token.type != TP_RSQUARE:
+                return parse_result.failure(InvalidSyntaxError('Expected ",", or "]"',
+                                                               self.current_token.start_pos,
+                                                               self.current_token.end_pos))
+            parse_result.register_advancement()
+            self.advance()
+        return parse_result.success(ListNode(element_nodes, start_pos, self.current_token.end_pos))
+
+    ################################
+    # ALL BINARY OPERATION PARSERS #
+    ################################
+
+    def operation(self, min_precedence=1):
+        parse_result = ParseResult()
+        token = self.current_token
+        precedence = PREFIX_PRECEDENCE.get(token.type)
+        if precedence is not None and precedence >= min_precedence:
+            parse_result.register_advancement()
+            self.advance()
+            operand = parse_result.register((yield self.operation(precedence)))
+            if parse_result.error:
+                return parse_result
+            left_node = UnaryOpNode(token.type, operand, token.start_pos)
+        elif token.type in LEAF_NODE_TYPES:
+            # Note: Literals and names are by far the most common
+            #       operands, they skip the call and atom rules
+            parse_result.register_advancement()
+            self.advance()
+            left_node = LEAF_NODE_TYPES[token.type](token.value, token.start_pos, token.end_pos)
+            if self.current_token.type == TP_LPAREN:
+                left_node = parse_result.register((yield self.call(left_node)))
+                if parse_result.error:
+                    return parse_result
+        else:
+            left_node = parse_result.register((yield self.call()))
+            if parse_result.error:
+                return parse_result
+        while True:
+            op_token = self.current_token
+            precedence = BINARY_PRECEDENCE.get(op_token.type)
+            if precedence is None or precedence < min_precedence:
+                break
+            parse_result.register_advancement()
+            self.advance()
+            if op_token.type not in RIGHT_ASSOCIATIVE_TYPES:
+                precedence += 1
+            right_node = parse_result.register((yield self.operation(precedence)))
+            if parse_result.error:
+                return parse_result
+            left_node = BinOpNode(left_node, op_token.type, right_node)
+        return parse_result.success(left_node)
+
+    def if_expr(self):
+        parse_result = ParseResult()
+        all_cases = parse_result.register((yield self.if_expr_cases('IF')))
+        if parse_result.error:
+            return parse_result
+        cases, else_case = all_cases
+        return parse_result.success(IfNode(cases, else_case))
+
+    def if_expr_b(self):
+        return (yield self.if_expr_cases('ELIF'))
+
+    def if_expr_c(self):
+        else_case = None
+        parse_result = ParseResult()
+        if self.current_token.type == TP_ELSE:
+            parse_result.register_advancement()
+            self.advance()
+            if self.current_token.type == TP_NEWLINE:
+                parse_result.register_advancement()
+                self.advance()
+                statements = parse_result.register((yield self.statements()))
+                if parse_result.error:
+                    return parse_result
+                else_case = (statements, True)
+                if self.current_token.type == TP_END:
+                    parse_result.register_advancement()
+                    self.advance()
+                else:
+                    return parse_result.failure(InvalidSyntaxError(
+                        "Expected 'END'",
+                        self.current_token.start_pos,
+                        self.current_token.end_pos))
+            else:
+                expr = parse_result.register((yield self.statement()))
+                if parse_result.error:
+                    return parse_result
+                else_case = (expr, False)
+        return parse_result.success(else_case)
+
+    def if_expr_b_or_c(self):
+        cases, else_case = [], None
+        parse_result = ParseResult()
+        if self.current_token.type == TP_ELIF:
+            all_cases = parse_result.register((yield self.if_expr_b()))
+            if parse_result.error:
+                return parse_result
+            cases, else_case = all_cases
+        else:
+            else_case = parse_result.register((yield self.if_expr_c()))
+            if parse_result.error:
+                return parse_result
+        return parse_result.success((cases, else_case))
+
+    def if_expr_cases(self, case_keyword):
+        cases, else_case = [], None
+        parse_result = ParseResult()
+        if self.current_token.type != KEYWORDS[case_keyword]:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected '{}'".format(case_keyword),
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        condition = parse_result.register((yield self.expr()))
+        if parse_result.error:
+            return parse_result
+        if self.current_token.type != TP_THEN:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'THEN'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+            statements = parse_result.register((yield self.statements()))
+            if parse_result.error:
+                return parse_result
+            cases.append((condition, statements, True))
+            if self.current_token.type == TP_END:
+                parse_result.register_advancement()
+                self.advance()
+            else:
+                all_cases = parse_result.register((yield self.if_expr_b_or_c()))
+                if parse_result.error:
+                    return parse_result
+                new_cases, else_case = all_cases
+                cases.extend(new_cases)
+        else:
+            expr = parse_result.register((yield self.statement()))
+            if parse_result.error:
+                return parse_result
+            cases.append((condition, expr, False))
+            all_cases = parse_result.register((yield self.if_expr_b_or_c()))
+            if parse_result.error:
+                return parse_result
+            new_cases, else_case = all_cases
+            cases.extend(new_cases)
+        return parse_result.success((cases, else_case))
+
+    def for_expr(self):
+        parse_result = ParseResult()
+        if self.current_token.type != TP_FOR:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'FOR'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type != TP_IDENTIFIER:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected identifier",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        var_name = self.current_token
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type != TP_EQUALS:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected '='",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        start_value = parse_result.register((yield self.expr()))
+        if parse_result.error:
+            return parse_result
+        if self.current_token.type != TP_TO:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'TO'",
+                self.current_token.start_pos, self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        end_value = parse_result.register((yield self.expr()))
+        if parse_result.error:
+            return parse_result
+        if self.current_token.type == TP_STEP:
+            parse_result.register_advancement()
+            self.advance()
+            step_value = parse_result.register((yield self.expr()))
+            if parse_result.error:
+                return parse_result
+        else:
+            step_value = None
+        if self.current_token.type != TP_THEN:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'THEN'",
+                self.current_token.start_pos, self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+            body = parse_result.register((yield self.statements()))
+            if parse_result.error:
+                return parse_result
+            if self.current_token.type != TP_END:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected 'END'",
+                    self.current_token.start_pos, self.current_token.end_pos))
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(
+                ForNode(var_name.value, start_value, end_value, step_value, body, True, var_name.start_pos))
+        body = parse_result.register((yield self.statement()))
+        if parse_result.error:
+            return parse_result
+        return parse_result.success(
+            ForNode(var_name.value, start_value, end_value, step_value, body, False, var_name.start_pos))
+
+    def while_expr(self):
+        parse_result = ParseResult()
+        if self.current_token.type != TP_WHILE:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'WHILE'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        condition = parse_result.register((yield self.expr()))
+        if parse_result.error:
+            return parse_result
+        if self.current_token.type != TP_THEN:
+            return parse_result.failure(InvalidSyntaxError(
+                "Expected 'THEN'",
+                self.current_token.start_pos,
+                self.current_token.end_pos))
+        parse_result.register_advancement()
+        self.advance()
+        if self.current_token.type == TP_NEWLINE:
+            parse_result.register_advancement()
+            self.advance()
+            body = parse_result.register((yield self.statements()))
+            if parse_result.error:
+                return parse_result
+            if self.current_token.type != TP_END:
+                return parse_result.failure(InvalidSyntaxError(
+                    "Expected 'END'",
+                    self.current_token.start_pos,
+                    self.current_token.end_pos))
+            parse_result.register_advancement()
+            self.advance()
+            return parse_result.success(WhileNode(condition, body, True))
+        body = parse_result.register((yield self.statement()))
+        if parse_result.error:
+            return parse_result
+        return parse_result.success(WhileNode(condition, body, False))
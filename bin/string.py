@@ -13,7 +13,6 @@ class String(Value):
         Initializes a String instance.
         :param value: Value of the String.
         """
-        super().__init__()
         self.value = value
 
     def __str__(self):
@@ -29,7 +28,7 @@ class String(Value):
         :return: New concatenated String instance.
         """
         if isinstance(other, String):
-            return String(self.value + other.value).set_context(self.context), None
+            return String(self.value + other.value), None
         return None, Value.illegal_operation(self, other)
 
     def multiply_by(self, other):
@@ -39,7 +38,7 @@ class String(Value):
         :return: New String written out Number-times.
         """
         if isinstance(other, Number):
-            return String(self.value * other.value).set_context(self.context), None
+            return String(self.value * other.value), None
         return None, Value.illegal_operation(self, other)
 
     def is_true(self):
@@ -54,7 +53,4 @@ class String(Value):
         Makes a copy of the String instance.
         :return: A copy of the String instance.
         """
-        copy = String(self.value)
-        copy.set_position(self.start_pos, self.end_pos)
-        copy.set_context(self.context)
-        return copy
+        return String(self.value)
@@ -3,6 +3,11 @@
 
 from bin.number import Number
 
+# Note: The special values of the language. Only the global SymbolTable
+#       holds them, every other one reads them as if it had been created
+#       with them, so a global FALSE set to 10 is still 0 in a FUNC
+TABLE_CONSTANTS = {'NULL': Number.null, 'TRUE': Number.true, 'FALSE': Number.false}
+
 
 class SymbolTable:
     """Keep track of all new variable names and their values."""
@@ -13,13 +18,32 @@ class SymbolTable:
         as well as a copy of the parent's symbol table.
         :param parent: Parent SymbolTable instance.
         """
-        self.symbols = dict()
+        self.symbols = dict(TABLE_CONSTANTS) if parent is None else dict()
+        self.parent = parent
+        self.root = self if parent is None else parent.root
+        # Note: Only kept by the global SymbolTable. Names set in a SymbolTable
+        #       with a parent since the program started running. Scoping is
+        #       dynamic, so any of them may hide a global variable, but every
+        #       other name can only be found in the global SymbolTable, which
+        #       is read directly instead of walking the whole call stack
+        self.shadowing_names = set(TABLE_CONSTANTS) if parent is None else None
+
+    def reset(self, parent):
+        """
+        Empties a recycled SymbolTable and gives it a new parent.
+        :param parent: Parent SymbolTable instance.
+        """
+        self.symbols.clear()
         self.parent = parent
+        self.root = parent.root
 
-        # Special values in the language
-        self.symbols['NULL'] = Number(0)
-        self.symbols['TRUE'] = Number(1)
-        self.symbols['FALSE'] = Number(0)
+    def forget_shadowing_names(self):
+        """
+        Forgets the names set by the calls of the programs which ran
+        before. Only valid on the global SymbolTable, while no call runs.
+        """
+        self.shadowing_names.clear()
+        self.shadowing_names.update(TABLE_CONSTANTS)
 
     def get(self, variable_name, default=None):
         """
@@ -29,9 +53,18 @@ class SymbolTable:
         :return: The value of the requested variable in memory.
         """
         variable_value = self.symbols.get(variable_name, default)
-        if variable_value is None and self.parent:
-            variable_value = self.parent.get(variable_name, default)
-        return variable_value
+        if variable_value is not None or self.parent is None:
+            return variable_value
+        if variable_name not in self.root.shadowing_names:
+            return self.root.symbols.get(variable_name, default)
+        if variable_name in TABLE_CONSTANTS:
+            return TABLE_CONSTANTS[variable_name]
+        symbol_table = self.parent
+        while True:  # Note: A loop, parent chains can be as deep as the recursion
+            variable_value = symbol_table.symbols.get(variable_name, default)
+            if variable_value is not None or symbol_table.parent is None:
+                return variable_value
+            symbol_table = symbol_table.parent
 
     def set(self, variable_name, variable_value):
         """
@@ -39,6 +72,8 @@ class SymbolTable:
         :param variable_name: Name of the new variable in memory.
         :param variable_value: Value of the new variable.
         """
+        if self.parent is not None:
+            self.root.shadowing_names.add(variable_name)
         self.symbols[variable_name] = variable_value
 
     def remove(self, variable_name):
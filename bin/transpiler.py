@@ -0,0 +1,785 @@
+# coding=utf-8
+"""
+Represents the transpiling backend.
+The AST is translated into the source of a Python module, which the
+built-in compile() turns into CPython bytecode. FOR and WHILE become
+Python loops, FUNC becomes a def, and VAR an assignment to a Python
+local which is written through to the SymbolTable, so that Functions
+still see the variables of their callers. The generated code builds
+the same Number, String and List instances as the Interpreter, and
+calls built-ins through their execute() method, so results and error
+positions do not change. A source map links every generated line back
+to the offsets of its Node, to report Python failures such as a
+RecursionError on the SimpleScript line which caused them.
+"""
+
+import linecache
+import traceback
+import weakref
+
+from bin.closure_compiler import BINARY_METHODS, ClosureCompiler
+from bin.constants import *
+from bin.errors import ActiveRuntimeError
+from bin.inlining import add_inlined_frame
+from bin.interpreter import SHORT_CIRCUITS, UNARY_METHODS, Function
+from bin.invariants import load_invariant, store_invariant
+from bin.list import List
+from bin.nodes import *
+from bin.number import Number, make_number
+from bin.runtime_result import RuntimeResult
+from bin.signals import *
+from bin.source import get_source
+from bin.stack_interpreter import StackInterpreter
+from bin.string import String
+from bin.symbol_table import SymbolTable
+from bin.value import operation_error
+
+# Note: Python expressions computing the operators inline when both
+#       operands are Numbers, giving the same result as the Number
+#       methods. Divisions are left out, they check for zero.
+PYTHON_OPERATIONS = {
+    TP_PLUS: '{} + {}',
+    TP_MINUS: '{} - {}',
+    TP_MUL: '{} * {}',
+    TP_POWER: '{} ** {}',
+    TP_EE: 'int({} == {})',
+    TP_NE: 'int({} != {})',
+    TP_LT: 'int({} < {})',
+    TP_LTE: 'int({} <= {})',
+    TP_GT: 'int({} > {})',
+    TP_GTE: 'int({} >= {})',
+    TP_AND: 'int({} != 0 and {} != 0)',
+    TP_OR: 'int({} != 0 or {} != 0)',
+}
+
+
+###################################
+# RUNTIME HELPERS CALLED FROM THE #
+# GENERATED CODE, ON SLOW PATHS   #
+###################################
+
+def lookup(symbol_table, var_name, start_pos, end_pos, context):
+    """
+    Fetches a variable from the SymbolTable and its parents.
+    :param symbol_table: SymbolTable of the running Context.
+    :param var_name: Name of the variable.
+    :param start_pos: Starting offset of the access.
+    :param end_pos: Ending offset of the access.
+    :param context: Running Context, for the error.
+    :return: Value of the variable, not copied.
+    """
+    var_value = symbol_table.get(var_name)
+    if var_value is None:
+        raise ErrorSignal(ActiveRuntimeError('VAR "{}" not defined'.format(var_name), start_pos, end_pos, context))
+    return var_value
+
+
+def binary_operation(left, right, node, context):
+    """
+    Applies a binary operator through the methods of the left Value.
+    :param left: Value of the left operand.
+    :param right: Value of the right operand.
+    :param node: The BinOpNode instance.
+    :param context: Running Context, for the error.
+    :return: Value of the operation.
+    """
+    method = BINARY_METHODS[node.op_type]
+    result, error = method(left, right)
+    if error:
+        raise ErrorSignal(operation_error(method, ((left, node.left_node), (right, node.right_node)), context))
+    return result
+
+
+def unary_operation(number, node, context):
+    """
+    Applies a unary operator through the methods of the Value.
+    :param number: Value of the operand.
+    :param node: The UnaryOpNode instance.
+    :param context: Running Context, for the error.
+    :return: Value of the operation.
+    """
+    operand, error = number, None
+    if node.op_type == TP_MINUS:
+        number, error = number.multiply_by(make_number(-1))
+    elif node.op_type == TP_NOT:
+        number, error = number.notted()
+    if error:
+        raise ErrorSignal(operation_error(UNARY_METHODS[node.op_type], ((operand, node.right_node),), context))
+    return number
+
+
+def steps(index, end_value, step_value):
+    """
+    Returns the successive values of the variable of a FOR loop.
+    :param index: Start value of the loop.
+    :param end_value: End value of the loop, excluded.
+    :param step_value: Step between two values.
+    :return: Iterable of the values, a range() when all of them are ints.
+    """
+    if type(index) is int and type(end_value) is int and type(step_value) is int and step_value:
+        return range(index, end_value, step_value)
+    return count_steps(index, end_value, step_value)
+
+
+def count_steps(index, end_value, step_value):
+    """
+    Yields the values of a FOR loop like the Interpreter counts them.
+    :param index: Start value of the loop.
+    :param end_value: End value of the loop, excluded.
+    :param step_value: Step between two values.
+    :return: Generator of the values.
+    """
+    if step_value >= 0:
+        while index < end_value:
+            yield index
+            index += step_value
+    else:
+        while index > end_value:
+            yield index
+            index += step_value
+
+
+class TranspiledFunction(Function):
+    """Function whose body has been transpiled into a Python function."""
+
+    pools_contexts = True
+
+    def __init__(self, name, body_node, arg_names, should_auto_return, body_code, local_names):
+        """
+        Initializes a TranspiledFunction instance.
+        :param name: Name of the function.
+        :param body_node: Body Node instance of the function.
+        :param arg_names: Argument names for the function.
+        :param should_auto_return: True if the Function should automatically return its value.
+        :param body_code: Python function transpiled from the body Node.
+        :param local_names: Frozenset of the names the body and the arguments set.
+        """
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.body_code = body_code
+        self.local_names = local_names
+
+    def run_body(self, exec_context):
+        """
+        Runs the transpiled body of the Function once.
+        :param exec_context: Context of the call, with the arguments set.
+        :return: Value returned by the body.
+        """
+        shadowing_names = exec_context.symbol_table.root.shadowing_names
+        if not self.local_names <= shadowing_names:  # Note: The body sets them without SymbolTable.set()
+            shadowing_names.update(self.local_names)
+        return self.body_code(exec_context)
+
+    def copy(self):
+        """
+        Copies a TranspiledFunction instance.
+        :return: A new TranspiledFunction instance.
+        """
+        return TranspiledFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.body_code,
+                                  self.local_names)
+
+
+# Note: Globals of every generated module
+RUNTIME = {
+    'Number': Number,
+    'make_number': make_number,
+    'String': String,
+    'List': List,
+    'TranspiledFunction': TranspiledFunction,
+    'ErrorSignal': ErrorSignal,
+    'BreakSignal': BreakSignal,
+    'ContinueSignal': ContinueSignal,
+    'ReturnSignal': ReturnSignal,
+    'TailCallSignal': TailCallSignal,
+    'lookup': lookup,
+    'binary_operation': binary_operation,
+    'unary_operation': unary_operation,
+    'steps': steps,
+    'unwrap': unwrap,
+    'load_invariant': load_invariant,
+    'store_invariant': store_invariant,
+    'add_inlined_frame': add_inlined_frame,
+}
+
+
+class TranspiledCode:
+    """Python module transpiled from an AST, with its source map."""
+
+    # Note: Source maps of the generated files which are still alive.
+    #       Functions outlive the program of their module, so each entry
+    #       is only removed once the namespace they share is released.
+    source_maps = {}
+
+    def __init__(self, filename, source, source_map, constants):
+        """
+        Compiles the generated source and registers its source map.
+        :param filename: Unique file name of the generated module.
+        :param source: Python source of the module.
+        :param source_map: Offsets of the Node of every line, indexed by line number.
+        :param constants: Objects referenced by the source, by name.
+        """
+        self.filename = filename
+        self.source = source
+        self.source_map = source_map
+        TranspiledCode.source_maps[filename] = source_map
+        # Note: Lets Python tracebacks show the generated lines
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = dict(RUNTIME, **constants)
+        namespace['transpiled_code'] = self  # Note: Alive for as long as any generated function
+        weakref.finalize(self, TranspiledCode.release, filename)
+        exec(compile(source, filename, 'exec'), namespace)
+        self.program = namespace['program']
+
+    @staticmethod
+    def release(filename):
+        """
+        Forgets the source map and the lines of a generated file.
+        :param filename: File name of the generated module.
+        """
+        TranspiledCode.source_maps.pop(filename, None)
+        linecache.cache.pop(filename, None)
+
+    def run(self, context):
+        """
+        Runs the module in a Context.
+        :param context: Context of the program.
+        :return: RuntimeResult of the program.
+        """
+        try:
+            return capture(self.program, context)
+        except RecursionError as exception:
+            return RuntimeResult().failure(TranspiledCode.locate(exception, 'Maximum recursion depth exceeded'))
+
+    @staticmethod
+    def locate(exception, details):
+        """
+        Turns a Python exception into an Error on the SimpleScript line
+        of the innermost generated frame it went through.
+        :param exception: Exception raised by generated code.
+        :param details: Details of the Error.
+        :return: ActiveRuntimeError instance.
+        """
+        innermost = None
+        for frame, line_number in traceback.walk_tb(exception.__traceback__):
+            if frame.f_code.co_filename in TranspiledCode.source_maps:
+                innermost = frame, line_number
+        if innermost is None:
+            raise exception
+        frame, line_number = innermost
+        start_pos, end_pos = TranspiledCode.source_maps[frame.f_code.co_filename][line_number]
+        return ActiveRuntimeError(details, start_pos, end_pos, frame.f_locals.get('context'))
+
+
+def local_name(var_name):
+    """
+    Returns the Python local holding a SimpleScript variable.
+    :param var_name: Name of the variable.
+    :return: Python identifier, never clashing with generated names.
+    """
+    return 'v_' + var_name
+
+
+def get_assigned_names(node):
+    """
+    Returns the variables a body sets in its own SymbolTable.
+    :param node: Root Node of the body.
+    :return: Set of variable names.
+    """
+    return {body_node.var_name for body_node in iter_body_nodes(node)
+            if type(body_node) in (VarAssignNode, ForNode, FuncDefNode) and body_node.var_name}
+
+
+def needs_guard(node):
+    """
+    Checks if BREAK or CONTINUE can reach a loop body as a signal: from
+    a called Function, or from the condition of a nested WHILE loop.
+    :param node: Body Node of the loop.
+    :return: True if the body must catch BreakSignal and ContinueSignal.
+    """
+    for body_node in iter_body_nodes(node):
+        if type(body_node) in (CallNode, TailCallNode):
+            return True
+        if type(body_node) is WhileNode and any(type(condition_node) in (BreakNode, ContinueNode)
+                                                for condition_node in iter_body_nodes(body_node.condition)):
+            return True
+    return False
+
+
+class Transpiler:
+    """Transpiles Nodes into Python code, and runs it as a backend."""
+
+    # Note: Maps every Node class to its transpile_ function, like
+    #       the visit_methods of the Interpreter
+    transpile_methods = {}
+
+    # Note: Numbers the generated modules, to give each a unique file name
+    module_count = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.transpile_methods = cls.make_transpile_methods()
+
+    @classmethod
+    def make_transpile_methods(cls):
+        """
+        Builds the dispatch table of the transpile_ methods of the class.
+        :return: Dictionary mapping Node classes to unbound transpile_ functions.
+        """
+        return {node_class: getattr(cls, 'transpile_{}'.format(node_class.__name__.lower()), cls.no_transpile_method)
+                for node_class in NODE_TYPES}
+
+    def __init__(self):
+        """Initializes a Transpiler instance."""
+        self.definitions = []
+        self.constants = {}
+        self.name_count = 0
+
+        # Note: State of the def being generated. Variables are only read
+        #       from their Python local once it is known to hold the value
+        #       of the SymbolTable: "defined" maps these names to True when
+        #       the body set them itself, False when they were looked up.
+        self.lines = None
+        self.source_map = None
+        self.indent = 0
+        self.local_names = None
+        self.defined = None
+        self.loop_depth = 0
+        self.in_program = False
+        self.arguments = {}  # Note: Temporaries holding the arguments of inlined calls, by name
+
+    def visit(self, node, context):
+        """
+        Transpiles and runs a Node, like Interpreter.visit().
+        :param node: Node we wish to run.
+        :param context: Context of the caller.
+        :return: The RuntimeResult of the Node.
+        """
+        try:
+            code = self.transpile(node)
+        except SyntaxError:
+            # Note: Python limits how deeply blocks nest, such ASTs run as closures
+            return ClosureCompiler().visit(node, context)
+        except RecursionError:
+            # Note: Transpiling recurses on the Python stack, like compiling
+            #       closures, ASTs too deep for it run on the explicit stack
+            return StackInterpreter().visit(node, context)
+        return code.run(context)
+
+    def transpile(self, node):
+        """
+        Transpiles a program into a Python module.
+        :param node: Root Node of the AST.
+        :return: TranspiledCode instance, whose program() function runs the AST.
+        """
+        self.definitions, self.constants = [], {}
+        self.transpile_body('program', [], node, True, node)
+        lines, source_map = [], [None]  # Note: Line numbers start at 1
+        for definition_lines, definition_map in self.definitions:
+            lines.extend(definition_lines)
+            source_map.extend(definition_map)
+        Transpiler.module_count += 1
+        source = get_source(node.start_pos)
+        fn = source.fn if source else '<program>'
+        filename = '<transpiled {} #{}>'.format(fn, Transpiler.module_count)
+        return TranspiledCode(filename, '\n'.join(lines) + '\n', source_map, self.constants)
+
+    def transpile_body(self, name, arg_names, body_node, should_auto_return, node):
+        """
+        Generates the def of a program or of the body of a Function.
+        :param name: Name of the generated Python function.
+        :param arg_names: Argument names, already set in the SymbolTable.
+        :param body_node: Body Node to transpile.
+        :param should_auto_return: True if the def returns the value of the body.
+        :param node: Node of the program or FuncDefNode, for the source map.
+        """
+        saved_state = (self.lines, self.source_map, self.indent, self.local_names,
+                       self.defined, self.loop_depth, self.in_program)
+        self.lines, self.source_map, self.indent = [], [], 0
+        self.local_names = get_assigned_names(body_node) | set(arg_names)
+        self.defined, self.loop_depth, self.in_program = {}, 0, name == 'program'
+        self.emit('def {}(context):'.format(name), node)
+        self.indent += 1
+        self.emit('symbol_table = context.symbol_table', node)
+        self.emit('names = symbol_table.symbols', node)
+        for arg_name in arg_names:
+            self.emit('{} = names[{!r}]'.format(local_name(arg_name), arg_name), node)
+            self.defined[arg_name] = True
+        value = self.transpile_node(body_node)
+        self.emit('return {}'.format(value if should_auto_return else 'Number.null'), node)
+        self.definitions.append((self.lines, self.source_map))
+        (self.lines, self.source_map, self.indent, self.local_names,
+         self.defined, self.loop_depth, self.in_program) = saved_state
+
+    def transpile_node(self, node):
+        """
+        Generates the statements computing the value of a Node.
+        :param node: Node we wish to transpile.
+        :return: Python expression holding the value once they ran.
+        """
+        return self.transpile_methods.get(type(node), Transpiler.no_transpile_method)(self, node)
+
+    def no_transpile_method(self, node):
+        """
+        Handle unknown methods for transpiling Nodes.
+        :param node: Node we tried to transpile.
+        """
+        raise Exception('No transpile_{} method defined.'.format(type(node).__name__.lower()))
+
+    ##################################
+    # HELPERS WRITING THE GENERATED  #
+    # LINES AND THEIR SOURCE MAP     #
+    ##################################
+
+    def emit(self, line, node):
+        """
+        Appends a line to the def being generated.
+        :param line: Python statement, without indentation.
+        :param node: Node the statement comes from.
+        """
+        self.lines.append('    ' * self.indent + line)
+        self.source_map.append((node.start_pos, node.end_pos))
+
+    def new_name(self, prefix):
+        """
+        Returns a fresh name for the generated code.
+        :param prefix: Prefix of the name.
+        :return: Unique Python identifier.
+        """
+        self.name_count += 1
+        return '{}{}'.format(prefix, self.name_count)
+
+    def assign(self, expression, node):
+        """
+        Stores the value of an expression in a fresh temporary.
+        :param expression: Python expression.
+        :param node: Node the expression comes from.
+        :return: Name of the temporary.
+        """
+        temporary = self.new_name('t')
+        self.emit('{} = {}'.format(temporary, expression), node)
+        return temporary
+
+    def constant(self, value):
+        """
+        Makes an object available to the generated code.
+        :param value: Object we wish to reference.
+        :return: Name of the global holding the object.
+        """
+        name = self.new_name('k')
+        self.constants[name] = value
+        return name
+
+    def forget(self):
+        """
+        Forgets the Python locals which a call may have made stale: the
+        ones looked up from parent SymbolTables, and every one of them
+        in a program, since a call to RUN sets the global variables.
+        """
+        if self.in_program:
+            self.defined.clear()
+        else:
+            self.defined = {var_name: True for var_name, owned in self.defined.items() if owned}
+
+    ##########################################################
+    # Every transpile_ method emits the statements of its    #
+    # Node and returns the name holding its value, mirroring #
+    # the visit_ method of the Interpreter.                  #
+    ##########################################################
+
+    def transpile_numbernode(self, node):
+        return self.constant(make_number(node.value))  # Note: Numbers never change, the literal is built once
+
+    def transpile_stringnode(self, node):
+        return self.assign('String({!r})'.format(node.value), node)
+
+    def transpile_operand(self, node):
+        """
+        Transpiles the operand of an operator. Number literals become
+        Python numbers, their Number is only used if the operation falls
+        back to the Value methods.
+        :param node: Node of the operand.
+        :return: Tuple of the Python expressions of its value and its Value,
+                 and of the name holding the Value, None for a literal.
+        """
+        if type(node) is NumberNode:
+            return repr(node.value), self.constant(make_number(node.value)), None
+        temporary = self.transpile_node(node)
+        return '{}.value'.format(temporary), temporary, temporary
+
+    def transpile_binopnode(self, node):
+        left_operand = self.transpile_operand(node.left_node)
+        if node.op_type in SHORT_CIRCUITS:
+            return self.transpile_short_circuit(node, left_operand)
+        right_operand = self.transpile_operand(node.right_node)
+        return self.assign(self.binary_expression(node, left_operand, right_operand), node)
+
+    def binary_expression(self, node, left_operand, right_operand):
+        """
+        Returns the Python expression of a binary operator, computed
+        inline when both operands are Numbers.
+        :param node: The BinOpNode instance.
+        :param left_operand: Left operand, as returned by transpile_operand().
+        :param right_operand: Right operand, as returned by transpile_operand().
+        :return: Python expression of the Value of the operation.
+        """
+        (left_value, left, left_name), (right_value, right, right_name) = left_operand, right_operand
+        generic = 'binary_operation({}, {}, {}, context)'.format(left, right, self.constant(node))
+        python_operation = PYTHON_OPERATIONS.get(node.op_type)
+        if python_operation is None:
+            return generic
+        number = 'make_number({})'.format(python_operation.format(left_value, right_value))
+        checks = ['type({}) is Number'.format(name) for name in (left_name, right_name) if name]
+        if not checks:
+            return number
+        return '{} if {} else {}'.format(number, ' and '.join(checks), generic)
+
+    def transpile_short_circuit(self, node, left_operand):
+        """
+        Generates an AND or an OR, whose right operand only runs
+        when the left one does not decide the result on its own.
+        :param node: The BinOpNode instance.
+        :param left_operand: Left operand, as returned by transpile_operand().
+        :return: Name holding the Value of the operation.
+        """
+        value, deciding = self.new_name('t'), SHORT_CIRCUITS[node.op_type]
+        left_value, _, left_name = left_operand
+        check = '{} {} 0'.format(left_value, '!=' if deciding else '==')
+        if left_name:
+            check = 'type({}) is Number and {}'.format(left_name, check)
+        self.emit('if {}:'.format(check), node)
+        self.emit('    {} = {}'.format(value, 'Number.true' if deciding else 'Number.false'), node)
+        self.emit('else:', node)
+        self.indent += 1
+        defined = dict(self.defined)
+        right_operand = self.transpile_operand(node.right_node)
+        self.emit('{} = {}'.format(value, self.binary_expression(node, left_operand, right_operand)), node)
+        self.indent -= 1
+        # Note: Only the locals known whether or not the right operand ran stay known
+        self.defined = {var_name: owned and self.defined[var_name]
+                        for var_name, owned in defined.items() if var_name in self.defined}
+        return value
+
+    def transpile_unaryopnode(self, node):
+        right = self.transpile_node(node.right_node)
+        generic = 'unary_operation({}, {}, context)'.format(right, self.constant(node))
+        if node.op_type == TP_MINUS:
+            python_operation = '{}.value * -1'
+        elif node.op_type == TP_NOT:
+            python_operation = '1 if {}.value == 0 else 0'
+        else:
+            return self.assign(generic, node)
+        return self.assign('make_number({}) if type({}) is Number else {}'
+                           .format(python_operation.format(right), right, generic), node)
+
+    def transpile_varaccessnode(self, node):
+        var_name, position = node.var_name, '{}, {}'.format(node.start_pos, node.end_pos)
+        if var_name in self.arguments:
+            return self.arguments[var_name]
+        if var_name not in self.local_names:
+            return self.assign('lookup(symbol_table, {!r}, {}, context)'.format(var_name, position), node)
+        if var_name not in self.defined:
+            self.emit('{} = lookup(symbol_table, {!r}, {}, context)'.format(local_name(var_name), var_name, position),
+                      node)
+            self.defined[var_name] = False
+        return self.assign(local_name(var_name), node)
+
+    def transpile_varassignnode(self, node):
+        value = self.transpile_node(node.value_node)
+        self.emit('{} = names[{!r}] = {}'.format(local_name(node.var_name), node.var_name, value), node)
+        self.defined[node.var_name] = True
+        return value
+
+    def transpile_ifnode(self, node):
+        value = self.new_name('t')
+        paths = []
+        for condition, expr, should_return_null in node.cases:
+            condition_value = self.transpile_node(condition)
+            self.emit('if {}.is_true():'.format(condition_value), node)
+            self.indent += 1
+            defined = dict(self.defined)
+            self.transpile_branch(value, expr, should_return_null, node)
+            paths.append(self.defined)
+            self.defined = defined
+            self.indent -= 1
+            self.emit('else:', node)
+            self.indent += 1
+        if node.else_case:
+            self.transpile_branch(value, node.else_case[0], node.else_case[1], node)
+        else:
+            self.emit('{} = Number.null'.format(value), node)
+        paths.append(self.defined)
+        self.indent -= len(node.cases)
+        # Note: Only the locals known on every path stay known
+        self.defined = {var_name: all(path[var_name] for path in paths)
+                        for var_name in set.intersection(*[set(path) for path in paths])}
+        return value
+
+    def transpile_branch(self, value, expr, should_return_null, node):
+        """
+        Generates a branch of an IF statement.
+        :param value: Name receiving the value of the IF statement.
+        :param expr: Node of the branch.
+        :param should_return_null: True if the branch gives NULL.
+        :param node: The IfNode instance.
+        """
+        expr_value = self.transpile_node(expr)
+        self.emit('{} = {}'.format(value, 'Number.null' if should_return_null else expr_value), node)
+
+    def transpile_loop_body(self, node, elements):
+        """
+        Generates the body of a loop, inside its Python loop statement.
+        :param node: Body Node of the loop.
+        :param elements: Name of the list of values of the loop, None if it gives NULL.
+        """
+        guarded = needs_guard(node)
+        if guarded:
+            self.emit('try:', node)
+            self.indent += 1
+        self.loop_depth += 1
+        value = self.transpile_node(node)
+        self.loop_depth -= 1
+        if elements:
+            self.emit('{}.append({})'.format(elements, value), node)
+        if guarded:
+            self.indent -= 1
+            self.emit('except BreakSignal:', node)
+            self.emit('    break', node)
+            self.emit('except ContinueSignal:', node)
+            self.emit('    continue', node)
+
+    def transpile_loop_value(self, node, elements):
+        """
+        Returns the value of a finished loop.
+        :param node: The ForNode or WhileNode instance.
+        :param elements: Name of the list of values of the loop, None if it gives NULL.
+        :return: Name holding the value.
+        """
+        if node.should_return_null:
+            return self.assign('Number.null', node)
+        return self.assign('List({})'.format(elements), node)
+
+    def transpile_fornode(self, node):
+        start_value = self.transpile_node(node.start_value_node)
+        end_value = self.transpile_node(node.end_value_node)
+        step_value = '{}.value'.format(self.transpile_node(node.step_value_node)) if node.step_value_node else '1'
+        elements = None if node.should_return_null else self.assign('[]', node)
+        if needs_guard(node.body_node):
+            self.forget()
+        defined = dict(self.defined)
+        index = self.new_name('i')
+        self.emit('for {} in steps({}.value, {}.value, {}):'.format(index, start_value, end_value, step_value), node)
+        self.indent += 1
+        self.emit('{} = names[{!r}] = make_number({})'.format(local_name(node.var_name), node.var_name, index), node)
+        self.defined[node.var_name] = True
+        self.transpile_loop_body(node.body_node, elements)
+        self.indent -= 1
+        self.defined = defined
+        return self.transpile_loop_value(node, elements)
+
+    def transpile_whilenode(self, node):
+        elements = None if node.should_return_null else self.assign('[]', node)
+        if needs_guard(node):
+            self.forget()
+        defined = dict(self.defined)
+        self.emit('while True:', node)
+        self.indent += 1
+        # Note: A BREAK in the condition stops the enclosing loop instead
+        loop_depth, self.loop_depth = self.loop_depth, 0
+        condition = self.transpile_node(node.condition)
+        self.loop_depth = loop_depth
+        self.emit('if not {}.is_true():'.format(condition), node)
+        self.emit('    break', node)
+        self.transpile_loop_body(node.body_node, elements)
+        self.indent -= 1
+        self.defined = defined
+        return self.transpile_loop_value(node, elements)
+
+    def transpile_funcdefnode(self, node):
+        # Note: Every Function gets its own def, which runs in the Context of its calls
+        body_name = self.new_name('f')
+        self.transpile_body(body_name, node.arg_names, node.body_node, node.should_auto_return, node)
+        local_names = frozenset(get_assigned_names(node.body_node) | set(node.arg_names))
+        value = self.assign('TranspiledFunction({!r}, {}, {}, {}, {}, {})'
+                            .format(node.var_name, self.constant(node.body_node), self.constant(node.arg_names),
+                                    node.should_auto_return, body_name, self.constant(local_names)), node)
+        if node.var_name:
+            self.emit('{} = names[{!r}] = {}'.format(local_name(node.var_name), node.var_name, value), node)
+            self.defined[node.var_name] = True
+        return value
+
+    def transpile_callnode(self, node):
+        position = '{}, {}'.format(node.start_pos, node.end_pos)
+        value_to_call = self.transpile_node(node.node_to_call)
+        args = '[{}]'.format(', '.join([self.transpile_node(arg_node) for arg_node in node.arg_nodes]))
+        # Note: Built-ins, and Functions of the other backends, go through execute()
+        value = self.assign('{0}.call({1}, context, {2}) if type({0}) is TranspiledFunction '
+                            'else unwrap({0}.execute({1}, context, {2}))'
+                            .format(value_to_call, args, position), node)
+        self.forget()
+        return value
+
+    def transpile_tailcallnode(self, node):
+        position = '{}, {}'.format(node.start_pos, node.end_pos)
+        value_to_call = self.transpile_node(node.node_to_call)
+        args = self.assign('[{}]'.format(', '.join([self.transpile_node(arg_node) for arg_node in node.arg_nodes])),
+                           node)
+        self.emit('if type({}) is TranspiledFunction and len({}) == len({}.arg_names):'
+                  .format(value_to_call, args, value_to_call), node)
+        self.emit('    raise TailCallSignal({}, {}, {})'.format(value_to_call, args, self.constant(node)), node)
+        value = self.assign('{0}.call({1}, context, {2}) if type({0}) is TranspiledFunction '
+                            'else unwrap({0}.execute({1}, context, {2}))'
+                            .format(value_to_call, args, position), node)
+        self.forget()
+        return value
+
+    def transpile_inlinedcallnode(self, node):
+        for var_name, arg_node in zip(node.var_names, node.arg_nodes):
+            argument = self.transpile_node(arg_node)
+            self.emit('names[{!r}] = {}'.format(var_name, argument), node)
+            self.arguments[var_name] = argument
+        self.emit('try:', node)
+        self.indent += 1
+        value = self.transpile_node(node.body_node)
+        self.indent -= 1
+        self.emit('except ErrorSignal as signal:', node)
+        self.emit('    add_inlined_frame(signal.error, {}, context)'.format(self.constant(node)), node)
+        self.emit('    raise', node)
+        for var_name in node.var_names:
+            self.emit('del names[{!r}]'.format(var_name), node)
+        return value
+
+    def transpile_listnode(self, node):
+        elements = [self.transpile_node(element_node) for element_node in node.element_nodes]
+        return self.assign('List([{}])'.format(', '.join(elements)), node)
+
+    def transpile_returnnode(self, node):
+        value = self.transpile_node(node.node_to_return) if node.node_to_return else 'Number.null'
+        if self.in_program:  # Note: Stops the program, like a RETURN reaching the top
+            self.emit('raise ReturnSignal({})'.format(value), node)
+        else:
+            self.emit('return {}'.format(value), node)
+        return 'None'
+
+    def transpile_continuenode(self, node):
+        self.emit('continue' if self.loop_depth else 'raise ContinueSignal()', node)
+        return 'None'
+
+    def transpile_breaknode(self, node):
+        self.emit('break' if self.loop_depth else 'raise BreakSignal()', node)
+        return 'None'
+
+    def transpile_invariantnode(self, node):
+        invariant = self.constant(node)
+        value = self.assign('load_invariant({}, context)'.format(invariant), node)
+        self.emit('if {} is None:'.format(value), node)
+        self.indent += 1
+        defined = self.defined
+        self.defined = dict(defined)
+        self.emit('{} = {}'.format(value, self.transpile_node(node.expr_node)), node)
+        self.emit('store_invariant({}, context, {})'.format(invariant, value), node)
+        self.indent -= 1
+        # Note: The expression may not run, only the locals known both ways stay known
+        self.defined = {var_name: owned for var_name, owned in defined.items() if var_name in self.defined}
+        return value
+
+
+Transpiler.transpile_methods = Transpiler.make_transpile_methods()
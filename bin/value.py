@@ -8,18 +8,19 @@ from bin.runtime_result import RuntimeResult
 class Value:
     """Superclass of all possible values."""
 
-    def __init__(self):
-        self.start_pos = None
-        self.end_pos = None
-        self.context = None
-        self.set_position()
-        self.set_context()
+    # Note: Values never change once built, so reading a variable or
+    #       returning from a call hands out the same instance. Positions
+    #       and Contexts belong to the Node being evaluated: they are only
+    #       set on the copies made by locate(), for the error of an operation.
+    start_pos = None
+    end_pos = None
+    context = None
 
     def set_position(self, start_pos=None, end_pos=None):
         """
         Sets the position values for a Value instance.
-        :param start_pos: Starting position.
-        :param end_pos: Ending position.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
         :return: Value instance with new positions.
         """
         self.start_pos = start_pos
@@ -35,6 +36,16 @@ class Value:
         self.context = context
         return self
 
+    def locate(self, start_pos, end_pos, context):
+        """
+        Copies the Value with a position and a Context.
+        :param start_pos: Starting offset.
+        :param end_pos: Ending offset.
+        :param context: Context the Value is used in.
+        :return: New Value instance, placed at the positions.
+        """
+        return self.copy().set_position(start_pos, end_pos).set_context(context)
+
     def illegal_operation(self, other=None):
         """
         Processes illegal operations against Values.
@@ -95,11 +106,26 @@ class Value:
     def notted(self, other):
         return None, self.illegal_operation(other)
 
-    def execute(self, args):
-        return RuntimeResult().failure(self.illegal_operation())
+    def execute(self, args, context, start_pos, end_pos):
+        return RuntimeResult().failure(self.locate(start_pos, end_pos, context).illegal_operation())
 
     def copy(self):
         raise Exception('No copy method defined')
 
     def is_true(self):
         return False
+
+
+def operation_error(operation, operands, context):
+    """
+    Builds the error of an operation which failed on shared Values.
+    They do not know where they were read, so the operation is applied
+    again to copies placed at the Nodes of its operands, which gives
+    the error the positions it would have had with copied Values.
+    :param operation: Function applying the operation to its operands.
+    :param operands: Tuples of the Value and the Node of every operand.
+    :param context: Context evaluating the operation.
+    :return: Error of the operation.
+    """
+    _, error = operation(*[value.locate(node.start_pos, node.end_pos, context) for value, node in operands])
+    return error
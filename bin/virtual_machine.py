@@ -0,0 +1,303 @@
+# coding=utf-8
+"""
+Represents the virtual machine running the bytecode of bin/bytecode.py.
+All instructions run in a single dispatch loop. Calls to SimpleScript
+Functions push a frame instead of recursing on the Python stack, and
+BREAK and CONTINUE unwind the value stack to their loop block, so no
+flag is propagated through every Node like with RuntimeResult. As in
+the Interpreter, BREAK and CONTINUE outside of a loop leave the
+Function and affect the loop of its caller.
+"""
+
+from bin.bytecode import *
+from bin.constants import *
+from bin.errors import ActiveRuntimeError
+from bin.inlining import add_inlined_frame
+from bin.interpreter import UNARY_METHODS, Function
+from bin.invariants import load_invariant, store_invariant
+from bin.list import List
+from bin.number import Number, make_number
+from bin.runtime_result import RuntimeResult
+from bin.stack_interpreter import StackInterpreter
+from bin.string import String
+from bin.value import operation_error
+
+
+class BytecodeFunction(Function):
+    """Function whose body has been compiled into bytecode."""
+
+    pools_contexts = True
+
+    def __init__(self, name, body_node, arg_names, should_auto_return, code):
+        """
+        Initializes a BytecodeFunction instance.
+        :param name: Name of the function.
+        :param body_node: Body Node instance of the function.
+        :param arg_names: Argument names for the function.
+        :param should_auto_return: True if the Function should automatically return its value.
+        :param code: Code compiled from the body Node.
+        """
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.code = code
+
+    def execute(self, args, context, start_pos, end_pos):
+        """
+        Calls the Function like any other Value, from the other backends.
+        :param args: Arguments being passed into the Function.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
+        :return: RuntimeResult with the value of the executed Function.
+        """
+        exec_context = self.generate_new_context(context, start_pos, end_pos)
+        runtime_result = self.check_and_populate_args(self.arg_names, args, exec_context)
+        if runtime_result.error:
+            return runtime_result
+        return VirtualMachine().run(self.code, exec_context, self)
+
+    def copy(self):
+        """
+        Copies a BytecodeFunction instance.
+        :return: A new BytecodeFunction instance.
+        """
+        return BytecodeFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.code)
+
+
+class VirtualMachine:
+    """Stack-based virtual machine, usable as a backend."""
+
+    def visit(self, node, context):
+        """
+        Compiles and runs a Node, like Interpreter.visit().
+        :param node: Node we wish to run.
+        :param context: Context of the caller.
+        :return: The RuntimeResult of the Node.
+        """
+        try:
+            code = BytecodeCompiler().compile_code(node)
+        except RecursionError:
+            # Note: Compiling recurses on the Python stack, ASTs too deep
+            #       for it run on the explicit stack, which never recurses either
+            return StackInterpreter().visit(node, context)
+        return self.run(code, context)
+
+    def run(self, code, context, function=None):
+        """
+        Runs Code until its outermost frame returns.
+        :param code: Code instance to run.
+        :param context: Context of the outermost frame.
+        :param function: Function the outermost frame belongs to, None for a program.
+        :return: RuntimeResult with the value, like the Interpreter would return.
+        """
+        instructions, pc, stack, blocks = code.instructions, 0, [], []
+        frames = []
+        unwinding = None  # Note: BREAK_LOOP or CONTINUE_LOOP while looking for a loop
+        while True:
+            if unwinding is not None:
+                while not blocks:
+                    if not frames:  # Note: Nothing to stop, like a flag reaching the top
+                        if unwinding == BREAK_LOOP:
+                            return RuntimeResult().success_break()
+                        return RuntimeResult().success_continue()
+                    instructions, pc, stack, blocks, context, function = frames.pop()
+                depth, continue_target, break_target, _ = blocks[-1]
+                del stack[depth:]
+                pc = break_target if unwinding == BREAK_LOOP else continue_target
+                unwinding = None
+
+            opcode = instructions[pc]
+            argument = instructions[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_NAME:
+                var_value = context.symbol_table.get(argument.var_name)
+                if var_value is None:
+                    return self.failure(ActiveRuntimeError(
+                        'VAR "{}" not defined'.format(argument.var_name),
+                        argument.start_pos, argument.end_pos, context), code, pc, context, function, frames)
+                stack.append(var_value)
+
+            elif opcode == LOAD_NUMBER:
+                stack.append(make_number(argument.value))
+
+            elif opcode == BINARY_OP:
+                number_operation, method, node = argument
+                right = stack.pop()
+                left = stack[-1]
+                if number_operation and type(left) is Number and type(right) is Number:
+                    stack[-1] = make_number(number_operation(left.value, right.value))
+                else:
+                    result, error = method(left, right)
+                    if error:
+                        error = operation_error(method, ((left, node.left_node), (right, node.right_node)), context)
+                        return self.failure(error, code, pc, context, function, frames)
+                    stack[-1] = result
+
+            elif opcode == STORE_NAME:
+                context.symbol_table.set(argument, stack[-1])
+
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not stack.pop().is_true():
+                    pc = argument
+
+            elif opcode == JUMP:
+                pc = argument
+
+            elif opcode == FOR_ITER:
+                var_name, loop_end = argument
+                counter = blocks[-1][3]
+                index, end_value, step_value = counter
+                if index < end_value if step_value >= 0 else index > end_value:
+                    context.symbol_table.set(var_name, make_number(index))
+                    counter[0] = index + step_value
+                else:
+                    pc = loop_end
+
+            elif opcode == POP_TOP:
+                stack.pop()
+
+            elif opcode == LOOP_APPEND:
+                value = stack.pop()
+                stack[-1].append(value)
+
+            elif opcode == BUILD_LIST:
+                count, node = argument
+                elements = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                stack.append(List(elements))
+
+            elif opcode == CALL or opcode == TAIL_CALL:
+                node, arg_count = argument
+                args = stack[len(stack) - arg_count:]
+                del stack[len(stack) - arg_count:]
+                value_to_call = stack.pop()
+                if type(value_to_call) is BytecodeFunction:
+                    if opcode == TAIL_CALL and value_to_call.body_node is function.body_node \
+                            and arg_count == len(function.arg_names):
+                        # Note: Reruns the body in the same Context, no frame is pushed
+                        function.populate_args(function.arg_names, args, context)
+                        context.tail_calls += 1
+                        instructions, pc, stack, blocks = function.code.instructions, 0, [], []
+                        continue
+                    exec_context = value_to_call.generate_new_context(context, node.start_pos, node.end_pos)
+                    runtime_result = value_to_call.check_and_populate_args(value_to_call.arg_names, args,
+                                                                           exec_context)
+                    if runtime_result.error:
+                        return self.failure(runtime_result.error, code, pc, context, function, frames)
+                    frames.append((instructions, pc, stack, blocks, context, function))
+                    instructions, pc, stack, blocks = value_to_call.code.instructions, 0, [], []
+                    context, function = exec_context, value_to_call
+                    continue
+                # Note: Built-ins, and Functions of the other backends
+                runtime_result = value_to_call.execute(args, context, node.start_pos, node.end_pos)
+                if isinstance(runtime_result, RuntimeResult):
+                    if runtime_result.error:
+                        return self.failure(runtime_result.error, code, pc, context, function, frames)
+                    if runtime_result.loop_should_break or runtime_result.loop_should_continue:
+                        unwinding = BREAK_LOOP if runtime_result.loop_should_break else CONTINUE_LOOP
+                        continue
+                    runtime_result = runtime_result.value
+                stack.append(runtime_result)
+
+            elif opcode == RETURN_VALUE:
+                value = stack.pop()
+                if argument and function is not None and not function.should_auto_return:
+                    value = Number.null  # Note: End of a body without auto return
+                if not frames:
+                    if argument or function is not None:
+                        return RuntimeResult().success(value)
+                    return RuntimeResult().success_return(value)  # Note: RETURN in a program
+                function.release_context(context)
+                instructions, pc, stack, blocks, context, function = frames.pop()
+                stack.append(value)
+
+            elif opcode == LOAD_NULL:
+                stack.append(Number.null)
+
+            elif opcode == LOAD_STRING:
+                stack.append(String(argument.value))
+
+            elif opcode == UNARY_OP:
+                number, error = stack[-1], None
+                if argument.op_type == TP_MINUS:
+                    number, error = number.multiply_by(make_number(-1))
+                elif argument.op_type == TP_NOT:
+                    number, error = number.notted()
+                if error:
+                    error = operation_error(UNARY_METHODS[argument.op_type], ((stack[-1], argument.right_node),),
+                                            context)
+                    return self.failure(error, code, pc, context, function, frames)
+                stack[-1] = number
+
+            elif opcode == MAKE_FUNCTION:
+                node, body_code = argument
+                func_value = BytecodeFunction(node.var_name, node.body_node, node.arg_names,
+                                              node.should_auto_return, body_code)
+                if node.var_name:
+                    context.symbol_table.set(node.var_name, func_value)
+                stack.append(func_value)
+
+            elif opcode == SETUP_FOR:
+                has_step, loop_start, loop_end = argument
+                step_value = stack.pop().value if has_step else 1
+                end_value = stack.pop().value
+                start_value = stack.pop().value
+                stack.append([])
+                blocks.append((len(stack), loop_start, loop_end, [start_value, end_value, step_value]))
+
+            elif opcode == SETUP_WHILE:
+                loop_start, loop_end = argument
+                stack.append([])
+                blocks.append((len(stack), loop_start, loop_end, None))
+
+            elif opcode == END_LOOP:
+                blocks.pop()
+                elements = stack.pop()
+                stack.append(Number.null if argument.should_return_null else List(elements))
+
+            elif opcode == BREAK_LOOP or opcode == CONTINUE_LOOP:
+                unwinding = opcode
+
+            elif opcode == LOAD_INVARIANT:
+                node, target = argument
+                value = load_invariant(node, context)
+                if value is not None:
+                    stack.append(value)
+                    pc = target
+
+            elif opcode == STORE_INVARIANT:
+                store_invariant(argument, context, stack[-1])
+
+            elif opcode == SHORT_CIRCUIT:
+                deciding, target = argument
+                left = stack[-1]
+                if type(left) is Number and left.is_true() is deciding:
+                    stack[-1] = Number.true if deciding else Number.false
+                    pc = target
+
+            elif opcode == END_INLINED_CALL:
+                symbols = context.symbol_table.symbols
+                for var_name in argument.var_names:
+                    del symbols[var_name]
+
+            else:
+                raise Exception('Unknown opcode {}'.format(opcode))
+
+    def failure(self, error, code, pc, context, function, frames):
+        """
+        Fails with an error, adding the frames of the inlined calls it was raised in.
+        :param error: Error being raised.
+        :param code: Code of the outermost frame.
+        :param pc: Index of the instruction after the one which failed.
+        :param context: Context of the current frame.
+        :param function: Function of the current frame, None for a program.
+        :param frames: Frames of the callers.
+        :return: RuntimeResult with the error.
+        """
+        running = [(pc, context, function)] + [frame[1:2] + frame[4:6] for frame in reversed(frames)]
+        for frame_pc, frame_context, frame_function in running:
+            frame_code = code if frame_function is None else frame_function.code
+            for start, end, node in reversed(frame_code.inlined_calls):
+                if start < frame_pc <= end:
+                    add_inlined_frame(error, node, frame_context)
+        return RuntimeResult().failure(error)
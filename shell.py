@@ -8,6 +8,7 @@ import simplescript
 ##################
 
 print_errors = False
+backend = 'tree'
 
 ###################
 # WELCOME MESSAGE #
@@ -34,8 +35,15 @@ while True:
     elif input_stream.startswith('DEBUG'):
         print_errors = not print_errors
         continue
+    elif input_stream.startswith('BACKEND'):
+        backend_name = input_stream[len('BACKEND'):].strip()
+        if backend_name in simplescript.BACKENDS:
+            backend = backend_name
+        else:  # Show the choices instead
+            print('Backends: ' + ', '.join(simplescript.BACKENDS))
+        continue
 
-    result, error = simplescript.run('<stdin>', input_stream)
+    result, error = simplescript.run('<stdin>', input_stream, backend)
     if result:
         print(repr(result))
     if error and print_errors:
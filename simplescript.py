@@ -10,31 +10,39 @@ transforms executes the AST.
 import math
 import os
 
+from bin import ast_cache, optimizer
+
+from bin.closure_compiler import ClosureCompiler
 from bin.context import Context
 from bin.errors import ActiveRuntimeError
 from bin.function import BaseFunction
 from bin.interpreter import Interpreter
-from bin.lexer import Lexer
+from bin.lexer import Lexer, StreamLexer
+from bin.memo import MemoizedFunction
 from bin.list import List
-from bin.number import Number
+from bin.number import Number, make_number
 from bin.parser import Parser
 from bin.runtime_result import RuntimeResult
+from bin.source import get_source
+from bin.stack_interpreter import StackInterpreter
+from bin.stack_parser import StackParser
 from bin.string import String
 from bin.symbol_table import SymbolTable
+from bin.transpiler import Transpiler
+from bin.virtual_machine import VirtualMachine
 
 ##############################
 # DEFINE GLOBAL SYMBOL TABLE #
 ##############################
 
 global_symbol_table = SymbolTable()
+running_programs = 0  # Note: Number of programs visit() is running
 
 ########################
 # DEFINE ALL CONSTANTS #
 ########################
 
-Number.null = Number(0)
-Number.false = Number(0)
-Number.true = Number(1)
+# Note: NULL, FALSE and TRUE are the shared Numbers of bin/number.py
 Number.math_PI = Number(math.pi)
 
 
@@ -47,30 +55,36 @@ Number.math_PI = Number(math.pi)
 class BuiltInFunction(BaseFunction):
     """Class of all built-in functions."""
 
-    def __init__(self, name):
+    def __init__(self, name, method=None):
         """
         Initializes a BuiltInFunction instance.
         :param name: Name of the built-in function.
+        :param method: Unbound execute_ method, looked up from the name if None.
         """
         super().__init__(name)
+        # Note: Resolved once here rather than on every call
+        self.method = method or getattr(BuiltInFunction, 'execute_{}'.format(self.name.lower()),
+                                        BuiltInFunction.no_visit_method)
 
     def __repr__(self):
         return '<built-in function {}>'.format(self.name)
 
-    def execute(self, args):
+    def execute(self, args, context, start_pos, end_pos):
         """
         Executes the BuiltInFunction instance.
         :param args: List of all arguments.
+        :param context: Context of the caller.
+        :param start_pos: Starting offset of the call.
+        :param end_pos: Ending offset of the call.
         :return: Value of whichever of the exec methods were called.
         """
         runtime_result = RuntimeResult()
-        exec_context = self.generate_new_context()
-        method_name = 'execute_{}'.format(self.name.lower())
-        method = getattr(self, method_name, self.no_visit_method)
+        exec_context = self.generate_new_context(context, start_pos, end_pos)
+        method = self.method
         runtime_result.register(self.check_and_populate_args(method.arg_names, args, exec_context))
         if runtime_result.error:
             return runtime_result
-        return_value = runtime_result.register(method(exec_context))
+        return_value = runtime_result.register(method(self, exec_context))
         if runtime_result.error:
             return runtime_result
         return return_value
@@ -80,10 +94,7 @@ class BuiltInFunction(BaseFunction):
         Makes a copy of a BuiltInFunction instance.
         :return: A BuiltInFunction instance.
         """
-        builtin_copy = BuiltInFunction(self.name)
-        builtin_copy.set_context(self.context)
-        builtin_copy.set_position(self.start_pos, self.end_pos)
-        return builtin_copy
+        return BuiltInFunction(self.name, self.method)
 
     ##########################
     # ALL BUILT IN FUNCTIONS #
@@ -95,7 +106,7 @@ class BuiltInFunction(BaseFunction):
 
     def execute_print(self, exec_context):
         print(str(exec_context.symbol_table.get('value')))
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(Number.null)
 
     execute_print.arg_names = ['value']
 
@@ -118,39 +129,43 @@ class BuiltInFunction(BaseFunction):
                 break
             except ValueError:
                 print("'{}' must be an integer. Try again!".format(text))
-        return RuntimeResult().success(Number(number))
+        return RuntimeResult().success(make_number(number))
 
     execute_input_int.arg_names = []
 
     def execute_clear(self, exec_context):
         os.system('cls' if os.name == 'nt' else 'cls')
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(Number.null)
 
     execute_clear.arg_names = []
 
     def execute_is_number(self, exec_context):
         is_number = isinstance(exec_context.symbol_table.get("value"), Number)
-        return RuntimeResult().success(Number(1) if is_number else Number(0))
+        return RuntimeResult().success(Number.true if is_number else Number.false)
 
     execute_is_number.arg_names = ["value"]
+    execute_is_number.is_pure = True
 
     def execute_is_string(self, exec_context):
         is_number = isinstance(exec_context.symbol_table.get("value"), String)
-        return RuntimeResult().success(Number(1) if is_number else Number(0))
+        return RuntimeResult().success(Number.true if is_number else Number.false)
 
     execute_is_string.arg_names = ["value"]
+    execute_is_string.is_pure = True
 
     def execute_is_list(self, exec_context):
         is_number = isinstance(exec_context.symbol_table.get("value"), List)
-        return RuntimeResult().success(Number(1) if is_number else Number(0))
+        return RuntimeResult().success(Number.true if is_number else Number.false)
 
     execute_is_list.arg_names = ["value"]
+    execute_is_list.is_pure = True
 
     def execute_is_function(self, exec_context):
         is_number = isinstance(exec_context.symbol_table.get("value"), BaseFunction)
-        return RuntimeResult().success(Number(1) if is_number else Number(0))
+        return RuntimeResult().success(Number.true if is_number else Number.false)
 
     execute_is_function.arg_names = ["value"]
+    execute_is_function.is_pure = True
 
     def execute_append(self, exec_context):
         list_ = exec_context.symbol_table.get("list")
@@ -158,10 +173,10 @@ class BuiltInFunction(BaseFunction):
         if not isinstance(list_, List):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "First argument must be list",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         list_.elements.append(value)
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(Number.null)
 
     execute_append.arg_names = ["list", "value"]
 
@@ -171,19 +186,19 @@ class BuiltInFunction(BaseFunction):
         if not isinstance(list_, List):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "First argument must be list",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         if not isinstance(index, Number):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "Second argument must be number",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         try:  # Try pop() command in Python
             element = list_.elements.pop(index.value)
         except IndexError:
             return RuntimeResult().failure(ActiveRuntimeError(
                 'Element at this index could not be removed from list because index is out of bounds',
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         return RuntimeResult().success(element)
 
@@ -195,15 +210,15 @@ class BuiltInFunction(BaseFunction):
         if not isinstance(first_list, List):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "First argument must be list",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         if not isinstance(end_list, List):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "Second argument must be list",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         first_list.elements.extend(end_list.elements)
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(Number.null)
 
     execute_extend.arg_names = ["first_list", "second_list"]
 
@@ -212,38 +227,63 @@ class BuiltInFunction(BaseFunction):
         if not isinstance(list_, List):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "Argument must be list",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
-        return RuntimeResult().success(Number(len(list_.elements)))
+        return RuntimeResult().success(make_number(len(list_.elements)))
 
     execute_len.arg_names = ["list"]
+    execute_len.is_pure = True
 
     def execute_run(self, exec_context):
         file_name = exec_context.symbol_table.get("fn")
         if not isinstance(file_name, String):
             return RuntimeResult().failure(ActiveRuntimeError(
                 "Second argument must be string",
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
         file_name = file_name.value
         try:
-            with open(file_name, "r") as f:
-                script = f.read()
-        except Exception as exception:
+            _, error = run_file(file_name)
+        except (OSError, ValueError) as exception:
             return RuntimeResult().failure(ActiveRuntimeError(
                 "Failed to load script \"{}\"\n".format(file_name) + str(exception),
-                self.start_pos, self.end_pos,
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
-        _, error = run(file_name, script)
         if error:
             return RuntimeResult().failure(ActiveRuntimeError(
-                "Failed to finish executing script \"{}\"\n".format(file_name) + error.as_string(),
-                self.start_pos, self.end_pos,
+                "Failed to finish executing script \"{}\"\n".format(file_name) + str(error),
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
                 exec_context))
-        return RuntimeResult().success(Number(0))
+        return RuntimeResult().success(Number.null)
 
     execute_run.arg_names = ["fn"]
 
+    def execute_memo(self, exec_context):
+        function = exec_context.symbol_table.get("function")
+        if isinstance(function, MemoizedFunction):
+            return RuntimeResult().success(function)
+        if not isinstance(function, BaseFunction):
+            return RuntimeResult().failure(ActiveRuntimeError(
+                "Argument must be function",
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
+                exec_context))
+        return RuntimeResult().success(MemoizedFunction(function))
+
+    execute_memo.arg_names = ["function"]
+
+    def execute_memo_stats(self, exec_context):
+        function = exec_context.symbol_table.get("function")
+        if not isinstance(function, MemoizedFunction):
+            return RuntimeResult().failure(ActiveRuntimeError(
+                "Argument must be memo function",
+                exec_context.parent_entry_pos, exec_context.parent_end_pos,
+                exec_context))
+        cache = function.cache
+        return RuntimeResult().success(List([make_number(cache.hits), make_number(cache.misses),
+                                             make_number(len(cache.entries))]))
+
+    execute_memo_stats.arg_names = ["function"]
+
 
 #######################################
 # EVERY BUILT IN FUNCTION  DEFINITION #
@@ -263,6 +303,8 @@ BuiltInFunction.pop = BuiltInFunction("pop")
 BuiltInFunction.extend = BuiltInFunction("extend")
 BuiltInFunction.len = BuiltInFunction("len")
 BuiltInFunction.run = BuiltInFunction("run")
+BuiltInFunction.memo = BuiltInFunction("memo")
+BuiltInFunction.memo_stats = BuiltInFunction("memo_stats")
 
 ##############################################
 # MAP ALL BUILT IN FUNCTIONS TO SYMBOL TABLE #
@@ -287,13 +329,28 @@ global_symbol_table.set("POP", BuiltInFunction.pop)
 global_symbol_table.set("EXTEND", BuiltInFunction.extend)
 global_symbol_table.set("LEN", BuiltInFunction.len)
 global_symbol_table.set("RUN", BuiltInFunction.run)
+global_symbol_table.set("MEMO", BuiltInFunction.memo)
+global_symbol_table.set("MEMO_STATS", BuiltInFunction.memo_stats)
 
 
 ##########################
 # EXECUTE INTERPRETATION #
 ##########################
 
-def run(fn, stream):
+# Note: "tree" recurses on the Python stack, "stack" evaluates on an
+#       explicit stack so that deep nesting and recursion are only
+#       limited by memory, "closure" compiles the AST into closures
+#       first and is the fastest on loops and calls, "vm" compiles it
+#       into bytecode for a virtual machine which never recurses, and
+#       "python" transpiles it into Python code run at CPython speed
+BACKENDS = {'tree': Interpreter,
+            'stack': StackInterpreter,
+            'closure': ClosureCompiler,
+            'vm': VirtualMachine,
+            'python': Transpiler}
+
+
+def run(fn, stream, backend='tree', optimize=True):
     """
     Execute the Lexer on the text stream.
     Three main steps here: lexing, parsing, and interpreting.
@@ -302,8 +359,48 @@ def run(fn, stream):
     transforms executes the AST.
     :param fn: File name where stream originates.
     :param stream: Input text stream to parse.
+    :param backend: Name of the backend interpreting the AST, see BACKENDS.
+    :param optimize: True to rewrite the AST with bin/optimizer.py first.
     :return: Stream of Token objects and Error messages.
     """
+    ast, error = parse(fn, stream)
+    if error:
+        return None, error
+    if optimize:
+        ast = optimizer.optimize(ast, global_symbol_table)
+    return interpret(ast, backend)
+
+
+def run_file(fn, backend='tree', optimize=True):
+    """
+    Execute a script file. Its AST is cached next to it, see
+    bin/ast_cache.py, so that lexing and parsing are skipped
+    for as long as the file does not change.
+    :param fn: File name of the script.
+    :param backend: Name of the backend interpreting the AST, see BACKENDS.
+    :param optimize: True to rewrite the AST with bin/optimizer.py first.
+    :return: Value of the script and Error messages.
+    """
+    with open(fn, 'r') as file:
+        stream = file.read()
+    ast = ast_cache.load(fn, stream)
+    if ast is None:
+        ast, error = parse(fn, stream)
+        if error:
+            return None, error
+        ast_cache.dump(fn, stream, ast)
+    if optimize:  # Note: After caching, the optimized AST depends on the globals
+        ast = optimizer.optimize(ast, global_symbol_table)
+    return interpret(ast, backend)
+
+
+def parse(fn, stream):
+    """
+    Lexes and parses the text stream.
+    :param fn: File name where stream originates.
+    :param stream: Input text stream to parse.
+    :return: Root Node of the AST and Error messages.
+    """
 
     # Lex the input stream
     lexer = Lexer(stream, fn)
@@ -312,15 +409,85 @@ def run(fn, stream):
         return None, error  # Tokenization failure
 
     # Parse the tokens
-    parser = Parser(tokens)
-    ast = parser.parse()
-    if ast.error:
-        return None, ast.error
+    try:
+        ast = Parser(tokens).parse()
+    except RecursionError:  # Note: Too deeply nested for the Python stack
+        ast = StackParser(tokens).parse()
+    return ast.node, ast.error
+
 
-    # Interpret the AST
-    interpreter = Interpreter()
+def interpret(ast, backend='tree'):
+    """
+    Interprets an AST in the global Context.
+    :param ast: Root Node of the AST.
+    :param backend: Name of the backend interpreting the AST, see BACKENDS.
+    :return: Value of the AST and Error messages.
+    """
+    source = get_source(ast.start_pos)  # Note: Keeps the Source registered while the AST runs
+    interpreter = BACKENDS[backend]()
     context = Context('<program>')
     context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
-
+    result = visit(interpreter, ast, context)
     return result.value, result.error
+
+
+def visit(interpreter, ast, context):
+    """
+    Runs an AST on a backend, or on the stack backend when it overflows
+    the Python stack. Only the tree backend finds out while running,
+    the others fall back before, so the statements which already ran
+    on it run again. The names shadowed by the calls of the programs
+    which ran before are forgotten, unless another program is running.
+    :param interpreter: Instance of the backend.
+    :param ast: Root Node of the AST.
+    :param context: Context of the program.
+    :return: The RuntimeResult of the AST.
+    """
+    global running_programs
+    if not running_programs:  # Note: RUN() starts a program while calls run
+        global_symbol_table.forget_shadowing_names()
+    running_programs += 1
+    try:
+        return interpreter.visit(ast, context)
+    except RecursionError:
+        return StackInterpreter().visit(ast, context)
+    finally:
+        running_programs -= 1
+
+
+def run_stream(fn, stream_file, backend='tree', optimize=True):
+    """
+    Execute a script read lazily from a file object.
+    Statements are lexed, parsed and interpreted one at a time,
+    so the Tokens and Nodes in memory follow the largest statement
+    instead of the file, only its text is kept for the errors.
+    Unlike run(), the statements before an error have already been
+    executed when the error is returned. Like run(), an illegal
+    character is reported before a syntax error found earlier.
+    :param fn: File name where stream originates.
+    :param stream_file: File object opened in text mode.
+    :param backend: Name of the backend interpreting the AST, see BACKENDS.
+    :param optimize: True to rewrite the AST with bin/optimizer.py first.
+    :return: Value of the last statement and Error messages.
+    """
+    lexer = StreamLexer(stream_file, fn)
+    # Note: A RecursionError raised while the Lexer yields a Token ends
+    #       its generator, so streams cannot fall back like parse() does
+    tokens = lexer.generate_tokens()
+    parser = StackParser(tokens)
+    interpreter = BACKENDS[backend]()
+    context = Context('<program>')
+    context.symbol_table = global_symbol_table
+    runtime_result, value = RuntimeResult(), None
+    for ast in parser.parse_incrementally():
+        if lexer.error:  # Note: The statement was cut short by the Lexer
+            return None, lexer.error
+        if ast.error:
+            for _ in tokens:  # Note: run() lexes the whole stream before parsing it
+                pass
+            return None, lexer.error or ast.error
+        node = optimizer.optimize(ast.node, global_symbol_table) if optimize else ast.node
+        value = runtime_result.register(visit(interpreter, node, context))
+        if runtime_result.should_return():
+            return runtime_result.value, runtime_result.error
+    return value, lexer.error
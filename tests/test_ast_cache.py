@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+Tests of the AST cache of bin/ast_cache.py, written next to the
+scripts run by run_file().
+"""
+
+import marshal
+
+import pytest
+
+from bin import ast_cache
+from simplescript import run_file
+
+SCRIPT = 'FUNC sq(n) -> n * n\nsq(7)\n'
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / 'script.ss'
+    path.write_text(SCRIPT)
+    return str(path)
+
+
+def test_cached_ast_runs_like_the_parsed_one(script):
+    value, error = run_file(script)
+    assert error is None
+    assert ast_cache.load(script, SCRIPT) is not None
+    assert repr(run_file(script)) == repr((value, error))
+
+
+@pytest.mark.parametrize('records', [
+    ((99, 1, 2),),  # Note: Unknown Node class
+    ((0, 1),),  # Note: Missing constructor arguments
+    ((4, 5, 0, 6),),  # Note: Children which are not decoded
+    'not records',
+])
+def test_corrupted_cache_is_a_miss(script, records):
+    with open(ast_cache.get_cache_path(script), 'wb') as file:
+        file.write(marshal.dumps((ast_cache.CACHE_MAGIC, ast_cache.CACHE_VERSION,
+                                  ast_cache.get_digest(SCRIPT), records)))
+    assert ast_cache.load(script, SCRIPT) is None
+    value, error = run_file(script)
+    assert error is None
+    assert repr(value) == '[<function sq>, 49]'
+    assert ast_cache.load(script, SCRIPT) is not None  # Note: Parsed again, then cached anew
+
+
+def test_truncated_cache_is_a_miss(script):
+    run_file(script)
+    path = ast_cache.get_cache_path(script)
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(data[:len(data) // 2])
+    assert ast_cache.load(script, SCRIPT) is None
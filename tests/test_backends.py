@@ -0,0 +1,214 @@
+# coding=utf-8
+"""
+Behaviour tests shared by every backend.
+Each program runs on every entry of simplescript.BACKENDS, as parsed
+and once optimized, and must give the same value, the same printed
+output and the same error, position included, as the tree backend.
+Run them from the repository root:
+    $ python -m pytest tests
+"""
+
+import pytest
+
+from simplescript import BACKENDS, run
+
+PROGRAMS = {
+    'arithmetic': '''VAR a = 7
+VAR b = 2
+[a + b, a - b, a * b, a / b, a % b, a | b, a ^ b, -a + +b, (a + b) * (a - b) / 3]
+''',
+    'comparisons': '''VAR a = 3
+[a == 3, a != 3, a < 4, a > 4, a <= 3, a >= 4, NOT a == 3, "ab" + "c"]
+''',
+    'and_or': '''VAR calls = []
+FUNC touch(n)
+\tAPPEND(calls, n)
+\tRETURN n
+END
+[0 AND touch(1), 1 AND touch(2), 1 OR touch(3), 0 OR touch(4), NOT 0 AND 1, calls]
+''',
+    'if_elif_else': '''FUNC grade(n)
+\tIF n >= 90 THEN
+\t\tRETURN "A"
+\tELIF n >= 80 THEN
+\t\tRETURN "B"
+\tELSE
+\t\tRETURN "C"
+\tEND
+END
+[grade(95), grade(85), grade(10), IF 0 THEN 1 ELIF 0 THEN 2 ELSE 3]
+''',
+    'for_negative_step': '''VAR seen = []
+FOR i = 10 TO 0 STEP -3 THEN
+\tAPPEND(seen, i)
+END
+VAR squares = FOR j = 0 TO 5 THEN j * j
+[seen, squares, i, j]
+''',
+    'while_break_continue': '''VAR n = 0
+VAR odd = []
+WHILE TRUE THEN
+\tVAR n = n + 1
+\tIF n > 9 THEN BREAK
+\tIF n % 2 == 0 THEN CONTINUE
+\tAPPEND(odd, n)
+END
+[n, odd]
+''',
+    'return': '''FUNC first_over(items, limit)
+\tFOR i = 0 TO LEN(items) THEN
+\t\tIF items / i > limit THEN RETURN items / i
+\tEND
+\tRETURN -1
+END
+FUNC nothing()
+\tRETURN
+END
+[first_over([1, 5, 9], 4), first_over([1], 4), nothing()]
+''',
+    'nested_funcs': '''FUNC outer(x)
+\tFUNC inner(y) -> x * 10 + y
+\tRETURN inner(x + 1)
+END
+FUNC apply(f, v) -> f(v)
+FUNC fib(n) -> IF n < 2 THEN n ELSE fib(n - 1) + fib(n - 2)
+FUNC count(n, acc) -> IF n == 0 THEN acc ELSE count(n - 1, acc + n)
+[outer(4), apply(outer, 2), fib(12), count(100, 0), (FUNC (z) -> z + 1)(1)]
+''',
+    'list_ops': '''VAR list = [1, 2, 3]
+VAR more = list + 4
+VAR joined = list * [5, 6]
+VAR removed = joined - 0
+[list, more, joined, removed, joined / -1, LEN(more), "ab" + "cd", "ab" * 3]
+''',
+    'builtins': '''VAR items = [3, 1]
+APPEND(items, 2)
+EXTEND(items, [7, 8])
+VAR popped = POP(items, 0)
+PRINT("items")
+PRINT(items)
+VAR echoed = PRINT_RET(4 * 2)
+[popped, items, echoed, IS_NUM(1), IS_STR("s"), IS_LIST(items), IS_FUNC(LEN), IS_FUNC(1), LEN(items)]
+''',
+    'memo': '''VAR calls = []
+FUNC sq(n)
+\tAPPEND(calls, n)
+\tRETURN n * n
+END
+VAR sq = MEMO(sq)
+VAR total = 0
+FOR i = 0 TO 20 THEN VAR total = total + sq(i % 4)
+[total, LEN(calls), MEMO_STATS(sq)]
+''',
+    'printed_output': '''FOR i = 0 TO 3 THEN PRINT(i * 2)
+PRINT("done")
+''',
+    'too_few_arguments': '''FUNC add(a, b) -> a + b
+VAR total = 1
+VAR total = total + add(1)
+''',
+    'argument_must_be_list': '''FUNC size(v) -> LEN(v)
+VAR first = size([1, 2])
+VAR second = size(42)
+''',
+    'division_by_zero': '''FUNC ratio(a, b)
+\tRETURN a / b
+END
+VAR r = ratio(1, 2)
+VAR r = ratio(1, 0)
+''',
+    'undefined_variable': '''VAR a = 1
+a + missing
+''',
+    'error_in_pruned_if': '''VAR i = (IF 5 THEN LEN(i) ELSE 0)
+''',
+    'error_in_pruned_if_call': '''FUNC f(x) -> x / 0
+IF "s2" THEN f(3) ELSE 1
+''',
+    'illegal_operation': '''VAR x = [1]
+VAR y = "a" - x
+''',
+}
+
+# Note: Programs which must fail, with the error expected on every backend
+ERRORS = {
+    'too_few_arguments': 'Too few arguments',
+    'argument_must_be_list': 'Argument must be list',
+    'division_by_zero': 'Division by 0',
+    'undefined_variable': 'missing',
+    'illegal_operation': 'Illegal operation',
+    'error_in_pruned_if': 'VAR "i" not defined',
+    'error_in_pruned_if_call': 'Division by 0',
+}
+
+
+def outcome(name, backend, optimize, capsys):
+    """
+    Runs a program and describes what it did.
+    :param name: Key of the program in PROGRAMS.
+    :param backend: Name of the backend.
+    :param optimize: True to optimize the AST first.
+    :param capsys: Fixture capturing the output of PRINT.
+    :return: Tuple with the value, the printed output and the error, as strings.
+    """
+    value, error = run('<{}>'.format(name), PROGRAMS[name], backend, optimize)
+    return repr(value), capsys.readouterr().out, repr(error)
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_backends_agree(name, optimize, capsys):
+    expected = outcome(name, 'tree', optimize, capsys)
+    if name in ERRORS:
+        assert ERRORS[name] in expected[2]
+    else:
+        assert expected[2] == 'None'
+    for backend in BACKENDS:
+        assert outcome(name, backend, optimize, capsys) == expected, backend
+
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_optimizer_keeps_behaviour(name, capsys):
+    assert outcome(name, 'tree', True, capsys) == outcome(name, 'tree', False, capsys)
+
+
+@pytest.mark.parametrize('name, value', [
+    ('arithmetic', '9, 5, 14, 3.5, 1, 3, 49, -5, 15.0'),
+    ('for_negative_step', '10, 7, 4, 1, 0, 1, 4, 9, 16, 1, 4'),
+    ('while_break_continue', '10, 1, 3, 5, 7, 9'),
+    ('return', '5, -1, 0'),
+    ('nested_funcs', '45, 23, 144, 5050, 2'),
+    ('memo', '70, 4, 16, 4, 4'),
+])
+def test_values(name, value):
+    # Note: The value of a program lists the value of every statement,
+    #       and nested Lists print their elements without brackets
+    assert repr(run('<{}>'.format(name), PROGRAMS[name])[0]).endswith(value + ']')
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_tail_calls_run_deeper_than_the_python_stack(backend):
+    value, error = run('<tail>', 'FUNC count(n, acc) -> IF n == 0 THEN acc ELSE count(n - 1, acc + n)\n'
+                                 'count(5000, 0)', backend)
+    assert error is None
+    assert repr(value).endswith(', 12502500]')
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_global_read_after_a_call_shadowed_it(backend, optimize):
+    # Note: Scoping is dynamic, g() reads the n of f() while f() runs
+    #       and the global n otherwise, in this run as in the next ones
+    value, error = run('<shadow>', 'VAR n = 1\n'
+                                   'FUNC g() -> n\n'
+                                   'FUNC f(n) -> g()\n'
+                                   'FUNC h(x)\n'
+                                   '\tVAR n = x * 10\n'
+                                   '\tRETURN g()\n'
+                                   'END\n'
+                                   '[g(), f(5), g(), n]', backend, optimize)
+    assert error is None
+    assert repr(value).endswith('1, 5, 1, 1]')
+    value, error = run('<shadow>', 'VAR n = 2\n[g(), h(7), f(6), g()]', backend, optimize)
+    assert error is None
+    assert repr(value).endswith('2, 70, 6, 2]')
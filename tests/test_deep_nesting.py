@@ -0,0 +1,51 @@
+# coding=utf-8
+"""
+Regression tests for scripts nested or recursing deeper than the
+Python stack. Every backend must run them, falling back to the
+StackParser and the stack backend where it would overflow.
+"""
+
+import io
+
+import pytest
+
+from simplescript import BACKENDS, run, run_stream
+
+DEEP_PROGRAMS = {
+    'long_sum': ('VAR z = ' + '+'.join(['1'] * 20000), '20000'),
+    'nested_parentheses': ('(' * 3000 + '7' + ')' * 3000, '7'),
+    'nested_ifs': ('IF 1 THEN ' * 2000 + '5', '5'),
+    'nested_fors': ('VAR total = 0\n' + 'FOR i = 0 TO 1 THEN ' * 1000 + 'VAR total = total + 1\ntotal', '1'),
+}
+
+DEEP_RECURSION = 'FUNC depth(n) -> IF n == 0 THEN 0 ELSE 1 + depth(n - 1)\ndepth(3000)'
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+@pytest.mark.parametrize('name', sorted(DEEP_PROGRAMS))
+def test_deep_programs_run_on_every_backend(name, backend):
+    script, value = DEEP_PROGRAMS[name]
+    result, error = run('<{}>'.format(name), script, backend)
+    assert error is None
+    assert repr(result.elements[-1]) == value  # Note: The value of nested FORs is too deep to print
+
+
+@pytest.mark.parametrize('backend', sorted(set(BACKENDS) - {'python'}))
+def test_deep_recursion_runs_on_every_backend(backend):
+    result, error = run('<recursion>', DEEP_RECURSION, backend)
+    assert error is None
+    assert repr(result).endswith(', 3000]')
+
+
+def test_deep_recursion_is_reported_by_the_python_backend():
+    # Note: Transpiled Functions are Python functions, their RecursionError is a runtime error
+    result, error = run('<recursion>', DEEP_RECURSION, 'python')
+    assert result is None
+    assert 'Maximum recursion depth exceeded' in repr(error)
+
+
+def test_deep_statement_in_a_stream():
+    script, _ = DEEP_PROGRAMS['nested_parentheses']
+    result, error = run_stream('<stream>', io.StringIO('VAR a = 2\n' + script + ' + a\nVAR b = a * 5\nb\n'))
+    assert error is None
+    assert repr(result) == '10'
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""
+Tests that the StackParser, which reimplements the grammar of the
+Parser on an explicit stack, builds the same AST, positions included,
+and fails with the same syntax error on the same programs.
+"""
+
+import pytest
+
+from bin.lexer import Lexer
+from bin.parser import Parser
+from bin.stack_parser import StackParser
+
+PROGRAMS = {
+    'expressions': 'VAR a = -(1 + 2) * 3 / 4 % 5 ^ 2 ^ 3 | 6 - +7\n"text" + a',
+    'comparisons': 'NOT 1 == 2 AND 3 != 4 OR 5 < 6 AND 7 > 8 OR 9 <= 10 AND 11 >= 12',
+    'lists': 'VAR list = [1, [2, 3], []]\nlist / 0 + [4] * [5, 6] - 1',
+    'calls': 'PRINT(LEN([1, 2]), 3)\n(FUNC (x) -> x)(5)\nf()',
+    'single_line_blocks': 'IF 1 THEN 2 ELIF 3 THEN 4 ELSE 5\n'
+                          'FOR i = 10 TO 0 STEP -2 THEN i\n'
+                          'WHILE 0 THEN 1\n'
+                          'FUNC f(a, b) -> a + b',
+    'multi_line_blocks': '''FUNC f(n)
+\tIF n > 1 THEN
+\t\tRETURN n
+\tELIF n == 1 THEN
+\t\tRETURN 1
+\tELSE
+\t\tVAR n = 0
+\tEND
+\tFOR i = 0 TO n THEN
+\t\tIF i == 2 THEN CONTINUE
+\t\tIF i == 3 THEN BREAK
+\tEND
+\tWHILE n < 3 THEN
+\t\tVAR n = n + 1
+\tEND
+\tRETURN
+END
+f(2)
+''',
+    'nested_functions': 'FUNC outer(x)\n\tFUNC inner(y) -> x * y\n\tRETURN inner(3)\nEND\nouter(2)',
+    'empty_lines': '\n\nVAR a = 1\n\n\na\n',
+    'missing_then': 'IF 1 2',
+    'missing_elif_then': 'IF 1 THEN 2 ELIF 3 4',
+    'missing_end': 'FUNC f()\n\tRETURN 1\n',
+    'missing_parenthesis': '(1 + 2',
+    'missing_bracket': '[1, 2',
+    'missing_to': 'FOR i = 0 THEN 1',
+    'missing_identifier': 'VAR = 1',
+    'unexpected_token': '1 2',
+    'bad_argument': 'FUNC f(1) -> 1',
+}
+
+
+def describe(node):
+    """
+    Describes an AST down to the positions of its Nodes.
+    :param node: Root Node of the AST, or any value it holds.
+    :return: String with the structure of the AST.
+    """
+    if isinstance(node, list):
+        return '[' + ','.join(describe(element) for element in node) + ']'
+    if isinstance(node, tuple):
+        return '(' + ','.join(describe(element) for element in node) + ')'
+    if not hasattr(node, '__slots__'):
+        return repr(node)
+    return type(node).__name__ + '{' + ','.join(
+        key + '=' + describe(getattr(node, key, None)) for key in sorted(node.__slots__)) + '}'
+
+
+def parse(parser_class, tokens):
+    """
+    Parses Tokens with a parser.
+    :param parser_class: Parser or StackParser.
+    :param tokens: Tokens of the program.
+    :return: Tuple with the description of the AST and the error, as strings.
+    """
+    result = parser_class(tokens).parse()
+    if result.error:
+        return None, '{} {} {}'.format(result.error.start_pos, result.error.end_pos, result.error)
+    return describe(result.node), None
+
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_parsers_agree(name):
+    # Note: Both parse the same Tokens, as the offsets of each lexing differ
+    tokens, error = Lexer(PROGRAMS[name], '<{}>'.format(name)).tokenize()
+    assert error is None
+    expected = parse(Parser, tokens)
+    assert (expected[0] is None) == name.startswith(('missing_', 'unexpected_', 'bad_'))
+    assert parse(StackParser, tokens) == expected
@@ -0,0 +1,39 @@
+# coding=utf-8
+"""
+Tests that run_stream(), which lexes, parses and runs a script one
+statement at a time, reports the same errors as run() on the whole
+script, and prints them from the text it ran.
+"""
+
+import io
+
+import pytest
+
+from simplescript import run, run_stream
+
+PROGRAMS = {
+    'illegal_character': 'VAR a = 1\nVAR b = a @ 2\n',
+    'syntax_error': 'VAR a = 1\nVAR b = (a + 2\nVAR c = 3\n',
+    'syntax_error_then_illegal_character': 'VAR a = 1\nVAR b = a +\nVAR c = 3\nVAR d = $\n',
+    'illegal_character_then_syntax_error': 'VAR a = 1\nVAR b = ?\nVAR c = (3\n',
+    'runtime_error': 'VAR a = 1\nVAR b = a / 0\n',
+    'error_in_a_later_line': 'VAR a = [1, 2]\n\n\nFUNC f(x) -> x / 5\nVAR c = f(a)\n',
+}
+
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_run_and_run_stream_report_the_same_error(name):
+    fn = '<{}>'.format(name)
+    _, error = run(fn, PROGRAMS[name])
+    _, stream_error = run_stream(fn, io.StringIO(PROGRAMS[name]))
+    assert error is not None
+    assert str(stream_error) == str(error)
+
+
+def test_errors_show_the_text_which_ran(tmp_path):
+    path = tmp_path / 'script.ss'
+    path.write_text('VAR a = 1\nVAR b = a / 0\n')
+    with open(str(path)) as file:
+        _, error = run_stream(str(path), file)
+    path.write_text('VAR changed = TRUE\nVAR since = TRUE\n')
+    assert 'VAR b = a / 0' in str(error)